@@ -1,8 +1,16 @@
+from __future__ import annotations
+
 from .client import Client
 from .enums import ChannelType, Permissions, ActivityType, ActivityPlatform, ActivityStatus
 from .typings import ClientResponse, RGB_COLOR
 from .permissionbuilder import PermissionBuilder
 from .activity import ActivityBuilder
+from .cachebuilder import CacheBuilder
+from .settingsbuilder import SettingsBuilder
+from .codec import JSONCodec
+from .stats import Stats
+from .monitor import LoopLagMonitor
+from .tracing import HTTPTracer
 from .user import UserClient
 
 
@@ -17,5 +25,11 @@ __all__: tuple[str, ...] = (
     "ActivityType",
     "ActivityStatus",
     "ActivityPlatform",
-    "ActivityBuilder"
+    "ActivityBuilder",
+    "CacheBuilder",
+    "SettingsBuilder",
+    "JSONCodec",
+    "Stats",
+    "LoopLagMonitor",
+    "HTTPTracer"
 )
@@ -1,39 +1,408 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Any
+from typing import TYPE_CHECKING, Optional, Any, Union, Callable
+from asyncio import Task, sleep
+import sqlite3
+from collections import OrderedDict
+from time import monotonic, perf_counter
 
 from .typings import AUTH_HEADER
+from .cachebuilder import CacheBuilder
+from .records import CachedRecord, record_type
+from .snapshot import CacheSnapshot
 
 if TYPE_CHECKING:
     from .client import ClientResponse, UserClient
     from .http import CustomSession
     from .user import UserClient
     from .gateway.response import GatewayResponse
+    from .stats import Stats
+
+
+# Lists of the guild object sent by the gateway, which are not kept in the cache
+_GATEWAY_GUILD_LISTS: tuple[str, ...] = (
+    "channels", "threads", "members", "presences", "voice_states",
+    "stage_instances", "guild_scheduled_events", "properties"
+)
+
+
+class MessageCache:
+    """
+    MessageCache stores messages of a single account.
+    Every channel has its own bounded buffer of messages, and the channels themselves are kept
+    in least recently used order, so the global limit evicts messages from the channels that were idle the longest.
+    Adding or reading a message marks it and its channel as the most recently used,
+    the limits evict the least recently used messages first.
+    A message expires **message_ttl** seconds after it was added, reading it doesn't extend its lifetime.
+
+    :param max_messages: Maximum number of cached messages. ``None`` disables the limit
+    :param max_messages_per_channel: Maximum number of cached messages in one channel. ``None`` disables the limit
+    :param message_ttl: Number of seconds after which a message expires. ``None`` disables expiration
+    """
+
+    def __init__(self, max_messages: Optional[int], max_messages_per_channel: Optional[int],
+                 message_ttl: Optional[float]) -> None:
+        guild_id = channel_id = message_id = int
+
+        self.max_messages: Optional[int] = max_messages
+        self.max_messages_per_channel: Optional[int] = max_messages_per_channel
+        self.message_ttl: Optional[float] = message_ttl
+
+        # Format: channel_id: {message_id: (added_at, message_data)}
+        self.__channels: OrderedDict[channel_id, OrderedDict[message_id, tuple[float, dict]]] = OrderedDict()
+        self.__channel_guilds: dict[channel_id, guild_id] = {}
+        self.__guild_channels: dict[guild_id, set[channel_id]] = {}
+        self.__message_channels: dict[message_id, channel_id] = {}
+        self.__size: int = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __get_channel_buffer(self, channel_id: int) -> Optional[OrderedDict[int, tuple[float, dict]]]:
+        messages: Optional[OrderedDict[int, tuple[float, dict]]] = self.__channels.get(channel_id)
+
+        if messages is None:
+            return None
+
+        if self.message_ttl is not None:
+            expired: float = monotonic() - self.message_ttl
+
+            while messages:
+                message_id, (added_at, _) = next(iter(messages.items()))
+                if added_at > expired:
+                    break
+
+                self.__pop(channel_id, message_id)
+
+            if channel_id not in self.__channels:
+                return None
+
+        return messages
+
+    def __pop(self, channel_id: int, message_id: int) -> Optional[dict]:
+        messages: OrderedDict[int, tuple[float, dict]] = self.__channels[channel_id]
+        _, message_data = messages.pop(message_id)
+
+        del self.__message_channels[message_id]
+        self.__size -= 1
+
+        if not messages:
+            del self.__channels[channel_id]
+            guild_id: int = self.__channel_guilds.pop(channel_id)
+
+            guild_channels: set[int] = self.__guild_channels[guild_id]
+            guild_channels.discard(channel_id)
+
+            if not guild_channels:
+                del self.__guild_channels[guild_id]
+
+        return message_data
+
+    def add(self, guild_id: int, message_data: dict) -> None:
+        """
+        The add function adds or replaces a message in the cache and evicts the messages over the limits.
+
+        :param guild_id: Guild id of the message
+        :param message_data: Message data
+        """
+
+        message_id: int = int(message_data["id"])
+        channel_id: int = int(message_data["channel_id"])
+
+        if message_id in self.__message_channels:
+            self.__pop(self.__message_channels[message_id], message_id)
+
+        messages: Optional[OrderedDict[int, tuple[float, dict]]] = self.__get_channel_buffer(channel_id)
+
+        if messages is None:
+            messages = self.__channels[channel_id] = OrderedDict()
+            self.__channel_guilds[channel_id] = guild_id
+            self.__guild_channels.setdefault(guild_id, set()).add(channel_id)
+        else:
+            self.__channels.move_to_end(channel_id)
+
+        messages[message_id] = (monotonic(), message_data)
+        self.__message_channels[message_id] = channel_id
+        self.__size += 1
+
+        if self.max_messages_per_channel is not None and len(messages) > self.max_messages_per_channel:
+            self.__pop(channel_id, next(iter(messages)))
+
+        if self.max_messages is not None:
+            while self.__size > self.max_messages:
+                least_used_channel, least_used_messages = next(iter(self.__channels.items()))
+                self.__pop(least_used_channel, next(iter(least_used_messages)))
+
+    def remove(self, message_id: int) -> Optional[dict]:
+        """
+        The remove function removes a message from the cache and returns its data.
+
+        :param message_id: Id of the message to remove
+        """
+
+        channel_id: Optional[int] = self.__message_channels.get(int(message_id))
+
+        if channel_id is None:
+            return None
+
+        return self.__pop(channel_id, int(message_id))
+
+    def remove_channel(self, channel_id: int) -> int:
+        """
+        The remove_channel function removes all messages of the channel and returns their number.
+
+        :param channel_id: Id of the channel
+        """
+
+        messages: Optional[OrderedDict[int, tuple[float, dict]]] = self.__channels.get(int(channel_id))
+
+        if messages is None:
+            return 0
+
+        removed: int = len(messages)
+
+        for message_id in tuple(messages):
+            self.__pop(int(channel_id), message_id)
+
+        return removed
+
+    def remove_guild(self, guild_id: int) -> int:
+        """
+        The remove_guild function removes all messages of the guild and returns their number.
+
+        :param guild_id: Id of the guild
+        """
+
+        channel_ids: tuple[int, ...] = tuple(self.__guild_channels.get(int(guild_id), ()))
+        return sum(self.remove_channel(channel_id) for channel_id in channel_ids)
+
+    def get(self, message_id: int, guild_id: Optional[int] = None) -> Optional[dict]:
+        """
+        The get function returns the message with the given id.
+
+        :param message_id: Id of the message
+        :param guild_id: If specified, the message is returned only if it belongs to this guild
+        """
+
+        message_id = int(message_id)
+        channel_id: Optional[int] = self.__message_channels.get(message_id)
+
+        if channel_id is None:
+            return None
+
+        if guild_id is not None and self.__channel_guilds[channel_id] != int(guild_id):
+            return None
+
+        messages: Optional[OrderedDict[int, tuple[float, dict]]] = self.__get_channel_buffer(channel_id)
+
+        if not messages or message_id not in messages:
+            return None
+
+        added_at, message_data = messages[message_id]
+
+        # Read messages are moved away from the front of the buffer, so the expiration of the buffer can miss them
+        if self.message_ttl is not None and added_at <= monotonic() - self.message_ttl:
+            self.__pop(channel_id, message_id)
+            return None
+
+        messages.move_to_end(message_id)
+        self.__channels.move_to_end(channel_id)
+
+        return message_data
+
+    def get_channel_messages(self, channel_id: int, guild_id: Optional[int] = None) -> list[dict]:
+        """
+        The get_channel_messages function returns messages of the channel, from the oldest to the newest.
+
+        :param channel_id: Id of the channel
+        :param guild_id: If specified, the messages are returned only if the channel belongs to this guild
+        """
+
+        channel_id = int(channel_id)
+
+        if guild_id is not None and self.__channel_guilds.get(channel_id) != int(guild_id):
+            return []
+
+        messages: Optional[OrderedDict[int, tuple[float, dict]]] = self.__get_channel_buffer(channel_id)
+
+        if not messages:
+            return []
+
+        expired: float = monotonic() - self.message_ttl if self.message_ttl is not None else float("-inf")
+
+        # The buffer is in the order of use, the snowflake ids give the order of the messages
+        return [message_data for _, (added_at, message_data) in sorted(messages.items()) if added_at > expired]
+
+    def get_guild_messages(self, guild_id: int) -> list[dict]:
+        """
+        The get_guild_messages function returns messages from all channels of the guild.
+
+        :param guild_id: Id of the guild
+        """
+
+        messages: list[dict] = []
+
+        for channel_id in tuple(self.__guild_channels.get(int(guild_id), ())):
+            messages.extend(self.get_channel_messages(channel_id))
+
+        return messages
+
+    def clear(self) -> None:
+        """
+        The clear function removes all messages.
+        """
+
+        self.__channels.clear()
+        self.__channel_guilds.clear()
+        self.__guild_channels.clear()
+        self.__message_channels.clear()
+        self.__size = 0
 
 
 class Cache:
     """
     A Cache object is assigned to each :class:`asynccore.user.UserClient` object. It stores servers, channels, messages.
-    The startup function acquires all data (except messages) at startup if **startup_cache**
-    in class :class:`asynccore.client.Client` is set to True
+    Guilds and channels are filled from the READY and GUILD_CREATE events of the gateway.
+    If **startup_cache** in class :class:`asynccore.client.Client` is set to True
+    and the gateway doesn't send them, they are requested from the api with :meth:`startup_cache`
 
 
     :param session: Store the session object that is passed to it
     :param user: Store the user's client
     :param endpoint: Set the endpoint of the api
+    :param settings: Limits of the cache. If not specified, the default :class:`CacheBuilder` is used
+    :param rest_fallback: Request the guilds and channels missing in the READY event from the api
+
+    .. note::
+        If **compact_records** is enabled in :class:`CacheBuilder`, the cache stores
+        :class:`asynccore.records.CachedRecord` objects instead of dictionaries.
     """
 
-    def __init__(self, session: CustomSession, user: UserClient, endpoint: str) -> None:
-        guild_id = int
+    def __init__(self, session: CustomSession, user: UserClient, endpoint: str,
+                 settings: Optional[CacheBuilder] = None, rest_fallback: bool = False) -> None:
+        guild_id = channel_id = int
 
         self._endpoint: str = endpoint
+        self.rest_fallback: bool = rest_fallback
+        self._fallback_task: Optional[Task] = None
 
         self.session: CustomSession = session
         self.user: UserClient = user
 
-        self.__cached_guilds: list[dict] = []
-        self.__cached_channels: dict[guild_id, list[dict[str, Any]]] = {}
-        self.__cached_messages: dict[guild_id, list[dict[str, Any]]] = {}
+        self.__cached_guilds: dict[guild_id, dict[str, Any]] = {}
+        self.__cached_channels: dict[guild_id, dict[channel_id, dict[str, Any]]] = {}
+
+        self.settings: CacheBuilder = settings if settings else CacheBuilder()
+        self.__cached_messages: MessageCache = MessageCache(
+            max_messages=self.settings.max_messages,
+            max_messages_per_channel=self.settings.max_messages_per_channel,
+            message_ttl=self.settings.message_ttl
+        )
+
+        self.__channel_guilds: dict[channel_id, guild_id] = {}  # Reverse index used by get_channel
+
+        self.__guild_record: Optional[type[CachedRecord]] = None
+        self.__channel_record: Optional[type[CachedRecord]] = None
+        self.__message_record: Optional[type[CachedRecord]] = None
+
+        if self.settings.compact_records:
+            self.__guild_record = record_type("GuildRecord", ("id",) + self.settings.guild_fields)
+            self.__channel_record = record_type("ChannelRecord", ("id",) + self.settings.channel_fields)
+            self.__message_record = record_type("MessageRecord", ("id", "channel_id") + self.settings.message_fields)
+
+        self.snapshot: Optional[CacheSnapshot] = None
+        self.__snapshot_guilds: Optional[set[int]] = None  # Guilds loaded from the snapshot, not confirmed by READY
+
+        if self.settings.snapshot_path:
+            self.snapshot = CacheSnapshot(self.settings.snapshot_path)
+
+    @staticmethod
+    def __compact(record: Optional[type[CachedRecord]], data: dict) -> Union[dict, CachedRecord]:
+        if record is None or isinstance(data, record):
+            return data
+
+        return record(data)
+
+    def clear(self) -> None:
+        """
+        The clear function removes all guilds, channels and messages from the cache.
+        It's called when the gateway session of the user is lost and the data can no longer be kept up to date.
+        """
+
+        self.__cached_guilds.clear()
+        self.__cached_channels.clear()
+        self.__channel_guilds.clear()
+        self.__cached_messages.clear()
+
+    async def load_snapshot(self) -> bool:
+        """
+        The load_snapshot function fills the cache with the guilds and channels from the snapshot.
+        The file is read in the default executor, so the loop isn't blocked by the disk.
+        It's called when the gateway starts, before the connections are opened.
+        The data is reconciled with the gateway: guilds missing in the READY event are removed
+        and the channels of every guild are replaced with the ones from the READY or GUILD_CREATE event.
+        Returns False if there is no snapshot or it can't be read.
+        """
+
+        if self.snapshot is None:
+            return False
+
+        try:
+            snapshot: Optional[tuple[list[tuple[int, dict]], list[tuple[int, dict]]]] = \
+                await self.user.loop.run_in_executor(None, self.snapshot.load, self.user.id)
+        except (sqlite3.Error, ValueError) as error:
+            if self.session.logger._status:
+                self.session.logger.warning("Cache snapshot: %s can't be loaded: %r", self.snapshot.path, error)
+
+            return False
+
+        if snapshot is None:
+            return False
+
+        guilds, channels = snapshot
+
+        for _, guild_data in guilds:
+            self.update_guild(guild_data)
+
+        for guild_id, channel_data in channels:
+            self.update_channel(guild_id, channel_data)
+
+        self.__snapshot_guilds = {guild_id for guild_id, _ in guilds}
+        return True
+
+    async def save_snapshot(self) -> None:
+        """
+        The save_snapshot function saves the guilds and channels to the snapshot.
+        The data is collected in the loop and written to the file in the default executor,
+        so the loop isn't blocked by the disk.
+        """
+
+        if self.snapshot is None:
+            return
+
+        guilds: list[tuple[int, Any]] = list(self.__cached_guilds.items())
+        channels: list[tuple[int, int, Any]] = [
+            (guild_id, channel_id, channel_data)
+            for guild_id, guild_channels in self.__cached_channels.items()
+            for channel_id, channel_data in guild_channels.items()
+        ]
+
+        try:
+            await self.user.loop.run_in_executor(None, self.snapshot.save, self.user.id, guilds, channels)
+        except (sqlite3.Error, OSError) as error:
+            if self.session.logger._status:
+                self.session.logger.warning("Cache snapshot: %s can't be saved: %r", self.snapshot.path, error)
+
+    async def run_snapshots(self, interval: float) -> None:
+        """
+        The run_snapshots function saves the snapshot every **interval** seconds.
+
+        :param interval: Number of seconds between the snapshots
+        """
+
+        while True:
+            await sleep(interval)
+            await self.save_snapshot()
 
     async def __request_guilds(self):
         url: str = self._endpoint + "users/@me/guilds"
@@ -47,12 +416,12 @@ class Cache:
         if response.status == 200:
             guilds_data = await response.json()
             for guild in guilds_data:
-                if guild["id"] not in self.__cached_guilds:
-                    self.__cached_guilds.append(guild)
+                self.add_guild_to_cache(guild)
 
     async def __request_channels(self):
-        for guild_data in self.__cached_guilds:
-            guild_id: int = int(guild_data["id"])
+        for guild_id in tuple(self.__cached_guilds):
+            if guild_id in self.__cached_channels:
+                continue
 
             url: str = self._endpoint + f"guilds/{guild_id}/channels"
 
@@ -63,9 +432,10 @@ class Cache:
             )
 
             if response.status == 200:
-                if guild_id not in self.__cached_channels.keys():  # pylint: disable=consider-iterating-dictionary
+                if guild_id not in self.__cached_channels:
                     channels_data: list[dict] = await response.json()
-                    self.__cached_channels[guild_id] = channels_data
+                    for channel_data in channels_data:
+                        self.update_channel(guild_id, channel_data)
 
     async def __request_messages(self):  # pylint: disable=unused-private-member
         ...
@@ -93,18 +463,81 @@ class Cache:
 
     async def startup_cache(self):
         """
-        The startup_cache function is called when the account starts up.
-        It checks if there are any cached guilds, and if not, it requests them from Discord.
-        Then it requests channels from Discord.
+        The startup_cache function requests the data missing in the cache from Discord.
+        It checks if there are any cached guilds, and if not, it requests them.
+        Then it requests the channels of the guilds without cached channels.
 
         .. note::
-            The function will only get called if the **startup_cache** parameter is set to True
-            in the :class:`asynccore.client.Client` class.
+            The function is called automatically only if the **startup_cache** parameter is set to True
+            in the :class:`asynccore.client.Client` class and the READY event doesn't contain the guilds or channels.
         """
 
         if not self.__cached_guilds:
             await self.__request_guilds()
-            await self.__request_channels()
+
+        await self.__request_channels()
+
+    def seed_guild(self, guild_data: dict) -> None:
+        """
+        The seed_guild function adds the guild and its channels received from the gateway
+        in the READY or GUILD_CREATE event. Cached channels missing in the event are removed.
+        The lists of members, presences and other data not kept by the cache are not stored.
+        Guilds marked as unavailable are skipped, they are received later with the GUILD_CREATE event.
+
+        :param guild_data: Guild data from the gateway
+        """
+
+        if guild_data.get("unavailable"):
+            return
+
+        guild_id: int = int(guild_data["id"])
+        channels: list[dict] = guild_data.get("channels") or []
+
+        # User accounts receive the guild fields in the properties object
+        guild: dict = {**guild_data.get("properties", {}), **guild_data}
+        for key in _GATEWAY_GUILD_LISTS:
+            guild.pop(key, None)
+
+        self.update_guild(guild)
+
+        if "channels" in guild_data:
+            received: set[int] = {int(channel_data["id"]) for channel_data in channels}
+
+            for channel_id in tuple(self.__cached_channels.get(guild_id, ())):
+                if channel_id not in received:
+                    self.remove_channel(channel_id)
+
+        for channel_data in channels:
+            # The channels in the guild object of the gateway don't contain the guild_id
+            channel_data.setdefault("guild_id", str(guild_id))
+            self.update_channel(guild_id, channel_data)
+
+    def seed(self, ready_data: dict) -> None:
+        """
+        The seed function fills the cache with the guilds from the READY event.
+        If the event doesn't contain the guilds or their channels and **rest_fallback** is enabled,
+        the missing data is requested with :meth:`startup_cache` in the background.
+
+        :param ready_data: Data of the READY event
+        """
+
+        guilds: Optional[list[dict]] = ready_data.get("guilds")
+
+        for guild_data in guilds or ():
+            self.seed_guild(guild_data)
+
+        if self.__snapshot_guilds is not None and guilds is not None:
+            for guild_id in self.__snapshot_guilds - {int(guild_data["id"]) for guild_data in guilds}:
+                self.remove_guild(guild_id)
+
+        self.__snapshot_guilds = None
+
+        missing: bool = guilds is None or any(
+            "channels" not in guild_data and not guild_data.get("unavailable") for guild_data in guilds
+        )
+
+        if missing and self.rest_fallback:
+            self._fallback_task = self.user.loop.create_task(self.startup_cache())
 
     def get_channel(self, channel_id: int, guild_id: Optional[int] = None) -> Optional[dict]:
         """
@@ -114,22 +547,18 @@ class Cache:
         :param guild_id: Specify the guild id of the channel
         """
 
-        def check(_channel_data: dict) -> bool:
-            return int(_channel_data["id"]) == channel_id
+        channel_id = int(channel_id)
 
-        if guild_id:
-            channels: Optional[list[dict]] = self.__cached_channels.get(guild_id)
-            if not channels:
+        if guild_id is None:
+            guild_id = self.__channel_guilds.get(channel_id)
+            if guild_id is None:
                 return None
 
-            for channel_data in channels:
-                if check(channel_data):
-                    return channel_data
-        else:
-            for channels in self.__cached_channels.values():
-                for channel_data in channels:
-                    if check(channel_data):
-                        return channel_data
+        channels: Optional[dict[int, dict]] = self.__cached_channels.get(int(guild_id))
+        if not channels:
+            return None
+
+        return channels.get(channel_id)
 
     def get_channels(self, guild_id: int) -> Optional[list[dict]]:
         """
@@ -139,12 +568,12 @@ class Cache:
         :param guild_id: Get the channels from a specific guild
         """
 
-        channels: Optional[list[dict]] = self.__cached_channels.get(int(guild_id))
+        channels: Optional[dict[int, dict]] = self.__cached_channels.get(int(guild_id))
 
         if not channels:
             return None
 
-        return channels
+        return list(channels.values())
 
     def get_guild(self, guild_id: int) -> Optional[dict]:
         """
@@ -155,12 +584,7 @@ class Cache:
         :param guild_id: Specify the id of the guild you want to get information about
         """
 
-        def check(_guild_data: dict) -> bool:
-            return int(_guild_data["id"]) == int(guild_id)
-
-        for guild_data in self.__cached_guilds:
-            if check(guild_data):
-                return guild_data
+        return self.__cached_guilds.get(int(guild_id))
 
     def get_guilds(self) -> list[dict]:
         """
@@ -168,7 +592,7 @@ class Cache:
         The dictionary contains information about each guild, such as its name and ID.
         """
 
-        return self.__cached_guilds
+        return list(self.__cached_guilds.values())
 
     def get_messages(self, guild_id: int) -> Optional[list[dict]]:
         """
@@ -177,7 +601,7 @@ class Cache:
         :param guild_id: Get the messages from a specific guild
         """
 
-        messages: Optional[list[dict]] = self.__cached_messages.get(int(guild_id))
+        messages: list[dict] = self.__cached_messages.get_guild_messages(int(guild_id))
 
         if not messages:
             return None
@@ -192,14 +616,7 @@ class Cache:
         :param message_id: Find the message in the list of messages
         """
 
-        messages: Optional[list[dict]] = self.__cached_messages.get(int(guild_id))
-
-        if not messages:
-            return
-
-        for message in messages:
-            if int(message["id"]) == int(message_id):
-                return message
+        return self.__cached_messages.get(message_id, guild_id)
 
     def get_messages_from_channel(self, guild_id: int, channel_id: int) -> Optional[list[Optional[dict]]]:
         """
@@ -211,15 +628,8 @@ class Cache:
         :param channel_id: Get the messages from a specific channel
         """
 
-        messages: Optional[list[dict]] = self.__cached_messages.get(int(guild_id))
-        sorted_messages: list[Optional[dict]] = []
-
-        if not messages:
-            return None
-
-        for message in messages:
-            if int(channel_id) == int(message["channel_id"]):
-                sorted_messages.append(message)
+        sorted_messages: list[Optional[dict]] = self.__cached_messages.get_channel_messages(
+            channel_id, guild_id)  # pyright: ignore
 
         if not sorted_messages:
             return None
@@ -233,14 +643,7 @@ class Cache:
         :param channel_data: Pass the channel data
         """
 
-        guild_id: int = int(channel_data["guild_id"])
-
-        if self.__cached_channels.get(guild_id):
-            cached_channels: list = self.__cached_channels[guild_id]
-            cached_channels.append(channel_data)
-            self.__cached_channels[guild_id] = cached_channels
-        else:
-            self.__cached_channels[guild_id] = [channel_data]
+        self.update_channel(int(channel_data["guild_id"]), channel_data)
 
     def add_message_to_cache(self, message_data: dict) -> None:
         """
@@ -249,14 +652,7 @@ class Cache:
         :param message_data: Pass in the message data that is to be added to the cache
         """
 
-        guild_id: int = int(message_data["guild_id"])
-
-        if self.__cached_messages.get(guild_id):
-            cached_messages: list = self.__cached_messages[guild_id]
-            cached_messages.append(message_data)
-            self.__cached_messages[guild_id] = cached_messages
-        else:
-            self.__cached_messages[guild_id] = [message_data]
+        self.update_message(int(message_data["guild_id"]), message_data)
 
     def add_guild_to_cache(self, guild_data: dict) -> None:
         """
@@ -265,11 +661,10 @@ class Cache:
         :param guild_data: Pass dictionary of guild data
         """
 
-        for guild in self.__cached_guilds:
-            if int(guild["id"]) == int(guild_data["id"]):
-                return
+        guild_id: int = int(guild_data["id"])
 
-        self.__cached_guilds.append(guild_data)
+        if guild_id not in self.__cached_guilds:
+            self.__cached_guilds[guild_id] = self.__compact(self.__guild_record, guild_data)  # pyright: ignore
 
     def update_message(self, guild_id: int, message_data: dict) -> None:
         """
@@ -279,20 +674,8 @@ class Cache:
         :param message_data: Updated message data
         """
 
-        guild_id = int(guild_id)  # just to make sure
-
-        messages: Optional[list[dict]] = self.__cached_messages.get(guild_id)
-
-        if not messages:
-            self.__cached_messages[guild_id] = [message_data]
-            return
-
-        for index, message in enumerate(messages):
-            if int(message_data["id"]) == int(message["id"]):
-                del messages[index]
-
-        messages.append(message_data)
-        self.__cached_messages[guild_id] = messages
+        message_data = self.__compact(self.__message_record, message_data)  # pyright: ignore
+        self.__cached_messages.add(int(guild_id), message_data)
 
     def update_channel(self, guild_id: int, channel_data: dict) -> None:
         """
@@ -303,18 +686,15 @@ class Cache:
         """
 
         guild_id = int(guild_id)  # just to make sure
+        channel_id: int = int(channel_data["id"])
 
-        channels: Optional[list[dict]] = self.__cached_channels.get(guild_id)
-        if not channels:
-            self.__cached_channels[guild_id] = [channel_data]
-            return
+        channels: Optional[dict[int, dict]] = self.__cached_channels.get(guild_id)
 
-        for index, channel in enumerate(channels):
-            if int(channel_data["id"]) == int(channel["id"]):
-                del channels[index]
+        if channels is None:
+            channels = self.__cached_channels[guild_id] = {}
 
-        channels.append(channel_data)
-        self.__cached_channels[guild_id] = channels
+        channels[channel_id] = self.__compact(self.__channel_record, channel_data)  # pyright: ignore
+        self.__channel_guilds[channel_id] = guild_id
 
     def update_guild(self, guild_data: dict) -> None:
         """
@@ -323,90 +703,226 @@ class Cache:
         :param guild_data: Pass in the guild data
         """
 
-        guild_id: int = int(guild_data["id"])
+        self.__cached_guilds[int(guild_data["id"])] = self.__compact(self.__guild_record, guild_data)  # pyright: ignore
 
-        guilds: Optional[list[dict]] = self.__cached_guilds
+    def update_role(self, guild_id: int, role_data: dict) -> None:
+        """
+        The update_role function adds or replaces a role in the roles of the cached guild.
+
+        :param guild_id: Id of the guild
+        :param role_data: Role data
+        """
+
+        guild: Optional[dict] = self.__cached_guilds.get(int(guild_id))
 
-        if not len(guilds):
-            self.__cached_guilds = [guild_data]
+        if guild is None or "roles" not in guild:
             return
 
-        for index, guild in enumerate(guilds):
-            if int(guild["id"]) == guild_id:
-                del guilds[index]
+        role_id: str = str(role_data["id"])
+        roles: list[dict] = [role_data if str(role["id"]) == role_id else role for role in guild["roles"]]
+
+        if role_data not in roles:
+            roles.append(role_data)
+
+        guild["roles"] = roles
+
+    def remove_role(self, guild_id: int, role_id: int) -> Optional[dict]:
+        """
+        The remove_role function removes a role from the roles of the cached guild and returns its data.
+
+        :param guild_id: Id of the guild
+        :param role_id: Id of the role
+        """
+
+        guild: Optional[dict] = self.__cached_guilds.get(int(guild_id))
+
+        if guild is None or "roles" not in guild:
+            return None
+
+        removed: Optional[dict] = None
+        roles: list[dict] = []
+
+        for role in guild["roles"]:
+            if str(role["id"]) == str(role_id):
+                removed = role
+            else:
+                roles.append(role)
+
+        guild["roles"] = roles
+        return removed
+
+    def remove_message(self, message_id: int) -> Optional[dict]:
+        """
+        The remove_message function removes a message from the cache and returns its data.
+
+        :param message_id: Id of the message
+        """
+
+        return self.__cached_messages.remove(int(message_id))
+
+    def remove_channel(self, channel_id: int) -> Optional[dict]:
+        """
+        The remove_channel function removes a channel and its messages from the cache and returns the channel data.
+
+        :param channel_id: Id of the channel
+        """
+
+        channel_id = int(channel_id)
+        self.__cached_messages.remove_channel(channel_id)
+
+        guild_id: Optional[int] = self.__channel_guilds.pop(channel_id, None)
+
+        if guild_id is None:
+            return None
+
+        channels: dict[int, dict] = self.__cached_channels[guild_id]
+        channel_data: Optional[dict] = channels.pop(channel_id, None)
+
+        if not channels:
+            del self.__cached_channels[guild_id]
+
+        return channel_data
+
+    def remove_guild(self, guild_id: int) -> Optional[dict]:
+        """
+        The remove_guild function removes a guild with its channels and messages from the cache
+        and returns the guild data.
+
+        :param guild_id: Id of the guild
+        """
 
-        guilds.append(guild_data)
-        self.__cached_messages[guild_id] = guilds
+        guild_id = int(guild_id)
+        self.__cached_messages.remove_guild(guild_id)
+
+        for channel_id in self.__cached_channels.pop(guild_id, {}):
+            self.__channel_guilds.pop(channel_id, None)
+
+        return self.__cached_guilds.pop(guild_id, None)
+
+    def size(self) -> dict[str, int]:
+        """
+        The size function returns the number of cached guilds, channels and messages.
+        """
+
+        return {
+            "guilds": len(self.__cached_guilds),
+            "channels": len(self.__channel_guilds),
+            "messages": len(self.__cached_messages)
+        }
 
 
 class CacheEventHandler:
     """
     CacheEventHandler handles the caching of events.
     For example, when the gateway receives a response about a new message this class will add this message to the cache.
+    One handler is created for every gateway connection.
 
-    :param response: Store the gatewayresponse object that was passed to the gateway
     :param user: Get the user object who recived response
+    :param stats: Stats used to measure the time of the cache updates
     """
 
-    def __init__(self, response: GatewayResponse, user: UserClient):
-        self.event_name: str = response.event_name
-        self.response: GatewayResponse = response
+    events: tuple[str, ...] = (
+        "READY", "GUILD_CREATE", "GUILD_UPDATE", "GUILD_DELETE",
+        "MESSAGE_CREATE", "MESSAGE_UPDATE", "MESSAGE_DELETE", "MESSAGE_DELETE_BULK",
+        "CHANNEL_CREATE", "CHANNEL_UPDATE", "CHANNEL_DELETE",
+        "GUILD_ROLE_CREATE", "GUILD_ROLE_UPDATE", "GUILD_ROLE_DELETE"
+    )
+
+    def __init__(self, user: UserClient, stats: Optional[Stats] = None):
         self.user: UserClient = user
+        self.stats: Optional[Stats] = stats
+
+        self.handlers: dict[str, Callable[[Any], Optional[tuple]]] = {
+            "READY": self._ready,
+            "GUILD_CREATE": self._guild_create,
+            "MESSAGE_CREATE": self._message_create,
+            "CHANNEL_CREATE": self._channel_create,
+            "MESSAGE_UPDATE": self._message_update,
+            "CHANNEL_UPDATE": self._channel_update,
+            "GUILD_UPDATE": self._guild_update,
+            "GUILD_DELETE": self._guild_delete,
+            "MESSAGE_DELETE": self._message_delete,
+            "MESSAGE_DELETE_BULK": self._message_delete_bulk,
+            "CHANNEL_DELETE": self._channel_delete,
+            "GUILD_ROLE_CREATE": self._guild_role_update,
+            "GUILD_ROLE_UPDATE": self._guild_role_update,
+            "GUILD_ROLE_DELETE": self._guild_role_delete
+        }  # Format: "Event name": handler
 
-    def handle_cache(self):
+    def handle_cache(self, response: GatewayResponse) -> Optional[tuple]:
         """
-        Function checks if the event name is either
-        MESSAGE_CREATE or CHANNEL_CREATE, and then adds that data to the cache.
+        The handle_cache function updates the cache with the data of the response.
+        For the events like `on_message_edit` it returns the arguments to call the event:
+        the **before_data** from the cache and the new data.
+
+        :param response: Response received from the gateway
         """
 
-        if self.event_name == "MESSAGE_CREATE":
-            self.user.cache.add_message_to_cache(self.response.data)
+        handler: Optional[Callable[[Any], Optional[tuple]]] = self.handlers.get(response.event_name)
 
-        if self.event_name == "CHANNEL_CREATE":
-            self.user.cache.add_channel_to_cache(self.response.data)
+        if handler is None:
+            return None
 
-    def get_args(self) -> Optional[tuple]:
-        """
-        The get_args function is needed to get the arguments to call events like `on_message_edit`
-        It gets the **before_data** argument from the cache and then updates the cache
-        """
+        if self.stats is None or not self.stats.enabled:
+            return handler(response.data)
+
+        data: Any = response.data
+        start: float = perf_counter()
+
+        try:
+            return handler(data)
+        finally:
+            self.stats.observe("cache_update_seconds", perf_counter() - start, (("event", response.event_name),))
+
+    def _ready(self, data: dict) -> None:
+        self.user.cache.seed(data)
 
-        args: Optional[tuple] = None
+    def _guild_create(self, data: dict) -> None:
+        self.user.cache.seed_guild(data)
 
-        if self.event_name == "MESSAGE_UPDATE":
-            guild_id: int = int(self.response.data["guild_id"])
-            message_id: int = int(self.response.data["id"])
+    def _message_create(self, data: dict) -> None:
+        self.user.cache.add_message_to_cache(data)
 
-            before_message: Optional[dict] = self.user.cache.get_message(guild_id, message_id)
+    def _channel_create(self, data: dict) -> None:
+        self.user.cache.add_channel_to_cache(data)
 
-            if not before_message:
-                before_message = {}
+    def _message_update(self, data: dict) -> tuple:
+        guild_id: int = int(data["guild_id"])
+        before_message: Optional[dict] = self.user.cache.get_message(guild_id, int(data["id"]))
 
-            args = (self.user, before_message, self.response.data)
+        self.user.cache.update_message(guild_id, data)
+        return self.user, before_message or {}, data
 
-            self.user.cache.update_message(guild_id, self.response.data)
+    def _channel_update(self, data: dict) -> tuple:
+        guild_id: int = int(data["guild_id"])
+        before_channel: Optional[dict] = self.user.cache.get_channel(int(data["id"]), guild_id)
 
-        if self.event_name == "CHANNEL_UPDATE":
-            guild_id: int = int(self.response.data["guild_id"])
-            channel_id: int = int(self.response.data["id"])
-            before_channel: Optional[dict] = self.user.cache.get_channel(channel_id, guild_id)
+        self.user.cache.update_channel(guild_id, data)
+        return self.user, before_channel or {}, data
 
-            if not before_channel:
-                before_channel = {}
+    def _guild_update(self, data: dict) -> tuple:
+        before_guild: Optional[dict] = self.user.cache.get_guild(int(data["id"]))
 
-            args = (self.user, before_channel, self.response.data)
+        self.user.cache.update_guild(data)
+        return self.user, before_guild or {}, data
 
-            self.user.cache.update_channel(guild_id, self.response.data)
+    def _guild_delete(self, data: dict) -> None:
+        # Unavailable guilds are only affected by an outage and will be sent again with GUILD_CREATE
+        if not data.get("unavailable"):
+            self.user.cache.remove_guild(int(data["id"]))
 
-        if self.event_name == "GUILD_UPDATE":
-            guild_id: int = int(self.response.data["guild_id"])
-            before_guild: Optional[dict] = self.user.cache.get_guild(guild_id)
+    def _message_delete(self, data: dict) -> None:
+        self.user.cache.remove_message(int(data["id"]))
 
-            if not before_guild:
-                before_guild = {}
+    def _message_delete_bulk(self, data: dict) -> None:
+        for message_id in data["ids"]:
+            self.user.cache.remove_message(int(message_id))
 
-            args = (self.user, before_guild, self.response.data)
+    def _channel_delete(self, data: dict) -> None:
+        self.user.cache.remove_channel(int(data["id"]))
 
-            self.user.cache.update_guild(self.response.data)
+    def _guild_role_update(self, data: dict) -> None:
+        self.user.cache.update_role(int(data["guild_id"]), data["role"])
 
-        return args
+    def _guild_role_delete(self, data: dict) -> None:
+        self.user.cache.remove_role(int(data["guild_id"]), int(data["role_id"]))
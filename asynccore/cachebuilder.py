@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Optional, Iterable
+
+from .records import GUILD_FIELDS, CHANNEL_FIELDS, MESSAGE_FIELDS
+
+
+class CacheBuilder:
+    """
+    CacheBuilder allows you to configure the cache of every :class:`asynccore.user.UserClient`.
+    The finished object should be specified in the **cache** argument in the :class:`asynccore.client.Client` class.
+
+    :param max_messages: Maximum number of messages kept in the cache of a single account.
+        When it is exceeded, messages from the least recently used channel are removed first.
+        ``None`` disables the limit.
+    :param max_messages_per_channel: Maximum number of messages kept for a single channel.
+        When it is exceeded, the least recently added or read message of the channel is removed.
+        ``None`` disables the limit.
+    :param message_ttl: Number of seconds after which a cached message expires. ``None`` disables expiration.
+    :param compact_records: Store guilds, channels and messages as :class:`asynccore.records.CachedRecord`
+        objects that keep only the selected fields, instead of the raw dictionaries.
+    :param guild_fields: Fields of the guilds stored when **compact_records** is enabled
+    :param channel_fields: Fields of the channels stored when **compact_records** is enabled
+    :param message_fields: Fields of the messages stored when **compact_records** is enabled
+    :param snapshot_path: Path of the file the guilds and channels are saved to
+        (:class:`asynccore.snapshot.CacheSnapshot`). The snapshot is loaded when the gateway starts
+        and saved when the gateway stops. ``None`` disables the snapshots.
+    :param snapshot_interval: Number of seconds between the snapshots saved while the gateway is running.
+        ``None`` saves the snapshot only when the gateway stops.
+    """
+
+    __slots__ = ("max_messages", "max_messages_per_channel", "message_ttl", "compact_records",
+                 "guild_fields", "channel_fields", "message_fields", "snapshot_path", "snapshot_interval")
+
+    def __init__(self,
+                 max_messages: Optional[int] = 1000,
+                 max_messages_per_channel: Optional[int] = 100,
+                 message_ttl: Optional[float] = None,
+                 *,
+                 compact_records: bool = False,
+                 guild_fields: Iterable[str] = GUILD_FIELDS,
+                 channel_fields: Iterable[str] = CHANNEL_FIELDS,
+                 message_fields: Iterable[str] = MESSAGE_FIELDS,
+                 snapshot_path: Optional[str] = None,
+                 snapshot_interval: Optional[float] = None
+                 ):
+        self.max_messages: Optional[int] = max_messages
+        self.max_messages_per_channel: Optional[int] = max_messages_per_channel
+        self.message_ttl: Optional[float] = message_ttl
+
+        self.compact_records: bool = compact_records
+        self.guild_fields: tuple[str, ...] = tuple(guild_fields)
+        self.channel_fields: tuple[str, ...] = tuple(channel_fields)
+        self.message_fields: tuple[str, ...] = tuple(message_fields)
+
+        self.snapshot_path: Optional[str] = snapshot_path
+        self.snapshot_interval: Optional[float] = snapshot_interval
+
+    def __repr__(self):
+        return f"<CacheBuilder(max_messages={self.max_messages}, " \
+               f"max_messages_per_channel={self.max_messages_per_channel}, message_ttl={self.message_ttl}, " \
+               f"compact_records={self.compact_records}, snapshot_path={self.snapshot_path})>"
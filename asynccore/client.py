@@ -1,8 +1,10 @@
 #  pylint: disable=unused-argument
 
+from __future__ import annotations
+
 from collections.abc import AsyncIterable
 
-from typing import Union, Optional
+from typing import Any, Union, Optional
 from asyncio import AbstractEventLoop
 
 from .http import HTTPClient
@@ -10,6 +12,9 @@ from .typings import API_VERSION, ClientResponse, RGB_COLOR
 from .enums import ChannelType
 from .permissionbuilder import PermissionBuilder
 from .activity import ActivityBuilder
+from .cachebuilder import CacheBuilder
+from .settingsbuilder import SettingsBuilder
+from .monitor import LoopLagMonitor
 from .tasks import Tasks
 from .user import UserClient
 
@@ -26,7 +31,11 @@ class Client(HTTPClient):
     :param ratelimit_additional_cooldown: Add a cooldown to the ratelimit
     :param use_tasks: Enable or disable the tasks option (:class:`asynccore.tasks`), which for now is in beta.
     :param activity: The argument with type :class:`AcivityBuilder` is responsible for account activity.
-    :param startup_cache: Enable or disable cache fetching at program startup
+    :param startup_cache: Enable or disable requesting the cache data missing in the READY event from the api.
+        The guilds and channels sent by the gateway are always cached.
+    :param cache: The argument with type :class:`CacheBuilder` is responsible for the limits of the cache.
+    :param settings: The argument with type :class:`SettingsBuilder` is responsible for the codec, the metrics,
+        the loop lag monitor, the logs format and the endpoints.
     """
 
     __version__: str = "1.2.0"
@@ -38,17 +47,27 @@ class Client(HTTPClient):
             logger: bool = True,
             request_latency: float = 0.1,
             ratelimit_additional_cooldown: float = 10,
+            *,
             use_tasks: bool = False,
             activity: Optional[ActivityBuilder] = None,
-            startup_cache: bool = False
+            startup_cache: bool = False,
+            cache: Optional[CacheBuilder] = None,
+            settings: Optional[SettingsBuilder] = None
     ):  # type: ignore
 
-        super().__init__(api_version, loop, logger, request_latency,
-                         ratelimit_additional_cooldown, self, activity, startup_cache)
+        settings = settings if settings else SettingsBuilder()
+
+        super().__init__(api_version, loop, logger, request_latency, ratelimit_additional_cooldown,
+                         client=self, activity=activity, startup_cache=startup_cache, cache=cache, settings=settings)
 
         if use_tasks:
             self.tasks: Tasks = Tasks(client=self)
 
+        self.lag_monitor: Optional[LoopLagMonitor] = None
+
+        if settings.loop_lag_interval:
+            self.lag_monitor = LoopLagMonitor(client=self, interval=settings.loop_lag_interval)
+
     def login(self, tokens: Union[str, list[str]]) -> None:
         """
         The login function is used to check the provided tokens.
@@ -61,6 +80,40 @@ class Client(HTTPClient):
 
         self._check_tokens(tokens)
 
+    def stats(self) -> dict:
+        """
+        The stats function returns the snapshot of the metrics collected by the client,
+        such as the number of received frames, the decoding time or the time of the cache updates.
+        See :meth:`asynccore.stats.Stats.snapshot` for the format.
+
+        .. note::
+            The metrics are collected only if **collect_stats** is set to True in the :class:`SettingsBuilder`.
+        """
+
+        return self.metrics.snapshot()
+
+    def stats_prometheus(self) -> str:
+        """
+        The stats_prometheus function returns the metrics collected by the client in the prometheus text format.
+        """
+
+        return self.metrics.to_prometheus()
+
+    def http_stats(self) -> list[dict[str, Any]]:
+        """
+        The http_stats function returns the latency of the requests to the api for every method, route and status:
+        DNS, connect, time to first byte and the total time.
+        See :meth:`asynccore.tracing.HTTPTracer.routes` for the format.
+
+        .. note::
+            The requests are traced only if **collect_stats** is set to True in the :class:`SettingsBuilder`.
+        """
+
+        if self.session is None or self.session.tracer is None:
+            return []
+
+        return self.session.tracer.routes()
+
     async def send_message(self, channel_id: int, message_content: str) -> Optional[AsyncIterable[ClientResponse]]:
         """
         The send_message function sends a message to the specified channel.
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import Any, Union
+import json
+
+from . import etf
+
+try:
+    import orjson  # pyright: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import ujson  # pyright: ignore
+except ImportError:
+    ujson = None
+
+__all__: tuple[str, ...] = (
+    "JSONCodec",
+    "OrjsonCodec",
+    "UjsonCodec",
+    "EtfCodec",
+    "get_codec"
+)
+
+_JSON_DECODER: json.JSONDecoder = json.JSONDecoder()
+
+
+class JSONCodec:
+    """
+    JSONCodec encodes and decodes the data sent to and received from discord.
+    It is used by the gateway and by the http session.
+    The default implementation uses the :mod:`json` module from the standard library.
+
+    :ivar name: Name of the codec
+    :vartype name: :class:`str`
+
+    :ivar binary: Whether the codec encodes to bytes
+    :vartype binary: :class:`bool`
+
+    :ivar incremental: Whether the codec can decode a value starting at any position of the text
+        (:meth:`raw_decode`), which is needed to decode the large frames in steps
+    :vartype incremental: :class:`bool`
+    """
+
+    name: str = "json"
+    binary: bool = False
+    incremental: bool = True
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        The loads function decodes the data.
+
+        :param data: Encoded data
+        """
+
+        return json.loads(data)
+
+    def dumps(self, data: Any) -> Union[str, bytes]:
+        """
+        The dumps function encodes the data.
+
+        :param data: Data to encode
+        """
+
+        return json.dumps(data, separators=(",", ":"))
+
+    def raw_decode(self, data: str, index: int = 0) -> tuple[Any, int]:
+        """
+        The raw_decode function decodes the value starting at the index of the text
+        and returns it with the index where the value ends.
+
+        :param data: Encoded text
+        :param index: Position where the value starts
+        """
+
+        return _JSON_DECODER.raw_decode(data, index)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}(name={self.name})>"
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    JSONCodec that uses the `orjson <https://pypi.org/project/orjson/>`_ library.
+    """
+
+    name: str = "orjson"
+    incremental: bool = False
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)  # pyright: ignore
+
+    def dumps(self, data: Any) -> str:
+        return orjson.dumps(data).decode()  # pyright: ignore
+
+
+class UjsonCodec(JSONCodec):
+    """
+    JSONCodec that uses the `ujson <https://pypi.org/project/ujson/>`_ library.
+    """
+
+    name: str = "ujson"
+    incremental: bool = False
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return ujson.loads(data)  # pyright: ignore
+
+    def dumps(self, data: Any) -> str:
+        return ujson.dumps(data, ensure_ascii=False)  # pyright: ignore
+
+
+class EtfCodec(JSONCodec):
+    """
+    Codec that uses the erlang external term format. It is used by the gateway with **encoding=etf**.
+
+    .. note::
+        Snowflakes are sent by discord as integers in this format.
+    """
+
+    name: str = "etf"
+    binary: bool = True
+    incremental: bool = False
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return etf.unpack(data.encode("latin-1") if isinstance(data, str) else data)
+
+    def dumps(self, data: Any) -> bytes:
+        return etf.pack(data)
+
+
+_CODECS: dict[str, tuple[type[JSONCodec], Any]] = {
+    "orjson": (OrjsonCodec, orjson),
+    "ujson": (UjsonCodec, ujson),
+    "json": (JSONCodec, json)
+}
+
+
+def get_codec(codec: Union[str, JSONCodec] = "auto") -> JSONCodec:
+    """
+    The get_codec function returns the codec with the given name.
+    If the library required by the codec is not installed, the codec from the standard library is returned,
+    the client logs it with its logger.
+
+    :param codec: Name of the codec (**auto**, **orjson**, **ujson**, **json**) or the codec object.
+        **auto** selects the fastest installed codec.
+    """
+
+    if isinstance(codec, JSONCodec):
+        return codec
+
+    if codec == "auto":
+        for codec_class, module in _CODECS.values():
+            if module is not None:
+                return codec_class()
+
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown codec: {codec}. Available codecs: auto, {', '.join(_CODECS)}")
+
+    codec_class, module = _CODECS[codec]
+
+    if module is None:
+        return JSONCodec()
+
+    return codec_class()
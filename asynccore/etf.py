@@ -0,0 +1,267 @@
+"""
+Pure python implementation of the erlang external term format used by the discord gateway with **encoding=etf**.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Union
+from struct import Struct
+import zlib
+
+__all__: tuple[str, ...] = ("pack", "unpack", "EtfDecodeError")
+
+FORMAT_VERSION: int = 131
+
+NEW_FLOAT_EXT: int = 70
+COMPRESSED: int = 80
+SMALL_INTEGER_EXT: int = 97
+INTEGER_EXT: int = 98
+FLOAT_EXT: int = 99
+ATOM_EXT: int = 100
+SMALL_TUPLE_EXT: int = 104
+LARGE_TUPLE_EXT: int = 105
+NIL_EXT: int = 106
+STRING_EXT: int = 107
+LIST_EXT: int = 108
+BINARY_EXT: int = 109
+SMALL_BIG_EXT: int = 110
+LARGE_BIG_EXT: int = 111
+MAP_EXT: int = 116
+SMALL_ATOM_EXT: int = 115
+ATOM_UTF8_EXT: int = 118
+SMALL_ATOM_UTF8_EXT: int = 119
+
+_UINT16: Struct = Struct(">H")
+_UINT32: Struct = Struct(">I")
+_INT32: Struct = Struct(">i")
+_FLOAT64: Struct = Struct(">d")
+
+_ATOMS: dict[str, Any] = {"nil": None, "null": None, "true": True, "false": False}
+
+
+class EtfDecodeError(ValueError):
+
+    def __init__(self, message: str):
+        super().__init__(message)
+
+
+class _Decoder:
+    __slots__ = ("data", "offset", "handlers")
+
+    def __init__(self, data: bytes) -> None:
+        self.data: bytes = data
+        self.offset: int = 0
+        self.handlers: dict[int, Callable[[], Any]] = {
+            NEW_FLOAT_EXT: self.new_float,
+            SMALL_INTEGER_EXT: self.small_integer,
+            INTEGER_EXT: self.integer,
+            FLOAT_EXT: self.float,
+            ATOM_EXT: self.atom,
+            ATOM_UTF8_EXT: self.atom,
+            SMALL_ATOM_EXT: self.small_atom,
+            SMALL_ATOM_UTF8_EXT: self.small_atom,
+            SMALL_TUPLE_EXT: self.small_tuple,
+            LARGE_TUPLE_EXT: self.large_tuple,
+            NIL_EXT: list,
+            STRING_EXT: self.string,
+            LIST_EXT: self.list,
+            BINARY_EXT: self.binary,
+            SMALL_BIG_EXT: self.small_big,
+            LARGE_BIG_EXT: self.large_big,
+            MAP_EXT: self.map
+        }
+
+    def term(self) -> Any:
+        tag: int = self.data[self.offset]
+        self.offset += 1
+
+        handler = self.handlers.get(tag)
+        if handler is None:
+            raise EtfDecodeError(f"Unsupported term tag: {tag} at offset {self.offset - 1}")
+
+        return handler()
+
+    def read(self, size: int) -> bytes:
+        start: int = self.offset
+        self.offset += size
+
+        if self.offset > len(self.data):
+            raise EtfDecodeError("Unexpected end of data")
+
+        return self.data[start:self.offset]
+
+    def uint8(self) -> int:
+        value: int = self.data[self.offset]
+        self.offset += 1
+        return value
+
+    def uint16(self) -> int:
+        value: int = _UINT16.unpack_from(self.data, self.offset)[0]
+        self.offset += 2
+        return value
+
+    def uint32(self) -> int:
+        value: int = _UINT32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def new_float(self) -> float:
+        value: float = _FLOAT64.unpack_from(self.data, self.offset)[0]
+        self.offset += 8
+        return value
+
+    def small_integer(self) -> int:
+        return self.uint8()
+
+    def integer(self) -> int:
+        value: int = _INT32.unpack_from(self.data, self.offset)[0]
+        self.offset += 4
+        return value
+
+    def float(self) -> float:
+        return float(self.read(31).split(b"\x00", 1)[0])
+
+    def atom(self) -> Any:
+        name: str = self.read(self.uint16()).decode()
+        return _ATOMS.get(name, name)
+
+    def small_atom(self) -> Any:
+        name: str = self.read(self.uint8()).decode()
+        return _ATOMS.get(name, name)
+
+    def small_tuple(self) -> tuple:
+        return tuple(self.term() for _ in range(self.uint8()))
+
+    def large_tuple(self) -> tuple:
+        return tuple(self.term() for _ in range(self.uint32()))
+
+    def string(self) -> str:
+        return self.read(self.uint16()).decode("latin-1")
+
+    def list(self) -> list:
+        items: list = [self.term() for _ in range(self.uint32())]
+        tail: Any = self.term()
+
+        if tail != []:  # pylint: disable=use-implicit-booleaness-not-comparison
+            items.append(tail)
+
+        return items
+
+    def binary(self) -> str:
+        return self.read(self.uint32()).decode()
+
+    def big(self, digits: int) -> int:
+        sign: int = self.uint8()
+        value: int = int.from_bytes(self.read(digits), "little")
+        return -value if sign else value
+
+    def small_big(self) -> int:
+        return self.big(self.uint8())
+
+    def large_big(self) -> int:
+        return self.big(self.uint32())
+
+    def map(self) -> dict:
+        return {self.term(): self.term() for _ in range(self.uint32())}
+
+
+def unpack(data: Union[bytes, bytearray, memoryview]) -> Any:
+    """
+    The unpack function decodes the data in the erlang external term format.
+    Atoms are decoded to :class:`str` (except **nil**, **true** and **false**) and binaries to utf-8 :class:`str`.
+
+    :param data: Encoded data
+    """
+
+    data = bytes(data)
+
+    if not data or data[0] != FORMAT_VERSION:
+        raise EtfDecodeError("Invalid format version")
+
+    if len(data) > 1 and data[1] == COMPRESSED:
+        size: int = _UINT32.unpack_from(data, 2)[0]
+        data = bytes((FORMAT_VERSION,)) + zlib.decompress(data[6:], bufsize=size)
+
+    decoder: _Decoder = _Decoder(data)
+    decoder.offset = 1
+
+    return decoder.term()
+
+
+def _pack_term(value: Any, buffer: bytearray) -> None:
+    # pylint: disable=too-many-branches
+    if value is None:
+        buffer += b"\x77\x03nil"
+
+    elif value is True:
+        buffer += b"\x77\x04true"
+
+    elif value is False:
+        buffer += b"\x77\x05false"
+
+    elif isinstance(value, int):
+        if 0 <= value <= 255:
+            buffer.append(SMALL_INTEGER_EXT)
+            buffer.append(value)
+
+        elif -2 ** 31 <= value < 2 ** 31:
+            buffer.append(INTEGER_EXT)
+            buffer += _INT32.pack(value)
+
+        else:
+            digits: bytes = abs(value).to_bytes((abs(value).bit_length() + 7) // 8, "little")
+
+            if len(digits) > 255:
+                raise ValueError(f"Integer is too large to encode: {value}")
+
+            buffer.append(SMALL_BIG_EXT)
+            buffer.append(len(digits))
+            buffer.append(1 if value < 0 else 0)
+            buffer += digits
+
+    elif isinstance(value, float):
+        buffer.append(NEW_FLOAT_EXT)
+        buffer += _FLOAT64.pack(value)
+
+    elif isinstance(value, (str, bytes, bytearray)):
+        encoded: bytes = value.encode() if isinstance(value, str) else bytes(value)
+        buffer.append(BINARY_EXT)
+        buffer += _UINT32.pack(len(encoded))
+        buffer += encoded
+
+    elif isinstance(value, dict):
+        buffer.append(MAP_EXT)
+        buffer += _UINT32.pack(len(value))
+
+        for key, item in value.items():
+            _pack_term(key, buffer)
+            _pack_term(item, buffer)
+
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            buffer.append(NIL_EXT)
+            return
+
+        buffer.append(LIST_EXT)
+        buffer += _UINT32.pack(len(value))
+
+        for item in value:
+            _pack_term(item, buffer)
+
+        buffer.append(NIL_EXT)
+
+    else:
+        raise TypeError(f"Object of type {type(value).__name__} can not be encoded to etf")
+
+
+def pack(value: Any) -> bytes:
+    """
+    The pack function encodes the value in the erlang external term format.
+    Strings are encoded as binaries, like the discord gateway expects.
+
+    :param value: Value to encode
+    """
+
+    buffer: bytearray = bytearray((FORMAT_VERSION,))
+    _pack_term(value, buffer)
+    return bytes(buffer)
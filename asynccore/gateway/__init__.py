@@ -2,6 +2,8 @@
 Module responsible for communication with the gateway
 """
 
+from __future__ import annotations
+
 from .gateway import GatewayConnection, GatewayResponse, Gateway
 
 __all__: tuple[str, str, str] = (
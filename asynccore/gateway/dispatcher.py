@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from typing import Callable, Optional, TYPE_CHECKING
+from asyncio import AbstractEventLoop, Task, CancelledError
+from collections import deque
+from time import perf_counter
+
+from .enums import DispatchOverflow
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from ..stats import Stats
+
+
+class DispatchLimits:
+    """
+    Limits of the dispatch of a single event.
+
+    :param concurrency: Maximum number of callbacks running at the same time. ``None`` disables the limit
+    :param backlog: Maximum number of callbacks waiting for a free slot. ``None`` disables the limit
+    :param overflow: What to do with a new callback when the backlog is full
+    """
+
+    __slots__ = ("concurrency", "backlog", "overflow")
+
+    def __init__(self, concurrency: Optional[int] = None, backlog: Optional[int] = 1000,
+                 overflow: DispatchOverflow = DispatchOverflow.DROP_OLDEST) -> None:
+        self.concurrency: Optional[int] = concurrency
+        self.backlog: Optional[int] = backlog
+        self.overflow: DispatchOverflow = overflow
+
+    def __repr__(self):
+        return f"<DispatchLimits(concurrency={self.concurrency}, backlog={self.backlog}, overflow={self.overflow})>"
+
+
+class EventDispatcher:
+    """
+    EventDispatcher runs the callbacks of the events as tasks.
+    It keeps a reference to every running task, reports the exceptions raised by the callbacks
+    and limits the number of callbacks of the same event running at the same time.
+    Callbacks over the limit wait in a bounded backlog.
+
+    :param loop: Loop used to create the tasks
+    :param logger: Logger used to report the exceptions
+    :param stats: Stats used to measure the time between the dispatch and the start of the callback
+    """
+
+    def __init__(self, loop: AbstractEventLoop, logger: Logger, stats: Optional[Stats] = None) -> None:
+        self.loop: AbstractEventLoop = loop
+        self.logger: Logger = logger
+        self.stats: Optional[Stats] = stats
+
+        self.default_limits: DispatchLimits = DispatchLimits()
+        self.limits: dict[str, DispatchLimits] = {}  # Format: "Event name": limits
+
+        self._running: dict[str, set[Task]] = {}
+        self._backlog: dict[str, deque[tuple[Callable, tuple]]] = {}
+
+        self.dropped: dict[str, int] = {}
+        self.failed: dict[str, int] = {}
+
+    def configure(self, event_name: Optional[str] = None, concurrency: Optional[int] = None,
+                  backlog: Optional[int] = 1000, overflow: DispatchOverflow = DispatchOverflow.DROP_OLDEST) -> None:
+        """
+        The configure function sets the dispatch limits of the event.
+
+        :param event_name: Name of the event, for example **on_message_create**.
+            If not specified, the limits are used for all events without their own limits
+        :param concurrency: Maximum number of callbacks running at the same time. ``None`` disables the limit
+        :param backlog: Maximum number of callbacks waiting for a free slot. ``None`` disables the limit
+        :param overflow: What to do with a new callback when the backlog is full
+        """
+
+        limits: DispatchLimits = DispatchLimits(concurrency, backlog, overflow)
+
+        if event_name is None:
+            self.default_limits = limits
+        else:
+            self.limits[event_name] = limits
+
+    def dispatch(self, event_name: str, callback: Callable, args: tuple) -> bool:
+        """
+        The dispatch function runs the callback or adds it to the backlog if the concurrency limit is reached.
+        Returns False if the callback was dropped.
+
+        :param event_name: Name of the event
+        :param callback: Coroutine function to call
+        :param args: Arguments of the callback
+        """
+
+        if self.stats is not None and self.stats.enabled:
+            callback = self._measure(event_name, callback, perf_counter())
+
+        limits: DispatchLimits = self.limits.get(event_name, self.default_limits)
+        running: Optional[set[Task]] = self._running.get(event_name)
+
+        if limits.concurrency is None or running is None or len(running) < limits.concurrency:
+            self._start(event_name, callback, args)
+            return True
+
+        backlog: Optional[deque[tuple[Callable, tuple]]] = self._backlog.get(event_name)
+
+        if backlog is None:
+            backlog = self._backlog[event_name] = deque()
+
+        if limits.backlog is not None and len(backlog) >= limits.backlog:
+            self.dropped[event_name] = self.dropped.get(event_name, 0) + 1
+
+            if limits.overflow is DispatchOverflow.DROP_NEWEST or not limits.backlog:
+                return False
+
+            backlog.popleft()
+
+        backlog.append((callback, args))
+        return True
+
+    def depth(self, event_name: Optional[str] = None) -> int:
+        """
+        The depth function returns the number of callbacks waiting in the backlog.
+
+        :param event_name: Name of the event. If not specified, the sum for all events is returned
+        """
+
+        if event_name is not None:
+            return len(self._backlog.get(event_name, ()))
+
+        return sum(len(backlog) for backlog in self._backlog.values())
+
+    def in_flight(self, event_name: Optional[str] = None) -> int:
+        """
+        The in_flight function returns the number of running callbacks.
+
+        :param event_name: Name of the event. If not specified, the sum for all events is returned
+        """
+
+        if event_name is not None:
+            return len(self._running.get(event_name, ()))
+
+        return sum(len(tasks) for tasks in self._running.values())
+
+    def _measure(self, event_name: str, callback: Callable, dispatched_at: float) -> Callable:
+        async def measured_callback(*args):
+            self.stats.observe("dispatch_latency_seconds", perf_counter() - dispatched_at,  # type: ignore
+                               (("event", event_name),))
+            return await callback(*args)
+
+        return measured_callback
+
+    def _start(self, event_name: str, callback: Callable, args: tuple) -> None:
+        task: Task = self.loop.create_task(callback(*args))
+
+        running: Optional[set[Task]] = self._running.get(event_name)
+        if running is None:
+            running = self._running[event_name] = set()
+
+        running.add(task)
+        task.add_done_callback(lambda done_task: self._on_done(event_name, done_task))
+
+    def _on_done(self, event_name: str, task: Task) -> None:
+        self._running[event_name].discard(task)
+
+        try:
+            exception: Optional[BaseException] = task.exception()
+        except CancelledError:
+            exception = None
+
+        if exception is not None:
+            self.failed[event_name] = self.failed.get(event_name, 0) + 1
+            self.logger.error("Exception in the %s event callback: %r", event_name, exception, exc_info=exception)
+
+        backlog: Optional[deque[tuple[Callable, tuple]]] = self._backlog.get(event_name)
+
+        if backlog:
+            callback, args = backlog.popleft()
+            self._start(event_name, callback, args)
+
+    def __repr__(self):
+        return f"<EventDispatcher(in_flight={self.in_flight()}, depth={self.depth()})>"
@@ -20,3 +20,18 @@ class Events(Enum):
     GUILD_ROLE_DELETE = "on_guild_role_delete"
     GUILD_BAN_ADD = "on_guild_ban_add"
     GUILD_BAN_REMOVE = "on_guild_ban_remove"
+
+
+class ConnectionState(Enum):
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    IDENTIFYING = "identifying"
+    RESUMING = "resuming"
+    CONNECTED = "connected"
+    RECONNECTING = "reconnecting"
+    CLOSED = "closed"
+
+
+class DispatchOverflow(Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
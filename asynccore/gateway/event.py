@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-from typing import Optional, Callable, TYPE_CHECKING
-from asyncio import iscoroutinefunction
+from typing import Optional, TYPE_CHECKING
 
 from .response import GatewayResponse
-from .errors import FunctionIsNotCoroutine
-from .enums import Events
+from .enums import Events, ConnectionState
 from ..cache import CacheEventHandler
 
 if TYPE_CHECKING:
@@ -13,54 +11,57 @@ if TYPE_CHECKING:
     from ..client import Client
     from .gateway import Gateway, GatewayConnection
 
+# Format: "DISCORD_EVENT": "Event name"
+_EVENT_NAMES: dict[str, str] = {event.name: event.value for event in Events}
+
 
 class EventHandler:
     """
-    EventHanlder is responsible for handling all evnets with :class:`Events`
+    EventHanlder is responsible for handling all evnets with :class:`Events`.
+    One handler is created for every gateway connection,
+    the callbacks are taken from the dispatch table of the :class:`asynccore.gateway.gateway.Gateway`.
 
-    :param response: Get the event name and data
-    :param kwargs: Pass in the user, client and gateway objects
+    :param kwargs: Pass in the user, client, gateway and connection objects
     """
-    def __init__(self, response: GatewayResponse, **kwargs):
-
-        self.response: GatewayResponse = response
+    def __init__(self, **kwargs):
 
         self.user: UserClient = kwargs["user"]
         self.client: Client = kwargs["client"]
         self.gateway: Gateway = kwargs["gateway"]
         self.connection: GatewayConnection = kwargs["connection"]
 
-        self.event_name: str = self.reformat_event_name(
-            event_name=response.event_name
-        )  # pyright: ignore
+        self.cache_handler: CacheEventHandler = CacheEventHandler(self.user, self.gateway.stats)
 
-        self.available_events: dict[str, tuple] = {
-        }  # Format: "Event name": (default_callback, *args)
+    async def handle_abstract_events(self, response: GatewayResponse):
+        if response.op == 11:
+            self.connection.heartbeat_ack()
 
-        for event in Events:
-            func = getattr(self.client, event.value)
+        elif response.op == 1:
+            await self.connection.send_heartbeat()
 
-            if event.name == "READY":
-                args: tuple = (func, self.user)
-            else:
-                args: tuple = (func, self.user, self.response.data)
+        elif response.op == 7:
+            await self.connection.restart(resume=True)
 
-            self.available_events[event.value] = args
+        elif response.op == 9:
+            await self.connection.invalid_session(bool(response.data))
 
-    async def handle_abstract_events(self):
-        if self.response.op == 10:
-            latency: int = self.response.data["heartbeat_interval"] / 1000
-            self.connection._pulse = latency
-            await self.connection.login()
-            await self.connection.begin_presence()
+        elif response.op == 10:
+            self.connection.hello(response.data["heartbeat_interval"] / 1000)
 
-        elif self.response.event_name == "GUILD_MEMBER_LIST_UPDATE":
+            if self.connection.state is ConnectionState.RESUMING:
+                await self.connection._send_resume()  # pylint: disable=protected-access
+            else:
+                self.connection.state = ConnectionState.IDENTIFYING
+                await self.connection.login()
+                await self.connection.begin_presence()
 
-            if self.response.data["ops"][0]["op"] == "SYNC" and self.connection.func:
+        elif response.event_name == "GUILD_MEMBER_LIST_UPDATE":
+
+            if response.data["ops"][0]["op"] == "SYNC" and self.connection.func:
                 self.connection._times = 0
-                await self.connection.func(self.response.data, self.connection._func_limit)
+                await self.connection.func(response.data, self.connection._func_limit)
 
-            elif self.response.data["ops"][0]["op"] == "INVALIDATE":
+            elif response.data["ops"][0]["op"] == "INVALIDATE":
                 self.connection._times += 1
                 if self.connection._times >= 5:
                     self.connection._times = 0
@@ -69,50 +70,31 @@ class EventHandler:
 
         else:
             if self.connection.func:
-                await self.connection.func(self.response.data)
+                await self.connection.func(response.data)
                 self.connection.func = None
 
-    async def handle_event(self) -> bool:
+    async def handle_event(self, response: GatewayResponse) -> bool:
         """
         The handle_event function is responsible for handling the event that was received from the gateway.
-        It will first check if there is a custom event handler registered in the events dictionary of your client,
-        and if so, it will call that function with any arguments passed to it.
-        If no custom event handler exists, then it will call the default one provided by :class:`Client`
-        """
-
-        cache_stuff: CacheEventHandler = CacheEventHandler(self.response, self.user)
-        cache_stuff.handle_cache()
+        It updates the cache and then looks up the callback in the dispatch table of the gateway:
+        the event handler registered with :meth:`Gateway.event` or the default one provided by :class:`Client`.
+        The callback is run by the :class:`asynccore.gateway.dispatcher.EventDispatcher` of the gateway.
 
-        event_args: Optional[tuple] = None
-
-        if self.event_name in ("on_message_edit", "on_channel_edit", "on_guild_update"):
-            event_args = cache_stuff.get_args()
+        :param response: Response received from the gateway
+        """
 
-            if not event_args:
-                return False
+        event_args: Optional[tuple] = self.cache_handler.handle_cache(response)
+        dispatch: Optional[tuple] = self.gateway.dispatch_table.get(response.event_name)
 
-        if not self.available_events.get(self.event_name):
+        if dispatch is None:
             return False
 
-        event_callback: Optional[Callable] = self.gateway.events.get(self.event_name)  # pyright: ignore
-
-        default_event_callback: Optional[Callable] = self.available_events[self.event_name][0]  # pyright: ignore
-        if not event_args:
-            event_args: Optional[tuple] = self.available_events[self.event_name][1::]  # pyright: ignore
+        event_name, event_callback, requires_data = dispatch
 
-        if event_callback:
-            self.client.loop.create_task(
-                event_callback(*event_args) if event_args else event_callback()
-            )
-        else:
-            if iscoroutinefunction(default_event_callback):
-                self.client.loop.create_task(
-                    default_event_callback(*event_args) if event_args else default_event_callback()
-                )
-            else:
-                raise FunctionIsNotCoroutine(default_event_callback)
+        if event_args is None:
+            event_args = (self.user, response.data) if requires_data else (self.user,)
 
-        return True
+        return self.gateway.dispatcher.dispatch(event_name, event_callback, event_args)
 
     @staticmethod
     def reformat_event_name(event_name: Optional[str]) -> Optional[str]:
@@ -123,11 +105,7 @@ class EventHandler:
         :param event_name: Specify the event_name
         """
 
-        for event in Events:
-            if event.name == event_name:
-                event_name = event.value
-
         if not event_name:
             return " "
 
-        return event_name
+        return _EVENT_NAMES.get(event_name, event_name)
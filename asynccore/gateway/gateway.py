@@ -1,17 +1,37 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Callable
-from time import time
-
-from json import dumps
-from asyncio import AbstractEventLoop, sleep, Queue, create_task, gather, Task, iscoroutinefunction
-import socket
-from websockets import connect, WebSocketClientProtocol, ConnectionClosed  # pyright: ignore
+from typing import TYPE_CHECKING, Optional, Callable, Any, Union
+from time import time, perf_counter
+from random import random
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from concurrent.futures import Executor
+from asyncio import (AbstractEventLoop, sleep, create_task, gather, Future, Task, iscoroutinefunction, wait,
+                     FIRST_COMPLETED, TimeoutError as AsyncTimeoutError)
+from websockets import ConnectionClosed, InvalidHandshake  # pyright: ignore
+
+try:
+    # websockets >= 13
+    from websockets.asyncio.client import connect, ClientConnection as WebSocketClientProtocol  # pyright: ignore
+    _HEADERS_ARGUMENT: str = "additional_headers"
+except ImportError:
+    from websockets import connect, WebSocketClientProtocol  # pyright: ignore
+    _HEADERS_ARGUMENT: str = "extra_headers"  # pyright: ignore
 
 from .response import GatewayResponse
 from .errors import MissingEventName, InvalidEventName, FunctionIsNotCoroutine
 from .event import EventHandler
+from .dispatcher import EventDispatcher
+from .profiler import HandlerProfiler
+from .decoder import FrameDecoder
+from .recorder import GatewayRecorder, GatewayReplayer
+from .state import Session, RequestQueue, Heartbeat, Compression
+from .enums import DispatchOverflow, ConnectionState
+from ..cache import CacheEventHandler
 from .enums import Events
+from ..codec import JSONCodec, EtfCodec
+from ..typings import GATEWAY_ENCODING
+from ..stats import Stats
 
 if TYPE_CHECKING:
     from ..client import Client
@@ -19,6 +39,19 @@ if TYPE_CHECKING:
     from ..activity import ActivityBuilder
 
 
+ABSTRACT_EVENTS: frozenset[str] = frozenset(("GUILD_APPLICATION_COMMANDS_UPDATE", "GUILD_MEMBER_LIST_UPDATE"))
+REQUIRED_EVENTS: frozenset[str] = ABSTRACT_EVENTS | {"READY", "RESUMED"}
+ABSTRACT_OPS: frozenset[int] = frozenset((1, 7, 9, 10, 11))  # Heartbeat, reconnect, invalid session, hello, ack
+
+# Authentication failed, invalid shard, sharding required, invalid api version, invalid intents, disallowed intents
+FATAL_CLOSE_CODES: frozenset[int] = frozenset((4004, 4010, 4011, 4012, 4013, 4014))
+# Invalid sequence, session timed out
+SESSION_CLOSE_CODES: frozenset[int] = frozenset((4007, 4009))
+
+RECONNECT_BACKOFF_BASE: float = 1.0
+RECONNECT_BACKOFF_CAP: float = 60.0
+
+
 def parametrized(decorator):
     def layer(*args, **kwargs):
         def repl(function):
@@ -39,6 +72,8 @@ class Gateway:
     :param activity: Set the activity of the user
     """
 
+    supportted_events: list[str] = [event.value for event in Events]
+
     def __init__(self, client: Client, gateway_url: str, activity: Optional[ActivityBuilder]):
 
         self.client: Client = client
@@ -46,18 +81,248 @@ class Gateway:
         self.activity = activity
 
         self.events: dict[str, Callable] = {}
+        self.codec: JSONCodec = client.codec
+        self.compress: bool = False
+        self.encoding: GATEWAY_ENCODING = "json"
+
+        self.stats: Stats = client.metrics
+        self.dispatcher: EventDispatcher = EventDispatcher(loop=client.loop, logger=client.logger, stats=self.stats)
+
+        self.stats.add_gauge("dispatch_in_flight", self.dispatcher.in_flight)
+        self.stats.add_gauge("dispatch_backlog", self.dispatcher.depth)
 
-        self.supportted_events: list[str] = [event.value for event in Events]
+        self.profiler: Optional[HandlerProfiler] = None
+        self.decoder: FrameDecoder = FrameDecoder()
+        self.recording: Optional[tuple[str, bool]] = None  # Format: (path, redact)
 
-    def run(self, reconnect: bool = False):
+        self.subscriptions: Optional[set[str]] = None
+        self.allowed_events: Optional[frozenset[str]] = None
+
+        self.dispatch_table: dict[str, tuple[str, Callable, bool]] = {
+        }  # Format: "DISCORD_EVENT": ("Event name", callback, requires_data)
+        self.build_dispatch_table()
+
+    def run(self, reconnect: bool = False, compress: bool = False, encoding: GATEWAY_ENCODING = "json"):
         """
         Main method of the class. Starts the users' gateways
 
         :param reconnect: Determine if the user should reconnect to the server or not
+        :param compress: Enable zlib-stream compression of the data sent by the gateway
+        :param encoding: Encoding of the gateway data: **json** (uses the codec of the client) or **etf**
         """
 
+        if encoding not in ("json", "etf"):
+            raise ValueError(f"Unsupported gateway encoding: {encoding}. Available encodings: json, etf")
+
+        self.compress = compress
+        self.encoding = encoding
+        self.codec = EtfCodec() if encoding == "etf" else self.client.codec
+
+        # Handlers can be assigned to the client after the gateway was created
+        self.build_dispatch_table()
         self.__start(reconnect)
 
+    def build_dispatch_table(self) -> None:
+        """
+        The build_dispatch_table function creates the table used to dispatch the events received from the gateway.
+        For each event it selects the handler registered with :meth:`event`
+        or the one overridden in the :class:`asynccore.client.Client`.
+        Events handled only by the empty defaults of the client are left out, so they don't start any callback
+        and their data is decoded only if the cache needs it.
+        If the profiler is enabled, the handlers are wrapped with :meth:`HandlerProfiler.wrap`.
+        It's called again every time a new handler is registered and when the gateway is started.
+        """
+
+        dispatch_table: dict[str, tuple[str, Callable, bool]] = {}
+
+        for event in Events:
+            callback: Optional[Callable] = self.events.get(event.value) or self.__overridden_handler(event.value)
+
+            if callback is None:
+                continue
+
+            if self.profiler is not None:
+                callback = self.profiler.wrap(event.value, callback)
+
+            dispatch_table[event.name] = (event.value, callback, event.name != "READY")  # pyright: ignore
+
+        self.dispatch_table = dispatch_table
+        self.__update_allowed_events()
+
+    def __overridden_handler(self, event_name: str) -> Optional[Callable]:
+        from ..client import Client  # pylint: disable=import-outside-toplevel
+
+        callback: Callable = getattr(self.client, event_name)
+
+        if getattr(callback, "__func__", callback) is getattr(Client, event_name):
+            return None
+
+        if not iscoroutinefunction(callback):
+            raise FunctionIsNotCoroutine(callback)
+
+        return callback
+
+    def configure_dispatch(self, event_name: Optional[str] = None, concurrency: Optional[int] = None,
+                           backlog: Optional[int] = 1000,
+                           overflow: DispatchOverflow = DispatchOverflow.DROP_OLDEST) -> None:
+        """
+        The configure_dispatch function limits the number of event callbacks running at the same time.
+        Callbacks over the limit wait in the backlog; when the backlog is full, the **overflow** policy decides
+        whether the oldest waiting callback or the new one is dropped.
+
+        :param event_name: Name of the event, for example **on_message_create**.
+            If not specified, the limits are used for all events without their own limits
+        :param concurrency: Maximum number of callbacks running at the same time. ``None`` disables the limit
+        :param backlog: Maximum number of callbacks waiting for a free slot. ``None`` disables the limit
+        :param overflow: What to do with a new callback when the backlog is full
+        """
+
+        if event_name is not None and event_name not in self.supportted_events:
+            raise InvalidEventName(event_name)
+
+        self.dispatcher.configure(event_name, concurrency, backlog, overflow)
+
+    def configure_decoding(self, threshold: Optional[int] = 1024 * 1024, time_slice: float = 0.005,
+                           executor: Optional[Executor] = None) -> None:
+        """
+        The configure_decoding function sets how the frames larger than the **threshold** are decoded,
+        so they don't block the loop (and the heartbeats of all connections) for the whole decoding.
+        See :class:`asynccore.gateway.decoder.FrameDecoder`.
+
+        :param threshold: Minimal size of the frame in bytes. ``None`` decodes all frames at once in the loop
+        :param time_slice: Maximum time in seconds the loop is blocked by a single step of the json decoding
+        :param executor: Executor used to decode the large frames, for example a process pool
+        """
+
+        self.decoder = FrameDecoder(threshold, time_slice, executor)
+
+    def enable_profiler(self, threshold: float = 0.1, capture_stack: bool = False) -> HandlerProfiler:
+        """
+        The enable_profiler function starts measuring the event handlers:
+        the wall time and the time they blocked the event loop, per event.
+        Handlers blocking the loop for longer than the **threshold** are logged.
+        The measurements are available with :meth:`HandlerProfiler.report`
+        and, if the client collects stats, with :meth:`asynccore.client.Client.stats`.
+
+        :param threshold: Time in seconds after which the handler is reported as slow
+        :param capture_stack: Enable or disable sampling the stack of the handlers blocking the loop
+        """
+
+        if self.profiler is not None:
+            self.profiler.stop()
+
+        self.profiler = HandlerProfiler(self.client.logger, self.stats, threshold, capture_stack)
+        self.build_dispatch_table()
+
+        return self.profiler
+
+    def disable_profiler(self) -> None:
+        """
+        The disable_profiler function stops measuring the event handlers.
+        """
+
+        if self.profiler is not None:
+            self.profiler.stop()
+
+        self.profiler = None
+        self.build_dispatch_table()
+
+    def enable_recording(self, path: str, redact: bool = True) -> None:
+        """
+        The enable_recording function records the frames received by the connections to gzip compressed
+        JSON Lines files, which can be replayed offline with :meth:`replay`.
+        See :class:`asynccore.gateway.recorder.GatewayRecorder`.
+        It has to be called before :meth:`run`, every connection has its own file.
+
+        :param path: Path of the recording. ``{user_id}`` is replaced with the id of the user, for example
+            ``"gateway-{user_id}.jsonl.gz"``. Required if the client has more than one user
+        :param redact: Enable or disable removing the token and the secrets of the account from the frames
+        """
+
+        if len(self.client.users) > 1 and "{user_id}" not in path:
+            raise ValueError("The recording path must contain {user_id} when the client has more than one user")
+
+        self.recording = (path, redact)
+
+    def disable_recording(self) -> None:
+        """
+        The disable_recording function stops recording the frames of the connections created after it's called.
+        """
+
+        self.recording = None
+
+    async def replay(self, path: str, user: Optional[UserClient] = None,
+                     speed: Optional[float] = 1.0) -> GatewayReplayer:
+        """
+        The replay function replays a recording of :meth:`enable_recording` through a new connection of the user,
+        without connecting to the gateway: the frames are handled by the cache and the event handlers
+        as if they were received from discord. Returns the :class:`asynccore.gateway.recorder.GatewayReplayer`
+        with the number of replayed frames and the frames the connection tried to send.
+
+        :param path: Path of the recording
+        :param user: User receiving the frames. If not specified, the first user of the client
+        :param speed: Speed of the replay, 1.0 keeps the original timing. ``None`` replays as fast as possible
+        """
+
+        replayer: GatewayReplayer = GatewayReplayer(path, speed)
+
+        self.encoding = replayer.header()["encoding"]
+        self.compress = False
+        self.codec = EtfCodec() if self.encoding == "etf" else self.client.codec
+        self.build_dispatch_table()
+
+        connection: GatewayConnection = GatewayConnection(client=self.client, user=user or self.client.users[0],
+                                                          gateway=self, activity=self.activity, reconnect=False)
+        connection.recorder = None
+
+        await replayer.replay(connection)
+        return replayer
+
+    def subscribe(self, *event_names: str) -> None:
+        """
+        The subscribe function limits the events processed by the gateway to the given discord events,
+        for example: ``gateway.subscribe("MESSAGE_CREATE", "CHANNEL_UPDATE")``.
+        Other events are dropped right after reading their type, before the data is decoded.
+
+        Events with a handler registered with :meth:`event` or overridden in the :class:`asynccore.client.Client`,
+        the events needed to keep the cache up to date and the events used internally are always processed.
+
+        :param event_names: Names of the discord events (**t** field of the gateway response)
+        """
+
+        if self.subscriptions is None:
+            self.subscriptions = set()
+
+        self.subscriptions.update(name.upper() for name in event_names)
+        self.__update_allowed_events()
+
+    def __update_allowed_events(self) -> None:
+        if self.subscriptions is None:
+            self.allowed_events = None
+            return
+
+        self.allowed_events = frozenset(
+            self.subscriptions | set(self.dispatch_table) | set(CacheEventHandler.events) | REQUIRED_EVENTS
+        )
+
+    def get_url(self, url: str) -> str:
+        """
+        The get_url function adds the query parameters required by the gateway to the url.
+
+        :param url: Gateway url, for example the url to resume the session
+        """
+
+        parts = urlsplit(url)
+        query: dict[str, str] = dict(parse_qsl(parts.query))
+
+        query.setdefault("v", str(self.client.api_version))
+        query["encoding"] = self.encoding
+
+        if self.compress:
+            query["compress"] = "zlib-stream"
+
+        return urlunsplit(parts._replace(path=parts.path or "/", query=urlencode(query)))
+
     def __start(self, reconnect: bool):
         """
         The __start function creates GatewayConnection objects for each user in the client's users list.
@@ -66,20 +331,66 @@ class Gateway:
         :param reconnect: Determine whether or not the connection is a reconnection
         """
 
+        loop: AbstractEventLoop = self.client.loop
         tasks: list[Task] = []
+        connections: list[GatewayConnection] = []
+
+        loop.run_until_complete(self.__load_snapshots())
 
         for user in self.client.users:
             connection = GatewayConnection(client=self.client, user=user,
                                            gateway=self, activity=self.activity,
                                            reconnect=reconnect)
 
-            task: Task = self.client.loop.create_task(connection.run(self.gateway_url))
+            task: Task = loop.create_task(connection.run(self.get_url(self.gateway_url)))
             tasks.append(task)
+            connections.append(connection)
+
+        if self.client.lag_monitor:
+            self.client.lag_monitor.start()
+
+        snapshot_tasks: list[Task] = [
+            loop.create_task(user.cache.run_snapshots(user.cache.settings.snapshot_interval))
+            for user in self.client.users if user.cache.snapshot and user.cache.settings.snapshot_interval
+        ]
+
+        running: Future = gather(*tasks)
+
+        # KeyboardInterrupt and loop.stop() leave run_until_complete without finishing the tasks,
+        # so the cleanup runs here, in the loop started again for it
+        try:
+            loop.run_until_complete(running)
+        finally:
+            self.__shutdown([running, *snapshot_tasks], connections)
+
+    def __shutdown(self, tasks: list[Future], connections: list[GatewayConnection]) -> None:
+        """
+        The __shutdown function cancels the tasks of the gateway, closes the recordings of the connections
+        and saves the snapshots of the cache. It's called when the gateway stops for any reason.
+
+        :param tasks: Tasks of the connections and the snapshots, they are cancelled if they are still running
+        :param connections: Connections of the users
+        """
+
+        loop: AbstractEventLoop = self.client.loop
+
+        for task in tasks:
+            task.cancel()
 
-        async def run():
-            await gather(*tasks)
+        try:
+            loop.run_until_complete(gather(*tasks, return_exceptions=True))
+        finally:
+            for connection in connections:
+                if connection.recorder is not None:
+                    connection.recorder.close()
+
+            loop.run_until_complete(self.__save_snapshots())
 
-        self.client.loop.run_until_complete(run())
+    async def __load_snapshots(self) -> None:
+        await gather(*(user.cache.load_snapshot() for user in self.client.users))
+
+    async def __save_snapshots(self) -> None:
+        await gather(*(user.cache.save_snapshot() for user in self.client.users))
 
     @parametrized
     def event(self, function: Callable, **kwargs):
@@ -98,6 +409,7 @@ class Gateway:
             if name in self.supportted_events:
                 if iscoroutinefunction(function):
                     self.events[name] = function
+                    self.build_dispatch_table()
 
                 else:
                     raise FunctionIsNotCoroutine(function)
@@ -125,12 +437,9 @@ class GatewayConnection:
         self.reconnect: bool = reconnect
 
         self._gateway: Gateway = gateway
-        self._loop: AbstractEventLoop = client.loop
-        self._pulse: int = 5
-        self._queue: Queue = Queue()
-        self._last_sequence: int = 0
-        self._resume_gateway: Optional[str] = None
-        self._session_id: Optional[str] = None
+        self._heartbeat: Heartbeat = Heartbeat()
+        self._requests: RequestQueue = RequestQueue()
+        self._session: Session = Session()
 
         self.user.gateway_connection = self
 
@@ -139,84 +448,237 @@ class GatewayConnection:
         self._func_limit: Optional[int] = None
 
         self.websocket: WebSocketClientProtocol = None
+        self._event_handler: EventHandler = EventHandler(
+            client=self.client,
+            user=self.user,
+            gateway=self._gateway,
+            connection=self
+        )
+
+        self._compression: Compression = Compression()
+
+        self.recorder: Optional[GatewayRecorder] = None
+
+        if gateway.recording:
+            path, redact = gateway.recording
+            self.recorder = GatewayRecorder(path.format(user_id=user.id), user.id, user.token, gateway.encoding, redact)
+
+        gateway.stats.add_gauge("gateway_compressed_bytes", lambda: self._compression.compressed_bytes,
+                                (("user", user.id),))
+        gateway.stats.add_gauge("gateway_decompressed_bytes", lambda: self._compression.decompressed_bytes,
+                                (("user", user.id),))
+        gateway.stats.add_gauge("gateway_send_queue", self._requests.qsize, (("user", user.id),))
+
+    @property
+    def state(self) -> ConnectionState:
+        """
+        State of the connection.
+        """
+
+        return self._session.state
+
+    @state.setter
+    def state(self, state: ConnectionState) -> None:
+        self._session.state = state
+
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        Round-trip time in seconds of the last acknowledged heartbeat, or None if no heartbeat was acknowledged yet.
+        """
+
+        return self._heartbeat.latency
+
+    @property
+    def heartbeat_interval(self) -> float:
+        """
+        Heartbeat interval in seconds received in the hello response.
+        """
+
+        return self._heartbeat.interval
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """
+        Ratio of the decompressed to the compressed size of the data received with zlib-stream compression.
+        Returns None if no compressed data has been received.
+        """
+
+        return self._compression.ratio
 
     async def run(self, gateway_url: str) -> None:
         """
-        The run function is the main function of the Gateway class.
-        It connects to a gateway, and then creates three tasks:
+        The run function is the main function of the GatewayConnection class.
+        It keeps the user connected to the gateway, every connection creates three tasks:
             1) Receiving responses from Discord (self._receive_response())
             2) Sending requests to Discord (self._send_request())
-            3) Pinging Discord every x seconds (self._ping_loop())
+            3) Sending heartbeats (self._ping_loop())
+
+        When the connection is lost, the session is resumed if possible, otherwise a new session is identified.
+        The reconnects are delayed with a capped exponential backoff with jitter.
+        The connection is not restored if **reconnect** is False, unless discord asked for it,
+        or if it was closed with a close code that doesn't allow reconnecting.
 
         :param gateway_url: url to connect
         """
 
-        try:
-            async with connect(gateway_url, extra_headers=self.get_headers) as websocket:
-                self.websocket: WebSocketClientProtocol = websocket
+        while True:
+            resuming: bool = self.can_resume
+            url: str = self._gateway.get_url(self._session.resume_gateway) if resuming else gateway_url  # pyright: ignore
+
+            self._session.state = ConnectionState.RESUMING if resuming else ConnectionState.CONNECTING
+            self._session.restart_requested = False
+
+            close_code: Optional[int] = None
 
+            try:
+                close_code = await self._connect(url)
+            # Before python 3.11, asyncio.TimeoutError of the opening handshake isn't the builtin TimeoutError
+            except (InvalidHandshake, OSError, TimeoutError, AsyncTimeoutError) as error:
                 if self.client.logger._status:
-                    self.client.logger.info(f"Successfully connected to {gateway_url}")
+                    self.client.logger.error("Connection: %s failed: %r", url, error)
 
-                tasks: list[Task] = [
-                    create_task(self._receive_response()),
-                    create_task(self._send_request()),
-                    create_task(self._ping_loop())]
+            if close_code in FATAL_CLOSE_CODES or (not self.reconnect and not self._session.restart_requested):
+                self._session.state = ConnectionState.CLOSED
 
-                for task in tasks:
-                    await task
+                if self.client.logger._status:
+                    self.client.logger.error("Connection: %s Closed with code: %s.", url, close_code)
+
+                return
+
+            if close_code in SESSION_CLOSE_CODES:
+                self.invalidate_session()
+
+            delay: float = self.backoff_delay(self._session.disconnected())
 
-        except ConnectionClosed:
             if self.client.logger._status:
-                self.client.logger.error(f"Connection: {self._gateway.gateway_url} Closed. Trying to resume.")
+                self.client.logger.error("Connection: %s Closed with code: %s. Trying to %s in %.2f seconds.",
+                                         url, close_code, "resume" if self.can_resume else "reconnect", delay)
 
-            if not self._resume_gateway or not self._session_id or not self.reconnect:
-                return
+            await sleep(delay)
 
-            await self.resume()
+    async def _connect(self, url: str) -> Optional[int]:
+        """
+        The _connect function opens a single websocket connection and runs its tasks until one of them ends.
+        The other tasks are cancelled, so nothing is left running after the connection is closed.
+        Returns the close code of the connection.
 
-    async def resume(self):
+        :param url: url to connect
         """
-        The resume function is used to resume a connection that has been closed.
-        It will attempt to reconnect every second until the websocket is open again.
+
+        # READY and GUILD_CREATE of large accounts don't fit in the default 1 MiB limit of the frame size
+        async with connect(url, max_size=None, **{_HEADERS_ARGUMENT: self.get_headers}) as websocket:
+            self.websocket: WebSocketClientProtocol = websocket
+            self._compression.reset(self._gateway.compress)
+            self._heartbeat.hello.clear()
+            self._session.ready.clear()
+
+            if self.client.logger._status:
+                self.client.logger.info("Successfully connected to %s", url)
+
+            tasks: list[Task] = [
+                create_task(self._receive_response()),
+                create_task(self._send_request()),
+                create_task(self._ping_loop())]
+
+            try:
+                done, _ = await wait(tasks, return_when=FIRST_COMPLETED)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            for task in done:
+                exception: Optional[BaseException] = None if task.cancelled() else task.exception()
+
+                if exception is not None and not isinstance(exception, ConnectionClosed):
+                    raise exception
+
+        return websocket.close_code
+
+    @property
+    def can_resume(self) -> bool:
+        """
+        Whether the session of the connection can be resumed.
         """
 
-        while not self.websocket.open:
-            await sleep(1)
-            await self.resume_connection()
+        return self._session.can_resume
 
-    async def resume_connection(self):
+    @staticmethod
+    def backoff_delay(attempt: int) -> float:
         """
-        The resume_connection function is used to resume a connection with the Discord Gateway.
-        It does this by sending a RESUME payload to the gateway.
+        The backoff_delay function returns the delay before the reconnect:
+        a random time between 0 and **RECONNECT_BACKOFF_BASE** * 2 ** attempt,
+        capped at **RECONNECT_BACKOFF_CAP** seconds.
+
+        :param attempt: Number of the failed reconnects in a row
         """
 
-        try:
-            async with connect(self._resume_gateway, extra_headers=self.get_headers) as websocket:
-                self.websocket: WebSocketClientProtocol = websocket
+        return random() * min(RECONNECT_BACKOFF_CAP, RECONNECT_BACKOFF_BASE * 2 ** min(attempt, 32))
 
-                if self.client.logger._status:
-                    self.client.logger.info(f"Successfully connected to: {self._resume_gateway}")
+    def invalidate_session(self) -> None:
+        """
+        The invalidate_session function forgets the session, so the next connection identifies a new one.
+        The cache of the user is cleared, because the events missed between the sessions will never be received.
+        """
 
-                tasks: list[Task] = [
-                    create_task(self._send_resume()),
-                    create_task(self._receive_response()),
-                    create_task(self._send_request()),
-                    create_task(self._ping_loop())]
+        self._session.invalidate()
+        self.user.cache.clear()
 
-                for task in tasks:
-                    await task
-        except socket.gaierror:
-            pass
+    async def restart(self, resume: bool = True) -> None:
+        """
+        The restart function closes the websocket, so the connection is restored by :meth:`run`.
+        It's used when discord sends the reconnect (op 7) or invalid session (op 9) response,
+        or when a heartbeat was not acknowledged.
 
-        except ConnectionClosed:
-            if not self._resume_gateway or not self._session_id:
-                return
+        :param resume: Resume the session after reconnecting. If False, a new session is identified
+        """
 
-            if self.client.logger._status:
-                self.client.logger.error(f"Connection: {self._gateway.gateway_url} Closed. Trying to resume.")
+        self._session.restart_requested = True
+
+        if not resume:
+            self.invalidate_session()
+
+        # Close code 1000 would invalidate the session, so any other code is used to keep it resumable
+        await self.websocket.close(code=4000, reason="Reconnecting")
+
+    async def invalid_session(self, resumable: bool) -> None:
+        """
+        The invalid_session function handles the invalid session response (op 9).
+        A resumable session is resumed on a new connection, otherwise a new session is identified
+        after a random delay between 1 and 5 seconds, as discord requires.
+
+        :param resumable: Whether the session can be resumed
+        """
+
+        if self.client.logger._status:
+            self.client.logger.warning("Invalid session of %s (resumable: %s).", self.user, resumable)
+
+        if resumable and self.can_resume:
+            await self.restart(resume=True)
+            return
+
+        self.invalidate_session()
+        await sleep(1 + random() * 4)
+
+        self._session.state = ConnectionState.IDENTIFYING
+        self._session.ready.clear()
+        await self.login()
+        await self.begin_presence()
+
+    def session_started(self, resumed: bool) -> None:
+        """
+        The session_started function marks the connection as connected after the READY or RESUMED event
+        and records the time it took to restore the connection.
+
+        :param resumed: Whether the session was resumed
+        """
+
+        downtime: Optional[float] = self._session.started()
 
-            await self.resume()
+        if downtime is not None and self._gateway.stats.enabled:
+            labels: tuple[tuple[str, Any], ...] = (("user", self.user.id), ("resumed", resumed))
+            self._gateway.stats.observe("gateway_reconnect_seconds", downtime, labels)
+            self._gateway.stats.increment("gateway_reconnects_total", labels)
 
     @property
     def get_headers(self) -> dict:
@@ -289,7 +751,54 @@ class GatewayConnection:
             },
             "intents": 98047
         }
-        await self.send(request)
+        await self.websocket.send(self._gateway.codec.dumps(request))
+
+    def _read_frame(self, message: Union[str, bytes]) -> Optional[Union[str, bytes]]:
+        """
+        The _read_frame function decompresses the message received from the websocket and records it.
+        Returns None if the message is only a part of the compressed frame.
+
+        :param message: Message received from the websocket
+        """
+
+        if self._compression.enabled:
+            message = self._compression.decompress(message)  # pyright: ignore
+
+            if message is None:
+                return None
+
+        if not self._gateway.codec.binary and isinstance(message, bytes):
+            message = message.decode()
+
+        if self.recorder is not None:
+            self.recorder.record(message)
+
+        return message
+
+    def _track_session(self, response: GatewayResponse) -> bool:
+        """
+        The _track_session function marks the session as started after the READY or RESUMED event
+        and keeps the ids of the session received in READY, so it can be resumed.
+        Returns False if the event shouldn't be handled any further.
+
+        :param response: Dispatch received from the gateway
+        """
+
+        if response.event_name not in ("READY", "RESUMED"):
+            return True
+
+        self.session_started(resumed=response.event_name == "RESUMED")
+
+        if response.event_name == "RESUMED":
+            return True
+
+        if self.func:
+            return False
+
+        self._session.session_id = response.data.get("session_id")
+        self._session.resume_gateway = response.data.get("resume_gateway_url")
+
+        return True
 
     async def _receive_response(self):
         """
@@ -298,74 +807,133 @@ class GatewayConnection:
         the heartbeat interval, which is used to keep the connection alive.
         """
 
-        async for response in self.websocket:
-            gateway_response: GatewayResponse = GatewayResponse(response, self.user)
+        stats: Stats = self._gateway.stats
+
+        async for message in self.websocket:
+            response: Optional[Union[str, bytes]] = self._read_frame(message)
 
-            if isinstance(gateway_response.data, dict):
-                if gateway_response.data.get("session_id"):
-                    self._session_id = gateway_response.data.get("session_id")
+            if response is None:
+                continue
+
+            large: bool = self._gateway.decoder.is_large(response)
+
+            if large and not isinstance(response, str):
+                response = await self._gateway.decoder.decode_frame(self.client.loop, response, self._gateway.codec,
+                                                                    stats)
+
+            gateway_response: GatewayResponse = GatewayResponse(response, self.user, self._gateway.codec, stats)
+
+            if stats.enabled:
+                stats.increment("gateway_frames_total", (("op", gateway_response.op),
+                                                         ("event", gateway_response.event_name)))
 
             if gateway_response.sequence:
-                self._last_sequence = gateway_response.sequence
+                self._session.last_sequence = gateway_response.sequence
 
             if gateway_response.event:
-                if gateway_response.event_name == "READY":
-                    if self.func:
-                        continue
-
-                    self._resume_gateway = gateway_response.data.get("resume_gateway_url")
-
-            handler = EventHandler(
-                response=gateway_response,
-                client=self.client,
-                user=self.user,
-                gateway=self._gateway,
-                connection=self
-            )
-
-            def check_event_type():
-                return gateway_response.event_name in ("GUILD_APPLICATION_COMMANDS_UPDATE",
-                                                       "GUILD_MEMBER_LIST_UPDATE") or gateway_response.op == 10
-
-            if check_event_type():
-                await handler.handle_abstract_events()
+                allowed_events: Optional[frozenset[str]] = self._gateway.allowed_events
+
+                if allowed_events is not None and gateway_response.event_name not in allowed_events:
+                    continue
+
+                if large:
+                    await self._gateway.decoder.decode(self.client.loop, gateway_response)
+
+                if not self._track_session(gateway_response):
+                    continue
+
+            if gateway_response.op in ABSTRACT_OPS or gateway_response.event_name in ABSTRACT_EVENTS:
+                await self._event_handler.handle_abstract_events(gateway_response)
             else:
-                await handler.handle_event()
+                await self._event_handler.handle_event(gateway_response)
 
     async def _send_request(self):
         """
         The _send_request function is a coroutine that sends requests to the server.
         It does this by waiting for a request to be added to the queue, then sending it
-        to the websocket. It waits 0.1 seconds before sending another request.
+        to the websocket, once the session is ready. It waits 0.1 seconds before sending another request.
+        A request is forgotten only after it was sent: if the connection is closed while the request
+        waits for the session or is being sent, it's sent again by the next connection.
         """
 
         while True:
-            request: Optional[dict] = await self._queue.get()
-            _request: str = dumps(request)
-            await self.websocket.send(_request)
+            queued_at, request = await self._requests.next()
+            await self._session.ready.wait()
+
+            try:
+                await self.websocket.send(self._gateway.codec.dumps(request))
+            except ConnectionClosed:
+                # The connection is restored by run, the request stays pending
+                return
+
+            self._requests.done()
+
+            if self._gateway.stats.enabled:
+                self._gateway.stats.observe("gateway_queue_wait_seconds", perf_counter() - queued_at)
+
             await sleep(0.1)
 
     async def _ping_loop(self):
         """
         The _ping_loop function is a coroutine that runs in the background of the client.
-        It sends a ping request to Discord every self._pulse seconds, which is set to 5 by default.
-        The purpose of this function is to keep the connection alive and prevent it from timing out.
+        It waits for the hello response, then sends the heartbeats every heartbeat interval received in it.
+        The first heartbeat is sent after a random part of the interval, as discord requires.
+        If the previous heartbeat was not acknowledged, the connection is a zombie:
+        it's restarted with :meth:`restart`, so the session is resumed at once instead of waiting for a timeout.
         """
 
+        await self._heartbeat.hello.wait()
+        await sleep(self._heartbeat.interval * random())
+
         while True:
-            await sleep(self._pulse)
+            if not self._heartbeat.acked:
+                if self.client.logger._status:
+                    self.client.logger.warning("Heartbeat of %s was not acknowledged. Reconnecting.", self.user)
 
-            ping_request: dict = {
-                "op": 1,
-                "d": time()
-            }
+                await self.restart(resume=True)
+                return
+
+            await self.send_heartbeat()
+            await sleep(self._heartbeat.interval)
+
+    def hello(self, heartbeat_interval: float) -> None:
+        """
+        The hello function sets the heartbeat interval received in the hello response and starts the heartbeats.
+
+        :param heartbeat_interval: Heartbeat interval in seconds
+        """
+
+        self._heartbeat.start(heartbeat_interval)
+
+    async def send_heartbeat(self) -> None:
+        """
+        The send_heartbeat function sends the heartbeat with the last sequence received from the gateway.
+        The heartbeat is sent directly to the websocket, so it doesn't wait in the queue behind other requests.
+        """
+
+        self._heartbeat.sent()
+
+        heartbeat: dict = {
+            "op": 1,
+            "d": self._session.last_sequence or None
+        }
+
+        await self.websocket.send(self._gateway.codec.dumps(heartbeat))
 
-            await self.send(ping_request)
+    def heartbeat_ack(self) -> None:
+        """
+        The heartbeat_ack function marks the last heartbeat as acknowledged and measures the round-trip latency.
+        """
+
+        latency: Optional[float] = self._heartbeat.ack()
+
+        if latency is not None and self._gateway.stats.enabled:
+            self._gateway.stats.observe("heartbeat_latency_seconds", latency, (("user", self.user.id),))
 
     async def _send_resume(self):
         """
         The _send_resume function is used to send a resume payload to the Discord gateway.
-        This function is called when the websocket connection has been lost and needs to be re-established.
+        This function is called after the hello response, when the websocket connection has been re-established.
         The payload contains information about the user's session, including their token, session ID, and last sequence.
         """
 
@@ -373,17 +941,17 @@ class GatewayConnection:
             "op": 6,
             "d": {
                 "token": self.user.token,
-                "session_id": self._session_id,
-                "seq": self._last_sequence
+                "session_id": self._session.session_id,
+                "seq": self._session.last_sequence
             }
         }
-        await self.send(payload)
+        await self.websocket.send(self._gateway.codec.dumps(payload))
 
     async def send(self, request):
         """
         The send function is a coroutine that takes in a request and puts it into the queue.
         """
-        await self._queue.put(request)
+        await self._requests.put(request)
 
     async def application_update_request(self, request: dict, func: Callable, limit: Optional[int] = None):
         """
@@ -400,4 +968,4 @@ class GatewayConnection:
 
         self.func: Optional[Callable] = func
         self._func_limit: Optional[int] = limit
-        await self._queue.put(request)
+        await self.send(request)
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Generator, Optional, TYPE_CHECKING
+from time import perf_counter
+from functools import wraps
+from threading import Thread, Event, get_ident
+from types import coroutine
+import traceback
+import sys
+
+from ..stats import Histogram
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from ..stats import Stats
+
+
+class _Step:
+    """
+    The step of a handler that is currently running on the event loop.
+    """
+
+    __slots__ = ("event_name", "started", "stack")
+
+    def __init__(self, event_name: str) -> None:
+        self.event_name: str = event_name
+        self.started: float = perf_counter()
+        self.stack: Optional[list[str]] = None
+
+
+class HandlerProfiler:
+    """
+    HandlerProfiler measures the event handlers run by the gateway.
+    For every event it records the wall time of the handler and the time it blocked the event loop,
+    that is the time spent in the handler's code between its awaits.
+    Handlers blocking the loop for longer than the **threshold** are logged.
+
+    With **capture_stack** enabled, a background thread samples the stack of the handler
+    that blocks the loop for longer than the threshold, so the log shows the code that stalled the dispatch.
+
+    :param logger: Logger used to report the slow handlers
+    :param stats: Stats the measurements are also added to, if they are enabled
+    :param threshold: Time in seconds after which the handler is reported as slow
+    :param capture_stack: Enable or disable sampling the stack of the slow handlers
+    :param sample_size: Number of recent samples used to calculate the percentiles
+    """
+
+    def __init__(self, logger: Logger, stats: Optional[Stats] = None, threshold: float = 0.1,
+                 capture_stack: bool = False, sample_size: int = 1024) -> None:
+        self.logger: Logger = logger
+        self.stats: Optional[Stats] = stats
+        self.threshold: float = threshold
+        self.capture_stack: bool = capture_stack
+        self.sample_size: int = sample_size
+
+        self.wall_time: dict[str, Histogram] = {}
+        self.blocking_time: dict[str, Histogram] = {}
+        self.slow_calls: dict[str, int] = {}
+
+        self._step: Optional[_Step] = None
+        self._thread_id: Optional[int] = None
+        self._sampler: Optional[Thread] = None
+        self._stopped: Event = Event()
+
+    def wrap(self, event_name: str, callback: Callable) -> Callable:
+        """
+        The wrap function returns the coroutine function that runs the callback and measures it.
+
+        :param event_name: Name of the event, for example **on_message_create**
+        :param callback: Coroutine function of the handler
+        """
+
+        @wraps(callback)
+        async def profiled_callback(*args, **kwargs):
+            return await self.__run(event_name, callback(*args, **kwargs))
+
+        return profiled_callback
+
+    def start(self) -> None:
+        """
+        The start function starts the thread sampling the stacks of the slow handlers.
+        It is called automatically by the first profiled handler if **capture_stack** is enabled.
+        """
+
+        if self._sampler is not None and self._sampler.is_alive():
+            return
+
+        self._thread_id = get_ident()
+        self._stopped.clear()
+        self._sampler = Thread(target=self.__sample, name="asynccore-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """
+        The stop function stops the thread sampling the stacks.
+        """
+
+        self._stopped.set()
+        self._sampler = None
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        """
+        The report function returns the measurements of every event, in the format:
+        ``{"Event name": {"wall": {...}, "blocking": {...}, "slow_calls": int}}``.
+        See :meth:`asynccore.stats.Histogram.snapshot` for the format of the histograms.
+        """
+
+        return {
+            event_name: {
+                "wall": wall_time.snapshot(),
+                "blocking": self.blocking_time[event_name].snapshot(),
+                "slow_calls": self.slow_calls.get(event_name, 0)
+            }
+            for event_name, wall_time in self.wall_time.items()
+        }
+
+    @coroutine
+    def __run(self, event_name: str, handler: Any) -> Generator[Any, Any, Any]:
+        """
+        The __run function drives the coroutine of the handler step by step,
+        the time of every step is the time the handler blocked the event loop.
+        """
+
+        if self.capture_stack:
+            self.start()
+
+        started: float = perf_counter()
+        blocking: float = 0.0
+        stack: Optional[list[str]] = None
+
+        value: Any = None
+        error: Optional[BaseException] = None
+
+        try:
+            while True:
+                step: _Step = _Step(event_name)
+                self._step = step
+
+                try:
+                    if error is None:
+                        future: Any = handler.send(value)
+                    else:
+                        future = handler.throw(error)
+
+                except StopIteration as result:
+                    return result.value
+
+                finally:
+                    self._step = None
+                    blocking += perf_counter() - step.started
+
+                    if stack is None:
+                        stack = step.stack
+
+                try:
+                    value, error = (yield future), None
+                except BaseException as exception:  # pylint: disable=broad-except
+                    value, error = None, exception
+        finally:
+            handler.close()
+            self.__record(event_name, perf_counter() - started, blocking, stack)
+
+    def __record(self, event_name: str, wall: float, blocking: float, stack: Optional[list[str]]) -> None:
+        wall_time: Optional[Histogram] = self.wall_time.get(event_name)
+
+        if wall_time is None:
+            wall_time = self.wall_time[event_name] = Histogram(self.sample_size)
+            self.blocking_time[event_name] = Histogram(self.sample_size)
+
+        wall_time.observe(wall)
+        self.blocking_time[event_name].observe(blocking)
+
+        if self.stats is not None and self.stats.enabled:
+            labels: tuple[tuple[str, str], ...] = (("event", event_name),)
+            self.stats.observe("handler_wall_seconds", wall, labels)
+            self.stats.observe("handler_blocking_seconds", blocking, labels)
+
+        if blocking < self.threshold:
+            return
+
+        self.slow_calls[event_name] = self.slow_calls.get(event_name, 0) + 1
+        self.logger.warning("Slow handler: %s blocked the event loop for %.3f seconds (wall time: %.3f seconds)%s",
+                            event_name, blocking, wall, "\nSampled stack:\n" + "".join(stack) if stack else "")
+
+    def __sample(self) -> None:
+        interval: float = max(self.threshold / 2, 0.001)
+
+        while not self._stopped.wait(interval):
+            step: Optional[_Step] = self._step
+
+            if step is None or step.stack is not None or perf_counter() - step.started < self.threshold:
+                continue
+
+            frame: Any = sys._current_frames().get(self._thread_id)  # pylint: disable=protected-access
+
+            if frame is not None and self._step is step:
+                step.stack = traceback.format_stack(frame)
+
+    def __repr__(self):
+        return f"<HandlerProfiler(threshold={self.threshold}, capture_stack={self.capture_stack})>"
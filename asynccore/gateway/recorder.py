@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Iterator, Optional, Union, IO, TYPE_CHECKING
+from asyncio import sleep
+from base64 import b64encode, b64decode
+from time import time, perf_counter
+import gzip
+import json
+import re
+
+from ..etf import pack, unpack, EtfDecodeError
+
+if TYPE_CHECKING:
+    from .gateway import GatewayConnection
+
+RECORDING_VERSION: int = 1
+REDACTED: str = "[REDACTED]"
+
+# Values of the keys containing "token" (for example analytics_token in READY or access_token of the connected
+# accounts) and of these keys are secrets of the account
+REDACTED_KEYS: tuple[str, ...] = ("auth_session_id_hash",)
+
+_SECRET_KEY: str = "(?:" + "|".join(map(re.escape, REDACTED_KEYS)) + r'|[^"\\]*token[^"\\]*)'
+_SECRET_KEY_PATTERN: re.Pattern = re.compile("^" + _SECRET_KEY + "$", re.IGNORECASE)
+
+# Only keys are matched: strings preceded by { or , and followed by a colon
+_REDACTED_KEYS_PATTERN: re.Pattern = re.compile(
+    r'([{,]\s*)"(' + _SECRET_KEY + r')"(\s*:\s*)"(?:[^"\\]|\\.)*"', re.IGNORECASE
+)
+
+
+def _redact_term(term: Any, token: str) -> Any:
+    if isinstance(term, dict):
+        return {key: REDACTED if isinstance(value, str) and isinstance(key, str) and _SECRET_KEY_PATTERN.match(key)
+                else _redact_term(value, token) for key, value in term.items()}
+
+    if isinstance(term, (list, tuple)):
+        return [_redact_term(value, token) for value in term]
+
+    if isinstance(term, str) and token and token in term:
+        return term.replace(token, REDACTED)
+
+    return term
+
+
+class GatewayRecorder:
+    """
+    GatewayRecorder writes the frames received by a :class:`asynccore.gateway.gateway.GatewayConnection`
+    to a gzip compressed JSON Lines file, so they can be replayed offline by :class:`GatewayReplayer`.
+
+    The first line is the header: ``{"version": 1, "encoding": "json", "user_id": ..., "started_at": unix time}``,
+    every next line is one frame: ``{"time": seconds since the first frame, "frame": text}``.
+    Binary frames (**etf** encoding) are stored in the **binary** field, encoded with base64.
+    The frames are written after the zlib-stream decompression, so the recording doesn't depend on it.
+
+    With **redact**, the token of the account and the values of the keys containing ``token``
+    or listed in :data:`REDACTED_KEYS` are replaced with ``[REDACTED]``.
+    Binary frames are decoded, redacted the same way and encoded again.
+    The file is opened with the first frame. A recording that was not closed (for example the process was killed)
+    can still be replayed, up to the last complete frame.
+
+    :param path: Path of the recording
+    :param user_id: Id of the recorded account
+    :param token: Token of the recorded account
+    :param encoding: Encoding of the gateway: **json** or **etf**
+    :param redact: Enable or disable removing the secrets from the frames
+    """
+
+    def __init__(self, path: str, user_id: Any, token: str, encoding: str = "json", redact: bool = True) -> None:
+        self.path: str = path
+        self.user_id: Any = user_id
+        self.encoding: str = encoding
+        self.redact: bool = redact
+        self.frames: int = 0
+
+        self._token: str = token
+        self._file: Optional[IO[str]] = None
+        self._started: float = 0.0
+
+    def redact_frame(self, frame: Union[str, bytes]) -> Union[str, bytes]:
+        """
+        The redact_frame function removes the token and the secrets of the account from the frame.
+
+        :param frame: Raw frame
+        """
+
+        if isinstance(frame, bytes):
+            try:
+                return pack(_redact_term(unpack(frame), self._token))
+            except EtfDecodeError:
+                # Not a valid term, at least the token is masked
+                return frame.replace(self._token.encode(), b"*" * len(self._token)) if self._token else frame
+
+        if self._token:
+            frame = frame.replace(self._token, REDACTED)
+
+        return _REDACTED_KEYS_PATTERN.sub(rf'\1"\2"\3"{REDACTED}"', frame)
+
+    def record(self, frame: Union[str, bytes]) -> None:
+        """
+        The record function writes the frame to the recording.
+
+        :param frame: Raw frame, as received from the gateway
+        """
+
+        if self._file is None:
+            self._file = gzip.open(self.path, "wt", encoding="utf-8")
+            self._started = perf_counter()
+            self.__write({"version": RECORDING_VERSION, "encoding": self.encoding,
+                          "user_id": self.user_id, "started_at": time()})
+
+        if self.redact:
+            frame = self.redact_frame(frame)
+
+        record: dict[str, Any] = {"time": round(perf_counter() - self._started, 6)}
+
+        if isinstance(frame, bytes):
+            record["binary"] = b64encode(frame).decode()
+        else:
+            record["frame"] = frame
+
+        self.__write(record)
+        self.frames += 1
+
+    def __write(self, record: dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")))  # pyright: ignore
+        self._file.write("\n")  # pyright: ignore
+
+    def close(self) -> None:
+        """
+        The close function flushes and closes the recording.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __repr__(self):
+        return f"<GatewayRecorder(path={self.path}, user_id={self.user_id}, frames={self.frames})>"
+
+
+class _ReplayWebSocket:
+    """
+    Stands in for the websocket of the connection: yields the recorded frames and collects the sent ones.
+    """
+
+    def __init__(self, frames: AsyncIterator[Union[str, bytes]], sent: list[Union[str, bytes]]) -> None:
+        self.frames: AsyncIterator[Union[str, bytes]] = frames
+        self.sent: list[Union[str, bytes]] = sent
+        self.close_code: Optional[int] = None
+
+    def __aiter__(self) -> AsyncIterator[Union[str, bytes]]:
+        return self.frames
+
+    async def send(self, message: Union[str, bytes]) -> None:
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:  # pylint: disable=unused-argument
+        self.close_code = code
+
+
+class GatewayReplayer:
+    """
+    GatewayReplayer feeds a recording of :class:`GatewayRecorder` into a
+    :class:`asynccore.gateway.gateway.GatewayConnection`: the frames go through its receive loop,
+    the :class:`asynccore.gateway.event.EventHandler`, the cache and the event handlers of the client,
+    like the frames received from the gateway.
+    The frames sent by the connection during the replay (for example the identify request after HELLO)
+    are not sent anywhere, they are collected in **sent**.
+
+    :param path: Path of the recording
+    :param speed: Speed of the replay, 1.0 keeps the original timing of the frames.
+        ``None`` replays the frames as fast as possible
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Replay speed must be positive, got: {speed}")
+
+        self.path: str = path
+        self.speed: Optional[float] = speed
+        self.sent: list[Union[str, bytes]] = []
+        self.frames: int = 0
+
+    def header(self) -> dict[str, Any]:
+        """
+        The header function returns the header of the recording: version, encoding, user_id and started_at.
+        """
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            header: dict[str, Any] = json.loads(file.readline() or "{}")
+
+        if header.get("version") != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version: {header.get('version')} ({self.path})")
+
+        return header
+
+    async def __frames(self) -> AsyncIterator[Union[str, bytes]]:
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            file.readline()
+            started: float = perf_counter()
+
+            for line in self.__lines(file):
+                record: dict[str, Any] = json.loads(line)
+
+                if self.speed is not None:
+                    delay: float = started + record["time"] / self.speed - perf_counter()
+
+                    if delay > 0:
+                        await sleep(delay)
+
+                self.frames += 1
+                yield b64decode(record["binary"]) if "binary" in record else record["frame"]
+
+    @staticmethod
+    def __lines(file: IO[str]) -> Iterator[str]:
+        # The file of a recorder that was not closed ends without the gzip trailer, the incomplete tail is skipped
+        try:
+            for line in file:
+                if not line.endswith("\n"):
+                    return
+
+                yield line
+        except EOFError:
+            return
+
+    async def replay(self, connection: GatewayConnection) -> int:
+        """
+        The replay function feeds the recording into the receive loop of the connection.
+        Returns the number of replayed frames.
+
+        :param connection: Connection receiving the frames
+        """
+
+        self.header()
+        self.frames = 0
+        self.sent = []
+
+        connection.websocket = _ReplayWebSocket(self.__frames(), self.sent)  # pyright: ignore
+        await connection._receive_response()  # pylint: disable=protected-access
+
+        return self.frames
+
+    def __repr__(self):
+        return f"<GatewayReplayer(path={self.path}, speed={self.speed})>"
@@ -1,63 +1,133 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING
-from json import loads
+from typing import Optional, Any, Union, TYPE_CHECKING
+from time import perf_counter
+import re
+
+from ..codec import JSONCodec
 
 if TYPE_CHECKING:
     from ..user import UserClient
+    from ..stats import Stats
+
+# Discord sends the dispatch fields before the payload: {"t":...,"s":...,"op":...,"d":...}.
+# The payload is expected to be the last key, frames with keys after it are decoded whole when the data is read.
+_HEADER_PATTERN: re.Pattern = re.compile(r'\{"t":(?:null|"([A-Z0-9_]+)"),"s":(null|\d+),"op":(\d+),"d":')
+_NOT_DECODED: Any = object()
+_DEFAULT_CODEC: JSONCodec = JSONCodec()
 
 
 class GatewayResponse:
     """
     The class that formats the raw discord response.
+    Only the **op**, **event_name** and **sequence** are read when the response is created.
+    The **data** is decoded the first time it is accessed, so responses that nobody reads are never fully decoded.
+    If the **d** key is not the last key of the frame, the whole frame is decoded instead.
 
-    :param data: Store the raw data from discord
+    :param data: Store the raw data from discord, or the already decoded frame
     :param user: Pass the user object to the response
+    :param codec: Codec used to decode the data. If not specified, the :mod:`json` module is used
+    :param stats: Stats used to measure the decoding time
 
     :ivar user: The object of the user who received the response.
     :vartype user: :class:`asynccore.user.UserClient`
-    
+
     :ivar event: Is the response an event
     :vartype event: :class:`bool`
 
     :ivar op: Op of discord response
     :vartype op: :class:`int`
 
-    :ivar data: Response data
-    :vartype data: :class:`dict`
-
     :ivar sequence: Discord sequence
     :vartype sequence: :class:`int`
     """
 
-    def __init__(self, data: str, user: UserClient):
+    def __init__(self, data: Union[str, bytes, dict], user: UserClient, codec: Optional[JSONCodec] = None,
+                 stats: Optional[Stats] = None):
 
         self.user: UserClient = user
-        self.data: dict = self.format_data(data)
-        self.event: bool = False
+        self.codec: JSONCodec = codec if codec else _DEFAULT_CODEC
+        self.stats: Optional[Stats] = stats
+        self._raw: Optional[Union[str, bytes]] = data  # pyright: ignore
+        self._data: Any = _NOT_DECODED
+        self.event_name: str = ""
+
+        # Binary frames (etf encoding) have no text header, so they are decoded at once.
+        header: Optional[re.Match] = _HEADER_PATTERN.match(data) if data.__class__ is str else None
+
+        if header and data.endswith("}"):  # pyright: ignore
+            event_name, sequence, op = header.groups()
+
+            self.op: int = int(op)  # pylint: disable=invalid-name
+            self.sequence: Optional[int] = None if sequence == "null" else int(sequence)
+            self.event_name = event_name or ""
+            self._payload_start: int = header.end()
+        else:
+            frame: dict = data if isinstance(data, dict) else self.format_data(data)
 
-        self.op: int = self.data["op"]  # pylint: disable=invalid-name
+            self.op: int = frame["op"]  # pylint: disable=invalid-name
+            self.sequence: Optional[int] = frame.get("s")
+            self.event_name = frame.get("t") or ""
+            self._data = frame.get("d")
+            self._raw = None
 
-        if self.op == 0:
-            self.event: bool = True
+        self.event: bool = self.op == 0
 
-        self.sequence: Optional[int] = self.data.get("s")
+    @property
+    def data(self) -> Any:
+        """
+        Response data. Decoded on the first access.
+        """
 
-        if self.data.get("t"):
-            self.event_name: str = self.data["t"]
-        else:
-            self.event_name: str = ""
+        if self._data is _NOT_DECODED:
+            try:
+                self._data = self.format_data(self._raw[self._payload_start:-1])  # pyright: ignore
+            except ValueError:
+                # Other keys follow the payload, so the slice doesn't end where the payload does
+                self._data = self.format_data(self._raw)["d"]  # pyright: ignore
+
+            self._raw = None
 
-        self.data: dict = self.data["d"]
+        return self._data
 
-    @staticmethod
-    def format_data(data: str) -> dict:
+    @data.setter
+    def data(self, value: Any) -> None:
+        self._data = value
+        self._raw = None
+
+    @property
+    def payload(self) -> Optional[Union[str, bytes]]:
+        """
+        Raw data of the response, or None if it has already been decoded.
+        """
+
+        if self._data is not _NOT_DECODED:
+            return None
+
+        return self._raw[self._payload_start:-1]  # pyright: ignore
+
+    @property
+    def decoded(self) -> bool:
+        """
+        Whether the **data** has already been decoded.
+        """
+
+        return self._data is not _NOT_DECODED
+
+    def format_data(self, data: Union[str, bytes]) -> Any:
         """
         The format_data function takes a string of data and returns a dictionary.
 
         :param data: Pass in the data that is being formatted
         """
-        return loads(data)
+        if self.stats is None or not self.stats.enabled:
+            return self.codec.loads(data)
+
+        start: float = perf_counter()
+        decoded: Any = self.codec.loads(data)
+        self.stats.observe("gateway_decode_seconds", perf_counter() - start, (("event", self.event_name),))
+
+        return decoded
 
     def __repr__(self):
         if self.event:
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+from asyncio import Event, Queue
+from time import perf_counter
+import zlib
+
+from .enums import ConnectionState
+
+ZLIB_SUFFIX: bytes = b"\x00\x00\xff\xff"
+
+
+class Session:
+    """
+    State of the session of a connection, kept across the websocket connections:
+    the ids needed to resume it, the state of the connection and the progress of the reconnects.
+    """
+
+    __slots__ = ("session_id", "resume_gateway", "last_sequence", "state", "ready", "attempts", "disconnected_at",
+                 "restart_requested")
+
+    def __init__(self) -> None:
+        self.session_id: Optional[str] = None
+        self.resume_gateway: Optional[str] = None
+        self.last_sequence: int = 0
+
+        self.state: ConnectionState = ConnectionState.DISCONNECTED
+        self.ready: Event = Event()
+
+        self.attempts: int = 0
+        self.disconnected_at: Optional[float] = None
+        self.restart_requested: bool = False
+
+    @property
+    def can_resume(self) -> bool:
+        """
+        Whether the session can be resumed.
+        """
+
+        return bool(self.session_id and self.resume_gateway)
+
+    def invalidate(self) -> None:
+        """
+        The invalidate function forgets the session, so the next connection identifies a new one.
+        """
+
+        self.session_id = None
+        self.resume_gateway = None
+        self.last_sequence = 0
+
+    def disconnected(self) -> int:
+        """
+        The disconnected function marks the session as reconnecting
+        and returns the number of the failed reconnects before this one.
+        """
+
+        if self.disconnected_at is None:
+            self.disconnected_at = perf_counter()
+
+        self.attempts += 1
+        self.state = ConnectionState.RECONNECTING
+
+        return self.attempts - 1
+
+    def started(self) -> Optional[float]:
+        """
+        The started function marks the session as connected after the READY or RESUMED event
+        and returns the time in seconds it took to restore the connection, or None if it wasn't lost.
+        """
+
+        self.state = ConnectionState.CONNECTED
+        self.attempts = 0
+        self.ready.set()
+
+        if self.disconnected_at is None:
+            return None
+
+        downtime: float = perf_counter() - self.disconnected_at
+        self.disconnected_at = None
+
+        return downtime
+
+    def __repr__(self):
+        return f"<Session(state={self.state}, session_id={self.session_id}, attempts={self.attempts})>"
+
+
+class RequestQueue:
+    """
+    Queue of the requests sent to the gateway. The request taken from the queue stays pending until it's sent,
+    so a request interrupted by a lost connection is sent by the next one.
+    """
+
+    __slots__ = ("queue", "pending")
+
+    def __init__(self) -> None:
+        self.queue: Queue = Queue()
+        self.pending: Optional[tuple[float, Any]] = None  # Format: (queued_at, request)
+
+    async def put(self, request: Any) -> None:
+        """
+        The put function adds the request to the queue.
+
+        :param request: Request sent to the gateway
+        """
+
+        await self.queue.put((perf_counter(), request))
+
+    async def next(self) -> tuple[float, Any]:
+        """
+        The next function returns the pending request, or waits for a new one.
+        """
+
+        if self.pending is None:
+            self.pending = await self.queue.get()
+
+        return self.pending
+
+    def done(self) -> None:
+        """
+        The done function forgets the pending request after it was sent.
+        """
+
+        self.pending = None
+
+    def qsize(self) -> int:
+        """
+        The qsize function returns the number of the requests waiting in the queue.
+        """
+
+        return self.queue.qsize()
+
+    def __repr__(self):
+        return f"<RequestQueue(size={self.qsize()}, pending={self.pending is not None})>"
+
+
+class Heartbeat:
+    """
+    State of the heartbeats of a connection: the interval received in the hello response,
+    whether the last heartbeat was acknowledged and the measured round-trip latency.
+    """
+
+    __slots__ = ("interval", "hello", "acked", "sent_at", "latency")
+
+    def __init__(self) -> None:
+        self.interval: float = 41.25
+        self.hello: Event = Event()
+        self.acked: bool = True
+        self.sent_at: Optional[float] = None
+        self.latency: Optional[float] = None
+
+    def start(self, interval: float) -> None:
+        """
+        The start function sets the heartbeat interval received in the hello response and starts the heartbeats.
+
+        :param interval: Heartbeat interval in seconds
+        """
+
+        self.interval = interval
+        self.acked = True
+        self.hello.set()
+
+    def sent(self) -> None:
+        """
+        The sent function marks the heartbeat as sent and waiting for the acknowledgement.
+        """
+
+        self.acked = False
+        self.sent_at = perf_counter()
+
+    def ack(self) -> Optional[float]:
+        """
+        The ack function marks the last heartbeat as acknowledged and returns the round-trip latency,
+        or None if no heartbeat was waiting for the acknowledgement.
+        """
+
+        self.acked = True
+
+        if self.sent_at is None:
+            return None
+
+        self.latency = perf_counter() - self.sent_at
+        self.sent_at = None
+
+        return self.latency
+
+    def __repr__(self):
+        return f"<Heartbeat(interval={self.interval}, acked={self.acked}, latency={self.latency})>"
+
+
+class Compression:
+    """
+    State of the zlib-stream compression of a connection: the zlib context, the buffer of the incomplete message
+    and the total size of the compressed and decompressed data.
+    """
+
+    __slots__ = ("inflator", "buffer", "compressed_bytes", "decompressed_bytes")
+
+    def __init__(self) -> None:
+        self.inflator: Optional[zlib._Decompress] = None  # pyright: ignore
+        self.buffer: bytearray = bytearray()
+
+        self.compressed_bytes: int = 0
+        self.decompressed_bytes: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether the data of the current websocket connection is compressed.
+        """
+
+        return self.inflator is not None
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """
+        Ratio of the decompressed to the compressed size of the data.
+        Returns None if no compressed data has been received.
+        """
+
+        if not self.compressed_bytes:
+            return None
+
+        return self.decompressed_bytes / self.compressed_bytes
+
+    def reset(self, enabled: bool) -> None:
+        """
+        The reset function creates a new zlib context. Each websocket connection has its own context.
+
+        :param enabled: Whether the new connection is compressed
+        """
+
+        self.buffer.clear()
+        self.inflator = zlib.decompressobj() if enabled else None
+
+    def decompress(self, message: bytes) -> Optional[bytes]:
+        """
+        The decompress function adds the message to the buffer and decompresses it,
+        if the message ends with the zlib flush suffix. Otherwise, it returns None and waits for the rest of the data.
+
+        :param message: Part of the compressed data
+        """
+
+        self.buffer.extend(message)
+
+        if len(message) < 4 or message[-4:] != ZLIB_SUFFIX:
+            return None
+
+        data: bytes = self.inflator.decompress(self.buffer)  # pyright: ignore
+
+        self.compressed_bytes += len(self.buffer)
+        self.decompressed_bytes += len(data)
+        self.buffer.clear()
+
+        return data
+
+    def __repr__(self):
+        return f"<Compression(enabled={self.enabled}, ratio={self.ratio})>"
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Union, Awaitable, Any, Optional, TYPE_CHECKING
+from typing import Union, Awaitable, Any, Callable, Optional, TYPE_CHECKING
 from asyncio import AbstractEventLoop, sleep, get_event_loop
 from time import time
 from aiohttp import ClientSession, ClientResponse, client_exceptions
@@ -9,6 +9,11 @@ from .typings import API_VERSION, AUTH_HEADER, METHOD
 from .errors import UnSupportedApiVersion, UnSupportedTokenType, InvalidMethodType
 from .enums import Discord
 from .activity import ActivityBuilder
+from .cachebuilder import CacheBuilder
+from .settingsbuilder import SettingsBuilder
+from .codec import JSONCodec, get_codec
+from .stats import Stats
+from .tracing import HTTPTracer
 from .logger import Logger
 from .user import UserClient
 from .gateway import Gateway
@@ -16,7 +21,45 @@ from .gateway import Gateway
 if TYPE_CHECKING:
     from .client import Client
 
-__all__: tuple[str, ...] = ("HTTPClient", "ClientResponse", "CustomSession")
+__all__: tuple[str, ...] = ("HTTPClient", "ClientResponse", "JSONClientResponse", "CustomSession")
+
+_UNSET: Any = object()
+_DEFAULT_CODEC: JSONCodec = JSONCodec()
+
+
+class JSONClientResponse(ClientResponse):
+    """
+    JSONClientResponse keeps the body decoded by the first call of :meth:`json`,
+    the next calls return it without decoding the body again.
+    The body is decoded with **loads**, :class:`CustomSession` sets it to the codec of the client.
+    """
+
+    loads: Callable[[str], Any] = staticmethod(_DEFAULT_CODEC.loads)
+    _json: Any = _UNSET
+
+    async def json(self, *, encoding: Optional[str] = None, loads: Optional[Callable[[str], Any]] = None,
+                   content_type: Optional[str] = "application/json") -> Any:
+        """
+        The json function returns the decoded body of the response, it is decoded only once.
+
+        :param encoding: Encoding of the body, if not specified it is detected from the headers
+        :param loads: Function decoding the body, if not specified **loads** of the response is used
+        :param content_type: Expected content type, ``None`` disables the check
+        """
+
+        if self._json is _UNSET:
+            self._json = await super().json(encoding=encoding, loads=loads or self.loads, content_type=content_type)
+
+        return self._json
+
+    @property
+    def is_json(self) -> bool:
+        """
+        Returns True if the response has a JSON body: the status is not 204 (No Content)
+        and the content type is application/json.
+        """
+
+        return self.status != 204 and self.content_type == "application/json"
 
 
 class CustomSession(ClientSession):
@@ -28,7 +71,8 @@ class CustomSession(ClientSession):
 
         :param logger: Pass the logger object to the class
         :param *args: Pass any additional arguments to the superclass
-        :param **kwargs: Pass in additional parameters that are not explicitly defined
+        :param **kwargs: Pass in additional parameters that are not explicitly defined.
+            With enabled **stats**, the latency of the requests is traced by :class:`asynccore.tracing.HTTPTracer`
         """
 
         self.logger: Logger = logger
@@ -37,37 +81,50 @@ class CustomSession(ClientSession):
         self.request_latency: float = kwargs["latency"]
         self.ratelimit_additional_cooldown: float = kwargs["additional_cooldown"]
         self.users: Optional[list[UserClient]] = kwargs.get("users")
+        self.codec: JSONCodec = kwargs.get("codec") or JSONCodec()
+        self.tracer: Optional[HTTPTracer] = None
+
+        stats: Optional[Stats] = kwargs.pop("stats", None)
+
+        if stats is not None and stats.enabled:
+            self.tracer = HTTPTracer(stats)
+            kwargs["trace_configs"] = [*kwargs.get("trace_configs", ()), self.tracer.trace_config]
 
         del kwargs["latency"]
         del kwargs["users"]
         del kwargs["additional_cooldown"]
+        kwargs.pop("codec", None)
+        kwargs["response_class"] = JSONClientResponse
 
         super().__init__(*args, **kwargs)
 
-    async def request(self, method: str, url: str, **kwargs: Any) -> ClientResponse:
+    async def request(self, method: str, url: str, **kwargs: Any) -> JSONClientResponse:
         #  pylint: disable=invalid-overridden-method
 
         """
         The request function is a wrapper around the ClientSession.request function,
         which handles ratelimits and other exceptions that may occur during requests.
         It also adds an additional cooldown to the Retry-After header value.
+        The JSON body is decoded once, here or by the first call of :meth:`JSONClientResponse.json`,
+        the callers get the decoded body from the response without decoding it again.
 
         :param method: Determine the type of request
         :param url: Specify the url that you want to make a request to
         :param kwargs: Pass in additional parameters to the request function
         """
 
-        response = await super().request(method=method, url=url, **kwargs)
+        response: JSONClientResponse = await super().request(method=method, url=url, **kwargs)  # pyright: ignore
+        response.loads = self.codec.loads
         headers: Optional[dict] = kwargs.get("headers")
 
         token: Optional[str] = None  # pyright: ignore
         if headers:
             token: Optional[str] = headers.get("authorization")
 
-        if response and token:
+        if token and response.is_json:
             try:
                 _json: dict = await response.json()
-            except client_exceptions.ContentTypeError:
+            except (client_exceptions.ContentTypeError, ValueError):
                 _json: dict = {}
 
             if isinstance(_json, dict):
@@ -75,14 +132,14 @@ class CustomSession(ClientSession):
                 if message and "You need to verify" in message and self.users:
                     for user in self.users:
                         if user.token == token:
-                            self.logger.error(f"It seems that your account has been blocked.\n-> Account: {user}")
+                            self.logger.error("It seems that your account has been blocked.\n-> Account: %s", user)
                     response.status = 901
 
         if response.headers.get("Retry-After"):
 
             seconds = int(response.headers.get("Retry-After")) + self.ratelimit_additional_cooldown  # pyright: ignore
             if self.logger_status:
-                self.logger.warning(f"Ratelimit has been reached. Awaiting {seconds} seconds before next request.")
+                self.logger.warning("Ratelimit has been reached. Awaiting %s seconds before next request.", seconds)
 
             await sleep(seconds)
         else:
@@ -103,7 +160,10 @@ class HTTPClient:
     :param ratelimit_additional_cooldown: Add a cooldown to the ratelimit
     :param client: Client object needed to connect to gateway
     :param activity: The argument with type :class:`AcivityBuilder` is responsible for account activity.
-    :param startup_cache: Enable or disable cache fetching at program startup
+    :param startup_cache: Enable or disable requesting the cache data missing in the READY event from the api
+    :param cache: The argument with type :class:`CacheBuilder` is responsible for the limits of the cache.
+    :param settings: The argument with type :class:`SettingsBuilder` is responsible for the codec, the metrics,
+        the logs format and the endpoints.
     """
 
     def __init__(
@@ -113,9 +173,12 @@ class HTTPClient:
             logger: bool,
             request_latency: float,
             ratelimit_additional_cooldown: float,
+            *,
             client: Client,
             activity: Optional[ActivityBuilder],
-            startup_cache: bool
+            startup_cache: bool,
+            cache: Optional[CacheBuilder],
+            settings: SettingsBuilder
     ):
 
         if api_version not in (9, 10):
@@ -126,22 +189,30 @@ class HTTPClient:
         self.start = time()
 
         self.api_version: int = api_version
-        self.endpoint: str = Discord.ENDPOINT.value.format(self.api_version)
-        self.endpoint_gateway: str = Discord.ENDPONT_GATEWAY.value.format(self.api_version)
+        self.endpoint: str = (settings.endpoint or Discord.ENDPOINT.value).format(self.api_version)
+        self.endpoint_gateway: str = (settings.endpoint_gateway or Discord.ENDPONT_GATEWAY.value).format(
+            self.api_version)
 
-        self.loop: AbstractEventLoop = loop if loop else get_event_loop()
+        if not self.endpoint.endswith("/"):
+            self.endpoint += "/"
 
-        self._tokens: Union[str, list, None] = None
-        self._logger_status: bool = logger
+        self.loop: AbstractEventLoop = loop if loop else get_event_loop()
+        self.codec: JSONCodec = get_codec(settings.json_codec)
+        self.metrics: Stats = Stats(enabled=settings.collect_stats)
 
-        self.logger: Logger.logger = Logger().logger  # pyright: ignore
-        self.logger._status = self._logger_status
+        self.logger: Logger.logger = Logger(json_output=settings.json_logs).logger  # pyright: ignore
+        self.logger._status = logger
         self.session: Union[CustomSession, None] = None  # pyright: ignore
 
+        json_codec: Union[str, JSONCodec] = settings.json_codec
+        if isinstance(json_codec, str) and json_codec not in ("auto", self.codec.name) and self.logger._status:
+            self.logger.warning("Codec: %s is not installed. Using the json codec instead.", json_codec)
+
         self.users: list[UserClient] = []
         self.loop.run_until_complete(self.create_session())
 
         self.use_cache: bool = startup_cache
+        self.cache_settings: Optional[CacheBuilder] = cache
         self.gateway: Gateway = Gateway(client=client, gateway_url=self.endpoint_gateway, activity=activity)
 
     async def create_session(self) -> None:
@@ -153,7 +224,9 @@ class HTTPClient:
         self.session: CustomSession = CustomSession(self.logger,
                                                     latency=self.request_latency,
                                                     additional_cooldown=self.ratelimit_additional_cooldown,
-                                                    users=self.users)
+                                                    users=self.users,
+                                                    codec=self.codec,
+                                                    stats=self.metrics)
 
     def _check_tokens(self, tokens: Union[list[str], str]) -> None:  # pyright: ignore
         """
@@ -169,9 +242,9 @@ class HTTPClient:
                 header: AUTH_HEADER = AUTH_HEADER(authorization=token)
                 response: ClientResponse = await self.session.get(_url, headers=header)
                 if response.status != 200:
-                    if self._logger_status:
+                    if self.logger._status:
                         self.logger.warning(
-                            f"An invalid token has been provided: {token} | The token will be automatically deleted")
+                            "An invalid token has been provided: %s | The token will be automatically deleted", token)
 
                 else:
                     data: dict = await response.json()
@@ -179,23 +252,16 @@ class HTTPClient:
                     data["loop"] = self.loop
                     data["endpoint"] = self.endpoint
                     data["endpoint_gateway"] = self.endpoint_gateway
+                    data["cache"] = self.cache_settings
+                    data["startup_cache"] = self.use_cache
 
                     self.users.append(UserClient(data, self.session))
 
-            if self._logger_status:
-                self.logger.info(f"Checking of tokens successfully completed | Loaded ({len(self.users)}) tokens\n")
-
-            if self.use_cache:
-                if self._logger_status:
-                    self.logger.debug(f"Fetching cache for {len(self.users)} selfbots...")
-
-                for user in self.users:
-                    await user.cache.startup_cache()
-                    await sleep(0.5)
+            if self.logger._status:
+                self.logger.info("Checking of tokens successfully completed | Loaded (%s) tokens\n", len(self.users))
 
-                if self._logger_status:
-                    seconds: str = str(time() - self.start)[0:3]
-                    self.logger.debug(f"--- Done: {seconds} seconds ---")
+            if self.use_cache and self.logger._status:
+                self.logger.debug("The cache of %s selfbots will be filled from the gateway", len(self.users))
 
         if not isinstance(tokens, list) and not isinstance(tokens, str):
             raise UnSupportedTokenType
@@ -238,8 +304,8 @@ class HTTPClient:
 
         _url: str = self.endpoint + url
 
-        if self._logger_status:
-            self.logger.debug(f"Sending request: {method} -> {_url}")
+        if self.logger._status:
+            self.logger.debug("Sending request: %s -> %s", method, _url)
 
         response: ClientResponse = await self.session.request(method=method, url=_url, headers=headers, json=data)
         response.raise_for_status()
@@ -1,11 +1,68 @@
-from logging import DEBUG, StreamHandler, getLogger
+from __future__ import annotations
+
+from typing import Any, Optional
+from logging import DEBUG, Formatter, LogRecord, StreamHandler, getLogger
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timezone
+from queue import SimpleQueue
+import atexit
+import copy
+import json
+
 from colorlog import ColoredFormatter
 
 
+class JSONFormatter(Formatter):
+    """
+    JSONFormatter writes every record as one JSON object per line,
+    with the fields: time, level, logger, message and exception (only if the record has one).
+    """
+
+    def format(self, record: LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+
+        exception: Optional[str] = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+
+        if exception:
+            entry["exception"] = exception
+
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler formats the whole line in the thread of the caller. Here only the message (``msg % args``)
+    and the traceback are formatted, as the arguments could change before the listener handles the record,
+    and the line is formatted by the formatter of the stream handler in the thread of the listener.
+    The records below the level of the logger are still dropped before they are formatted.
+    """
+
+    exception_formatter: Formatter = Formatter()
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = self.exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
 class Logger:
     """
-    It sets up the logger with a colored formatter and stream handler,
-    and then adds that handler to the logger. It also sets up a status variable.
+    It sets up the logger with a queue handler, the records are written by a stream handler
+    in the thread of a :class:`logging.handlers.QueueListener`, so the event loop doesn't wait for the output.
+    The handlers are added only once, the next objects only change the formatter. It also sets up a status variable.
+
+    :param json_output: Write the records as JSON objects (:class:`JSONFormatter`) instead of the colored text
     """
 
     __slots__ = ("logger", "_status", "debug", "error", "warning")
@@ -13,14 +70,27 @@ class Logger:
     log_level: int = DEBUG
     log_format: str = "%(log_color)s%(levelname)s | %(asctime)s > %(message)s"
 
-    def __init__(self):
+    # Shared by all objects, the records are written by a single listener thread
+    _listener: Optional[QueueListener] = None
+    _stream: Optional[StreamHandler] = None
 
-        formatter = ColoredFormatter(self.log_format, datefmt='%H:%M:%S')
-        stream = StreamHandler()
-        stream.setLevel(self.log_level)
-        stream.setFormatter(formatter)
+    def __init__(self, json_output: bool = False):
+        formatter: Formatter = JSONFormatter() if json_output else ColoredFormatter(self.log_format, datefmt='%H:%M:%S')
 
         self.logger = getLogger('Logger')
         self.logger.setLevel(self.log_level)
-        self.logger.addHandler(stream)
+
+        if Logger._listener is None:
+            queue: SimpleQueue = SimpleQueue()
+
+            Logger._stream = StreamHandler()
+            Logger._stream.setLevel(self.log_level)
+
+            Logger._listener = QueueListener(queue, Logger._stream, respect_handler_level=True)
+            Logger._listener.start()
+            atexit.register(Logger._listener.stop)
+
+            self.logger.addHandler(_DeferredQueueHandler(queue))
+
+        Logger._stream.setFormatter(formatter)  # pyright: ignore
         self.logger._status = True  # pyright: ignore
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+from asyncio import AbstractEventLoop, Task, sleep
+
+from .stats import Histogram
+
+if TYPE_CHECKING:
+    from .client import Client
+
+__all__: tuple[str, ...] = ("LoopLagMonitor",)
+
+
+class LoopLagMonitor:
+    """
+    :class:`LoopLagMonitor` measures how late the event loop runs the scheduled callbacks.
+    Every **interval** seconds it sleeps and checks how much longer than requested the sleep took.
+    A high lag means the loop is blocked, so the gateway receivers, the heartbeats and the handlers are starved.
+
+    The lag is added to the **loop_lag_seconds** histogram of the client stats, if they are enabled.
+    A warning is logged when the lag reaches **warning_ratio** of the heartbeat interval of the gateway,
+    because a longer lag leads to missed heartbeats and dropped connections.
+
+    :param client: Client object to obtain main program loop, logger, stats and gateway connections
+    :param interval: Time in seconds between the measurements
+    :param warning_ratio: Part of the heartbeat interval after which a warning is logged
+    :param sample_size: Number of recent samples used to calculate the percentiles
+    """
+
+    def __init__(self, client: Client, interval: float = 0.5, warning_ratio: float = 0.5,
+                 sample_size: int = 1024) -> None:
+        self._client: Client = client
+        self._loop: AbstractEventLoop = client.loop
+        self._task: Optional[Task] = None
+
+        self.interval: float = interval
+        self.warning_ratio: float = warning_ratio
+        self.histogram: Histogram = Histogram(sample_size)
+        self.last_lag: float = 0.0
+
+        client.metrics.add_gauge("loop_lag_last_seconds", lambda: self.last_lag)
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the monitor is running.
+        """
+
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """
+        The start function starts the monitor in the loop of the client.
+        It's called automatically when the gateway is started.
+        """
+
+        if not self.running:
+            self._task = self._loop.create_task(self.__run(), name="asynccore-loop-lag-monitor")
+
+    def stop(self) -> None:
+        """
+        The stop function stops the monitor.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        The percentile function returns the percentile of the recent lag measurements.
+
+        :param percent: Percentile to calculate, from 0 to 100
+        """
+
+        return self.histogram.percentile(percent)
+
+    def heartbeat_interval(self) -> Optional[float]:
+        """
+        The heartbeat_interval function returns the shortest heartbeat interval of the gateway connections,
+        or None if no user is connected.
+        """
+
+        intervals: list[float] = [
+            user.gateway_connection.heartbeat_interval
+            for user in self._client.users if user.gateway_connection
+        ]
+
+        return min(intervals) if intervals else None
+
+    def record(self, lag: float) -> None:
+        """
+        The record function adds the measured lag to the histogram and the stats of the client,
+        and logs a warning if the lag is close to the heartbeat interval.
+
+        :param lag: Measured lag in seconds
+        """
+
+        self.last_lag = lag
+        self.histogram.observe(lag)
+
+        if self._client.metrics.enabled:
+            self._client.metrics.observe("loop_lag_seconds", lag)
+
+        heartbeat_interval: Optional[float] = self.heartbeat_interval()
+
+        if heartbeat_interval and lag >= heartbeat_interval * self.warning_ratio and self._client.logger._status:
+            self._client.logger.warning("Event loop lag: %.3f seconds is close to the heartbeat interval: "
+                                        "%.3f seconds. The gateway connections may be dropped.",
+                                        lag, heartbeat_interval)
+
+    async def __run(self) -> None:
+        while True:
+            start: float = self._loop.time()
+            await sleep(self.interval)
+            self.record(max(self._loop.time() - start - self.interval, 0.0))
+
+    def __repr__(self):
+        return f"<LoopLagMonitor(interval={self.interval}, running={self.running}, last_lag={self.last_lag})>"
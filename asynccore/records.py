@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, Iterable, Optional
+from functools import lru_cache
+from sys import intern
+
+__all__: tuple[str, ...] = (
+    "CachedRecord",
+    "record_type",
+    "GUILD_FIELDS",
+    "CHANNEL_FIELDS",
+    "MESSAGE_FIELDS"
+)
+
+GUILD_FIELDS: tuple[str, ...] = (
+    "id", "name", "icon", "owner_id", "roles", "emojis", "features", "member_count",
+    "premium_tier", "vanity_url_code", "unavailable"
+)
+CHANNEL_FIELDS: tuple[str, ...] = (
+    "id", "guild_id", "type", "name", "position", "parent_id", "topic", "nsfw",
+    "permission_overwrites", "rate_limit_per_user", "last_message_id", "bitrate", "user_limit"
+)
+MESSAGE_FIELDS: tuple[str, ...] = (
+    "id", "guild_id", "channel_id", "type", "author", "content", "timestamp", "edited_timestamp",
+    "mentions", "attachments", "embeds", "message_reference", "pinned"
+)
+
+_INTERN_MAX_LENGTH: int = 64
+_MISSING: Any = object()
+
+
+class CachedRecord:
+    """
+    CachedRecord is a compact replacement for the raw dictionaries stored in the :class:`asynccore.cache.Cache`.
+    It keeps only a fixed set of fields in ``__slots__`` and interns short strings such as ids and names,
+    which repeat across many cached objects. Records support the dict-style access used with the raw data,
+    for example ``record["id"]``, ``record.get("topic")`` or ``dict(record.items())``.
+
+    Record types are created with :func:`record_type`.
+
+    :param data: Raw data from discord
+    """
+
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+
+    def __init__(self, data: dict) -> None:
+        for field in self._fields:
+            value: Any = data.get(field, _MISSING)
+
+            if value.__class__ is str and len(value) <= _INTERN_MAX_LENGTH:
+                value = intern(value)
+
+            object.__setattr__(self, field, value)
+
+    def __getitem__(self, key: str) -> Any:
+        value: Any = getattr(self, key, _MISSING) if key in self._fields else _MISSING
+
+        if value is _MISSING:
+            raise KeyError(key)
+
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self._fields:
+            raise KeyError(f"{self.__class__.__name__} does not store the field: {key}")
+
+        object.__setattr__(self, key, value)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields and getattr(self, key) is not _MISSING  # pyright: ignore
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (CachedRecord, dict)):
+            return self.to_dict() == dict(other.items())
+
+        return NotImplemented
+
+    __hash__ = None  # pyright: ignore
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        """
+        The get function returns the value of the field, or default if the field is not stored.
+
+        :param key: Name of the field
+        :param default: Value returned when the field is missing
+        """
+
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> list[str]:
+        """
+        The keys function returns names of the fields that are present in the record.
+        """
+
+        return [field for field in self._fields if getattr(self, field) is not _MISSING]
+
+    def values(self) -> list[Any]:
+        """
+        The values function returns values of the fields that are present in the record.
+        """
+
+        return [getattr(self, field) for field in self.keys()]
+
+    def items(self) -> list[tuple[str, Any]]:
+        """
+        The items function returns (field, value) pairs of the fields that are present in the record.
+        """
+
+        return [(field, getattr(self, field)) for field in self.keys()]
+
+    def to_dict(self) -> dict:
+        """
+        The to_dict function converts the record back to a dictionary.
+        """
+
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}({', '.join(f'{k}={v!r}' for k, v in self.items())})>"
+
+
+@lru_cache(maxsize=None)
+def _create_record_type(name: str, fields: tuple[str, ...]) -> type[CachedRecord]:
+    for field in fields:
+        if not field.isidentifier() or hasattr(CachedRecord, field):
+            raise ValueError(f"Invalid record field name: {field}")
+
+    return type(name, (CachedRecord,), {"__slots__": fields, "_fields": fields})  # pyright: ignore
+
+
+def record_type(name: str, fields: Iterable[str]) -> type[CachedRecord]:
+    """
+    The record_type function returns a :class:`CachedRecord` subclass that stores the given fields.
+    Types are created once for every combination of name and fields.
+
+    :param name: Name of the record type
+    :param fields: Names of the fields to store
+    """
+
+    return _create_record_type(name, tuple(dict.fromkeys(fields)))
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Optional, Union
+
+from .codec import JSONCodec
+
+
+class SettingsBuilder:
+    """
+    SettingsBuilder allows you to configure the encoding, the metrics, the logs and the endpoints of the client.
+    The finished object should be specified in the **settings** argument in the :class:`asynccore.client.Client` class.
+
+    :param json_codec: Codec used to encode and decode the data of the gateway and the api.
+        Name of the codec (**auto**, **orjson**, **ujson**, **json**) or the :class:`asynccore.codec.JSONCodec` object.
+    :param collect_stats: Enable or disable collecting the metrics returned by :meth:`asynccore.client.Client.stats`
+    :param loop_lag_interval: Interval in seconds of the event loop lag measurements
+        (:class:`asynccore.monitor.LoopLagMonitor`). If not specified, the lag is not measured.
+    :param endpoint: Url of the discord api, for example a local server used in the tests and benchmarks.
+        ``{}`` is replaced with the api version. If not specified, ``https://discord.com/api/v{}/``
+    :param endpoint_gateway: Url of the discord gateway. ``{}`` is replaced with the api version.
+        If not specified, ``wss://gateway.discord.gg/?v={}&encoding=json``
+    :param json_logs: Write the logs as JSON objects (time, level, logger, message, exception), one per line,
+        instead of the colored text. The logs are written in a separate thread in both cases.
+    """
+
+    __slots__ = ("json_codec", "collect_stats", "loop_lag_interval", "endpoint", "endpoint_gateway", "json_logs")
+
+    def __init__(self, *,
+                 json_codec: Union[str, JSONCodec] = "auto",
+                 collect_stats: bool = False,
+                 loop_lag_interval: Optional[float] = None,
+                 endpoint: Optional[str] = None,
+                 endpoint_gateway: Optional[str] = None,
+                 json_logs: bool = False
+                 ):
+        self.json_codec: Union[str, JSONCodec] = json_codec
+        self.collect_stats: bool = collect_stats
+        self.loop_lag_interval: Optional[float] = loop_lag_interval
+
+        self.endpoint: Optional[str] = endpoint
+        self.endpoint_gateway: Optional[str] = endpoint_gateway
+        self.json_logs: bool = json_logs
+
+    def __repr__(self):
+        return f"<SettingsBuilder(json_codec={self.json_codec}, collect_stats={self.collect_stats}, " \
+               f"loop_lag_interval={self.loop_lag_interval}, endpoint={self.endpoint})>"
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+from time import time
+import json
+import sqlite3
+
+__all__: tuple[str, ...] = ("CacheSnapshot",)
+
+SNAPSHOT_VERSION: int = 1
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS snapshots (user_id TEXT PRIMARY KEY, version INTEGER NOT NULL, saved_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS guilds (user_id TEXT NOT NULL, guild_id INTEGER NOT NULL, data TEXT NOT NULL,
+                                   PRIMARY KEY (user_id, guild_id));
+CREATE TABLE IF NOT EXISTS channels (user_id TEXT NOT NULL, guild_id INTEGER NOT NULL, channel_id INTEGER NOT NULL,
+                                     data TEXT NOT NULL, PRIMARY KEY (user_id, channel_id));
+"""
+
+
+def _encode(data: Any) -> str:
+    # Compact records are converted back to dictionaries
+    return json.dumps(data if isinstance(data, dict) else dict(data.items()), separators=(",", ":"))
+
+
+class CacheSnapshot:
+    """
+    CacheSnapshot stores the guilds and channels of the :class:`asynccore.cache.Cache` in a SQLite database,
+    so they are available right after the restart, before the gateway sends them again.
+    Every account has its own rows, so one file can be shared by all users of the client.
+    Each save replaces the previous snapshot of the account in a single transaction.
+
+    :param path: Path of the database file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+    def __connect(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection = sqlite3.connect(self.path)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def save(self, user_id: Any, guilds: Iterable[tuple[int, Any]],
+             channels: Iterable[tuple[int, int, Any]]) -> None:
+        """
+        The save function replaces the snapshot of the account.
+
+        :param user_id: Id of the account
+        :param guilds: Pairs of the guild id and the guild data
+        :param channels: Triples of the guild id, the channel id and the channel data
+        """
+
+        user_id = str(user_id)
+        guild_rows: list[tuple[str, int, str]] = [(user_id, guild_id, _encode(data)) for guild_id, data in guilds]
+        channel_rows: list[tuple[str, int, int, str]] = [
+            (user_id, guild_id, channel_id, _encode(data)) for guild_id, channel_id, data in channels
+        ]
+
+        connection: sqlite3.Connection = self.__connect()
+
+        try:
+            with connection:
+                connection.execute("DELETE FROM guilds WHERE user_id = ?", (user_id,))
+                connection.execute("DELETE FROM channels WHERE user_id = ?", (user_id,))
+                connection.executemany("INSERT INTO guilds VALUES (?, ?, ?)", guild_rows)
+                connection.executemany("INSERT INTO channels VALUES (?, ?, ?, ?)", channel_rows)
+                connection.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)",
+                                   (user_id, SNAPSHOT_VERSION, time()))
+        finally:
+            connection.close()
+
+    def load(self, user_id: Any) -> Optional[tuple[list[tuple[int, dict]], list[tuple[int, dict]]]]:
+        """
+        The load function returns the guilds and channels of the account: ``([(guild_id, data)], [(guild_id, data)])``.
+        Returns None if the account has no snapshot or it was saved by an incompatible version.
+
+        :param user_id: Id of the account
+        """
+
+        user_id = str(user_id)
+        connection: sqlite3.Connection = self.__connect()
+
+        try:
+            snapshot: Optional[tuple[int]] = connection.execute(
+                "SELECT version FROM snapshots WHERE user_id = ?", (user_id,)).fetchone()
+
+            if snapshot is None or snapshot[0] != SNAPSHOT_VERSION:
+                return None
+
+            guilds: list[tuple[int, dict]] = [
+                (guild_id, json.loads(data))
+                for guild_id, data in connection.execute("SELECT guild_id, data FROM guilds WHERE user_id = ?",
+                                                         (user_id,))
+            ]
+            channels: list[tuple[int, dict]] = [
+                (guild_id, json.loads(data))
+                for guild_id, data in connection.execute("SELECT guild_id, data FROM channels WHERE user_id = ?",
+                                                         (user_id,))
+            ]
+        finally:
+            connection.close()
+
+        return guilds, channels
+
+    def saved_at(self, user_id: Any) -> Optional[float]:
+        """
+        The saved_at function returns the unix time of the last snapshot of the account, or None.
+
+        :param user_id: Id of the account
+        """
+
+        connection: sqlite3.Connection = self.__connect()
+
+        try:
+            row: Optional[tuple[float]] = connection.execute(
+                "SELECT saved_at FROM snapshots WHERE user_id = ?", (str(user_id),)).fetchone()
+        finally:
+            connection.close()
+
+        return row[0] if row else None
+
+    def __repr__(self):
+        return f"<CacheSnapshot(path={self.path})>"
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Optional, Tuple, Union
+from collections import deque
+from math import ceil
+
+__all__: tuple[str, ...] = ("Stats", "Histogram", "LABELS")
+
+LABELS = Tuple[Tuple[str, Any], ...]  # pylint: disable=invalid-name
+
+
+def _percentile(samples: list[float], percent: float) -> Optional[float]:
+    if not samples:
+        return None
+
+    return samples[max(ceil(percent / 100 * len(samples)) - 1, 0)]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """
+    Histogram collects the observed values of a metric, for example the time of decoding the responses.
+    Percentiles are calculated from the most recent samples.
+
+    :param sample_size: Number of recent samples used to calculate the percentiles
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "samples")
+
+    def __init__(self, sample_size: int = 1024) -> None:
+        self.count: int = 0
+        self.total: float = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.samples: deque[float] = deque(maxlen=sample_size)
+
+    def observe(self, value: float) -> None:
+        """
+        The observe function adds the value to the histogram.
+
+        :param value: Observed value
+        """
+
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        The percentile function returns the percentile of the recent samples, or None if there are no samples.
+
+        :param percent: Percentile to calculate, from 0 to 100
+        """
+
+        return _percentile(sorted(self.samples), percent)
+
+    def snapshot(self) -> dict[str, Optional[float]]:
+        """
+        The snapshot function returns the summary of the histogram.
+        """
+
+        samples: list[float] = sorted(self.samples)
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.total / self.count if self.count else None,
+            "p50": _percentile(samples, 50),
+            "p90": _percentile(samples, 90),
+            "p99": _percentile(samples, 99)
+        }
+
+
+class Stats:
+    """
+    Stats collects the metrics of the client: counters, histograms and gauges.
+    Every metric is identified by its name and labels, for example ``("op", 0), ("event", "MESSAGE_CREATE")``.
+    When the stats are disabled, the library does not measure anything,
+    all the measurements are guarded with the **enabled** attribute.
+
+    :param enabled: Enable or disable collecting the metrics
+    :param sample_size: Number of recent samples used to calculate the percentiles of the histograms
+    """
+
+    def __init__(self, enabled: bool = False, sample_size: int = 1024) -> None:
+        self.enabled: bool = enabled
+        self.sample_size: int = sample_size
+
+        self.counters: dict[tuple[str, LABELS], Union[int, float]] = {}
+        self.histograms: dict[tuple[str, LABELS], Histogram] = {}
+        self.gauges: dict[tuple[str, LABELS], Callable[[], Optional[float]]] = {}
+
+    def increment(self, name: str, labels: LABELS = (), value: Union[int, float] = 1) -> None:
+        """
+        The increment function increases the counter.
+
+        :param name: Name of the counter
+        :param labels: Labels of the counter
+        :param value: Value to add
+        """
+
+        key: tuple[str, LABELS] = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: LABELS = ()) -> None:
+        """
+        The observe function adds the value to the histogram.
+
+        :param name: Name of the histogram
+        :param value: Observed value
+        :param labels: Labels of the histogram
+        """
+
+        key: tuple[str, LABELS] = (name, labels)
+        histogram: Optional[Histogram] = self.histograms.get(key)
+
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.sample_size)
+
+        histogram.observe(value)
+
+    def add_gauge(self, name: str, function: Callable[[], Optional[float]], labels: LABELS = ()) -> None:
+        """
+        The add_gauge function registers a gauge. The function is called only when the snapshot is taken.
+
+        :param name: Name of the gauge
+        :param function: Function returning the current value
+        :param labels: Labels of the gauge
+        """
+
+        self.gauges[(name, labels)] = function
+
+    def get_histogram(self, name: str, labels: LABELS = ()) -> Optional[Histogram]:
+        """
+        The get_histogram function returns the histogram, or None if nothing has been observed yet.
+
+        :param name: Name of the histogram
+        :param labels: Labels of the histogram
+        """
+
+        return self.histograms.get((name, labels))
+
+    def reset(self) -> None:
+        """
+        The reset function removes the values of all counters and histograms. Gauges stay registered.
+        """
+
+        self.counters.clear()
+        self.histograms.clear()
+
+    def snapshot(self) -> dict[str, dict[str, list[dict[str, Any]]]]:
+        """
+        The snapshot function returns the current values of all metrics, in the format:
+        ``{"counters": {name: [{"labels": {...}, "value": ...}]}, "histograms": ..., "gauges": ...}``
+        """
+
+        snapshot: dict[str, dict[str, list[dict[str, Any]]]] = {"counters": {}, "histograms": {}, "gauges": {}}
+
+        for (name, labels), value in list(self.counters.items()):
+            snapshot["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+        for (name, labels), histogram in list(self.histograms.items()):
+            snapshot["histograms"].setdefault(name, []).append({"labels": dict(labels), **histogram.snapshot()})
+
+        for (name, labels), function in list(self.gauges.items()):
+            snapshot["gauges"].setdefault(name, []).append({"labels": dict(labels), "value": function()})
+
+        return snapshot
+
+    def to_prometheus(self, prefix: str = "asynccore_") -> str:
+        """
+        The to_prometheus function returns all metrics in the prometheus text format.
+        Histograms are exported as summaries with the 0.5, 0.9 and 0.99 quantiles.
+
+        :param prefix: Prefix added to the name of every metric
+        """
+
+        lines: list[str] = []
+        snapshot: dict[str, dict[str, list[dict[str, Any]]]] = self.snapshot()
+
+        def format_labels(labels: dict[str, Any], **extra: Any) -> str:
+            labels = {**labels, **extra}
+            if not labels:
+                return ""
+
+            return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+        for name, metrics in snapshot["counters"].items():
+            lines.append(f"# TYPE {prefix}{name} counter")
+            lines.extend(f"{prefix}{name}{format_labels(metric['labels'])} {metric['value']}" for metric in metrics)
+
+        for name, metrics in snapshot["gauges"].items():
+            lines.append(f"# TYPE {prefix}{name} gauge")
+            lines.extend(f"{prefix}{name}{format_labels(metric['labels'])} {metric['value']}"
+                         for metric in metrics if metric["value"] is not None)
+
+        for name, metrics in snapshot["histograms"].items():
+            lines.append(f"# TYPE {prefix}{name} summary")
+
+            for metric in metrics:
+                for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+                    if metric[key] is not None:
+                        labels: str = format_labels(metric["labels"], quantile=quantile)
+                        lines.append(f"{prefix}{name}{labels} {metric[key]}")
+
+                lines.append(f"{prefix}{name}_sum{format_labels(metric['labels'])} {metric['sum']}")
+                lines.append(f"{prefix}{name}_count{format_labels(metric['labels'])} {metric['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self):
+        return f"<Stats(enabled={self.enabled}, counters={len(self.counters)}, histograms={len(self.histograms)})>"
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Any
+from types import SimpleNamespace
+from time import perf_counter
+import re
+
+from aiohttp import ClientSession, TraceConfig
+from aiohttp import (TraceRequestStartParams, TraceRequestEndParams, TraceRequestExceptionParams,
+                     TraceRequestHeadersSentParams, TraceDnsResolveHostStartParams, TraceDnsResolveHostEndParams,
+                     TraceConnectionCreateStartParams, TraceConnectionCreateEndParams)
+
+from .stats import Stats, LABELS
+
+__all__: tuple[str, ...] = ("HTTPTracer", "normalize_route")
+
+_VERSION_PREFIX: re.Pattern = re.compile(r"^.*?/v\d+/")
+_ID: re.Pattern = re.compile(r"^\d+$")
+
+# Segments following these ones are parameters of the route, but not ids
+_NAMED_PARAMETERS: dict[str, str] = {"reactions": "{emoji}"}
+
+
+def normalize_route(path: str) -> str:
+    """
+    The normalize_route function returns the template of the route of the api,
+    so the requests of the same endpoint share the metrics.
+    The api version and the query are removed, the ids are replaced with ``{id}`` and the emojis with ``{emoji}``,
+    for example ``/api/v10/channels/1234/messages?limit=1`` becomes ``channels/{id}/messages``.
+
+    :param path: Path of the url of the request
+    """
+
+    path = _VERSION_PREFIX.sub("", path.split("?", 1)[0]).strip("/")
+    segments: list[str] = path.split("/")
+
+    for index, segment in enumerate(segments):
+        if _ID.match(segment):
+            segments[index] = "{id}"
+        elif index and segments[index - 1] in _NAMED_PARAMETERS:
+            segments[index] = _NAMED_PARAMETERS[segments[index - 1]]
+
+    return "/".join(segments)
+
+
+class HTTPTracer:
+    """
+    :class:`HTTPTracer` measures the phases of the requests to the api with the :class:`aiohttp.TraceConfig`
+    installed in the :class:`asynccore.http.CustomSession`, and adds them to the histograms of the client stats:
+
+        * **http_dns_seconds**: resolving the host, only when it's not cached yet,
+        * **http_connect_seconds**: opening a new connection (including the DNS and TLS), reused ones are skipped,
+        * **http_ttfb_seconds**: time to first byte, from sending the request headers to receiving the response headers,
+        * **http_request_seconds**: total time from the start of the request to receiving the response headers.
+
+    Every request increases the **http_requests** counter. The metrics are labeled with the method,
+    the route template (:func:`normalize_route`) and the status, which is ``error`` for failed requests.
+
+    :param stats: Stats object the metrics are added to
+    """
+
+    def __init__(self, stats: Stats) -> None:
+        self.stats: Stats = stats
+        self.trace_config: TraceConfig = TraceConfig()
+
+        self.trace_config.on_request_start.append(self.__on_request_start)
+        self.trace_config.on_dns_resolvehost_start.append(self.__on_dns_start)
+        self.trace_config.on_dns_resolvehost_end.append(self.__on_dns_end)
+        self.trace_config.on_connection_create_start.append(self.__on_connection_start)
+        self.trace_config.on_connection_create_end.append(self.__on_connection_end)
+        self.trace_config.on_request_headers_sent.append(self.__on_headers_sent)
+        self.trace_config.on_request_end.append(self.__on_request_end)
+        self.trace_config.on_request_exception.append(self.__on_request_exception)
+
+    @staticmethod
+    async def __on_request_start(_: ClientSession, context: SimpleNamespace,
+                                 params: TraceRequestStartParams) -> None:
+        context.start = perf_counter()
+        context.method = params.method
+        context.route = normalize_route(params.url.path)
+        context.dns_start = None
+        context.dns = None
+        context.connect_start = None
+        context.connect = None
+        context.headers_sent = None
+
+    @staticmethod
+    async def __on_dns_start(_: ClientSession, context: SimpleNamespace,
+                             _params: TraceDnsResolveHostStartParams) -> None:
+        context.dns_start = perf_counter()
+
+    @staticmethod
+    async def __on_dns_end(_: ClientSession, context: SimpleNamespace,
+                           _params: TraceDnsResolveHostEndParams) -> None:
+        context.dns = perf_counter() - context.dns_start
+
+    @staticmethod
+    async def __on_connection_start(_: ClientSession, context: SimpleNamespace,
+                                    _params: TraceConnectionCreateStartParams) -> None:
+        context.connect_start = perf_counter()
+
+    @staticmethod
+    async def __on_connection_end(_: ClientSession, context: SimpleNamespace,
+                                  _params: TraceConnectionCreateEndParams) -> None:
+        context.connect = perf_counter() - context.connect_start
+
+    @staticmethod
+    async def __on_headers_sent(_: ClientSession, context: SimpleNamespace,
+                                _params: TraceRequestHeadersSentParams) -> None:
+        context.headers_sent = perf_counter()
+
+    async def __on_request_end(self, _: ClientSession, context: SimpleNamespace,
+                               params: TraceRequestEndParams) -> None:
+        self.__record(context, params.response.status)
+
+    async def __on_request_exception(self, _: ClientSession, context: SimpleNamespace,
+                                     _params: TraceRequestExceptionParams) -> None:
+        self.__record(context, "error")
+
+    def __record(self, context: SimpleNamespace, status: Any) -> None:
+        end: float = perf_counter()
+        labels: LABELS = (("method", context.method), ("route", context.route), ("status", status))
+
+        self.stats.increment("http_requests", labels)
+        self.stats.observe("http_request_seconds", end - context.start, labels)
+
+        if context.headers_sent is not None:
+            self.stats.observe("http_ttfb_seconds", end - context.headers_sent, labels)
+
+        if context.dns is not None:
+            self.stats.observe("http_dns_seconds", context.dns, labels)
+
+        if context.connect is not None:
+            self.stats.observe("http_connect_seconds", context.connect, labels)
+
+    def routes(self) -> list[dict[str, Any]]:
+        """
+        The routes function returns the summary of the requests of every method, route and status,
+        sorted by the total time spent in the requests, in the format:
+        ``[{"method": ..., "route": ..., "status": ..., "count": ..., "request": {...}, "ttfb": {...}, ...}]``.
+        The phases have the format of :meth:`asynccore.stats.Histogram.snapshot`,
+        the ones that were not measured (for example **connect** of the reused connections) are missing.
+        """
+
+        routes: dict[LABELS, dict[str, Any]] = {}
+
+        for (name, labels), histogram in list(self.stats.histograms.items()):
+            if not name.startswith("http_") or not name.endswith("_seconds"):
+                continue
+
+            route: dict[str, Any] = routes.setdefault(labels, {**dict(labels), "count": 0})
+            route[name[5:-8]] = histogram.snapshot()
+
+        for labels, route in routes.items():
+            route["count"] = self.stats.counters.get(("http_requests", labels), 0)
+
+        return sorted(routes.values(), key=lambda route: route.get("request", {}).get("sum") or 0, reverse=True)
+
+    def __repr__(self):
+        return f"<HTTPTracer(stats={self.stats})>"
@@ -49,12 +49,25 @@ class UserClient:
         )
 
         self.loop: AbstractEventLoop = data["loop"]
-        self.cache: Cache = Cache(user=self, session=session, endpoint=self._endpoint)
+        self.cache: Cache = Cache(user=self, session=session, endpoint=self._endpoint,
+                                  settings=data.get("cache"), rest_fallback=data.get("startup_cache", False))
         self.gateway_connection: Optional[GatewayConnection] = None
 
     def __repr__(self):
         return f"<UserClient(name={self.name}, discriminator={self.discriminator}, id={self.id})>"
 
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        Round-trip latency in seconds between the last heartbeat sent to the gateway and its acknowledgement.
+        Returns None if the user is not connected to the gateway or no heartbeat has been acknowledged yet.
+        """
+
+        if not self.gateway_connection:
+            return None
+
+        return self.gateway_connection.latency
+
     async def reply_message(self, channel_id: int, message_id: int,
                             message_content: str, mention_author: bool = True) -> ClientResponse:
 
@@ -70,7 +83,7 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: POST -> {_url}")
+            self._logger.debug("Sending request: POST -> %s", _url)
 
         message_reference = MESSAGE_REFERENCE(
             message_id=message_id,
@@ -103,7 +116,7 @@ class UserClient:
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.warning(
-                f"Request POST channels/{channel_id}/messages failed.\n -> {self} {await response.json()}")
+                "Request POST channels/%s/messages failed.\n -> %s %s", channel_id, self, await response.json())
 
         return response
 
@@ -119,7 +132,7 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: POST -> {_url}")
+            self._logger.debug("Sending request: POST -> %s", _url)
 
         payload: dict = {
             "content": message_content
@@ -130,7 +143,7 @@ class UserClient:
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.warning(
-                f"Request POST channels/{channel_id}/messages failed.\n -> {self} {await response.json()}")
+                "Request POST channels/%s/messages failed.\n -> %s %s", channel_id, self, await response.json())
 
         return response
 
@@ -146,7 +159,7 @@ class UserClient:
         _url = self._endpoint + f"/channels/{channel_id}/messages/{message_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: PATCH -> {_url}")
+            self._logger.debug("Sending request: PATCH -> %s", _url)
 
         payload: dict = {
             "content": message_content
@@ -157,8 +170,8 @@ class UserClient:
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request PATCH /channels/{channel_id}/messages/{message_id} failed."
-                f"\n -> {self} {await response.json()}")
+                "Request PATCH /channels/%s/messages/%s failed.\n -> %s %s",
+                channel_id, message_id, self, await response.json())
 
         return response
 
@@ -176,15 +189,15 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages?limit=1&around={message_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET channels/{channel_id}/messages?limit=1&around={message_id} failed."
-                f"\n -> {self} {await response.json()}")
+                "Request GET channels/%s/messages?limit=1&around=%s failed.\n -> %s %s",
+                channel_id, message_id, self, await response.json())
 
         return response
 
@@ -206,14 +219,14 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages?limit={limit}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET channels/{channel_id}/messages failed.\n -> {self} {response.status}")
+                "Request GET channels/%s/messages failed.\n -> %s %s", channel_id, self, response.status)
 
         return response
 
@@ -228,15 +241,15 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages/{message_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: DELETE -> {_url}")
+            self._logger.debug("Sending request: DELETE -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="DELETE", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request DELETE channels/{channel_id}/messages/{message_id} failed."
-                f"\n -> {self} {await response.json()}")
+                "Request DELETE channels/%s/messages/%s failed.\n -> %s %s",
+                channel_id, message_id, self, await response.json())
 
         return response
 
@@ -250,14 +263,14 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: DELETE -> {_url}")
+            self._logger.debug("Sending request: DELETE -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="DELETE", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request DELETE channels/{channel_id} failed.\n -> {self} {await response.json()}")
+                "Request DELETE channels/%s failed.\n -> %s %s", channel_id, self, await response.json())
 
         return response
 
@@ -279,7 +292,7 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/channels"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: POST -> {_url}")
+            self._logger.debug("Sending request: POST -> %s", _url)
 
         payload: dict = {
             "name": name,
@@ -295,7 +308,7 @@ class UserClient:
 
         if response.status not in (201, 429) and self._logger._status:
             self._logger.error(
-                f"Request POST /guilds/{guild_id}/channels failed.\n -> {self} {await response.json()}")
+                "Request POST /guilds/%s/channels failed.\n -> %s %s", guild_id, self, await response.json())
 
         return response
 
@@ -310,14 +323,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/channels"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET guilds/{guild_id}/channels failed.\n -> {self} {await response.json()}.")
+                "Request GET guilds/%s/channels failed.\n -> %s %s.", guild_id, self, await response.json())
 
         return response
 
@@ -331,14 +344,14 @@ class UserClient:
         _url = self._endpoint + f"/channels/{channel_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET /channels/{channel_id} failed.\n -> {self} {await response.json()}.")
+                "Request GET /channels/%s failed.\n -> %s %s.", channel_id, self, await response.json())
 
         return response
 
@@ -362,7 +375,7 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/roles"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: POST -> {_url}")
+            self._logger.debug("Sending request: POST -> %s", _url)
 
         if color:
             r, g, b = color.values()
@@ -387,7 +400,7 @@ class UserClient:
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request POST guilds/{guild_id}/roles failed.\n -> {self} {await response.json()}")
+                "Request POST guilds/%s/roles failed.\n -> %s %s", guild_id, self, await response.json())
 
         return response
 
@@ -401,14 +414,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/roles"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET guilds/{guild_id}/roles failed.\n -> {self} {await response.json()}")
+                "Request GET guilds/%s/roles failed.\n -> %s %s", guild_id, self, await response.json())
 
         return response
 
@@ -423,14 +436,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/roles/{role_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: DELETE -> {_url}")
+            self._logger.debug("Sending request: DELETE -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="DELETE", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request DELETE guilds/{guild_id}/roles/{role_id} failed.\n -> {self} {await response.json()}")
+                "Request DELETE guilds/%s/roles/%s failed.\n -> %s %s", guild_id, role_id, self, await response.json())
 
         return response
 
@@ -444,14 +457,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/bans"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET guilds/{guild_id}/bans failed.\n -> {self} {await response.json()}")
+                "Request GET guilds/%s/bans failed.\n -> %s %s", guild_id, self, await response.json())
 
         return response
 
@@ -466,14 +479,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/bans/{user_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: DELETE -> {_url}")
+            self._logger.debug("Sending request: DELETE -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="DELETE", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request DELETE guilds/{guild_id}/bans/{user_id} failed.\n -> {self} {await response.json()}")
+                "Request DELETE guilds/%s/bans/%s failed.\n -> %s %s", guild_id, user_id, self, await response.json())
 
         return response
 
@@ -488,14 +501,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/bans/{user_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: PUT -> {_url}")
+            self._logger.debug("Sending request: PUT -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="PUT", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request PUT guilds/{guild_id}/bans/{user_id} failed.\n -> {self} {await response.json()}")
+                "Request PUT guilds/%s/bans/%s failed.\n -> %s %s", guild_id, user_id, self, await response.json())
 
         return response
 
@@ -510,14 +523,15 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/members/{user_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: DELETE -> {_url}")
+            self._logger.debug("Sending request: DELETE -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="DELETE", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request DELETE guilds/{guild_id}/members/{user_id} failed.\n -> {self} {await response.json()}")
+                "Request DELETE guilds/%s/members/%s failed.\n -> %s %s",
+                guild_id, user_id, self, await response.json())
 
         return response
 
@@ -532,14 +546,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/members/{user_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET guilds/{guild_id}/members/{user_id} failed.\n -> {self} {await response.json()}")
+                "Request GET guilds/%s/members/%s failed.\n -> %s %s", guild_id, user_id, self, await response.json())
 
         return response
 
@@ -586,14 +600,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/members/{user_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: PATCH -> {_url}")
+            self._logger.debug("Sending request: PATCH -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="PATCH", url=_url, headers=self._auth_header, json=json)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request PATCH guilds/{guild_id}/members/{user_id} failed.\n -> {self} {await response.json()}")
+                "Request PATCH guilds/%s/members/%s failed.\n -> %s %s", guild_id, user_id, self, await response.json())
 
         return response
 
@@ -612,15 +626,15 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: PUT -> {_url}")
+            self._logger.debug("Sending request: PUT -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="PUT", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request PUT channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me failed."
-                f"\n -> {self} {await response.json()}")
+                "Request PUT channels/%s/messages/%s/reactions/%s/@me failed.\n -> %s %s",
+                channel_id, message_id, emoji, self, await response.json())
 
         return response
 
@@ -639,15 +653,15 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages/{message_id}/reactions/{emoji}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET channels/{channel_id}/messages/{message_id}/reactions/{emoji}/ failed."
-                f"\n -> {self} {await response.json()}")
+                "Request GET channels/%s/messages/%s/reactions/%s/ failed.\n -> %s %s",
+                channel_id, message_id, emoji, self, await response.json())
 
         return response
 
@@ -666,15 +680,15 @@ class UserClient:
         _url = self._endpoint + f"channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{user_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: DELETE -> {_url}")
+            self._logger.debug("Sending request: DELETE -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="DELETE", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request DELETE channels/{channel_id}/messages/{message_id}/reactions/{emoji}/{user_id} failed."
-                f"\n -> {self} {await response.json()}")
+                "Request DELETE channels/%s/messages/%s/reactions/%s/%s failed.\n -> %s %s",
+                channel_id, message_id, emoji, user_id, self, await response.json())
 
         return response
 
@@ -688,14 +702,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}/invites"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (204, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET guilds/{guild_id}/invites failed.\n -> {self} {await response.json()}")
+                "Request GET guilds/%s/invites failed.\n -> %s %s", guild_id, self, await response.json())
         return response
 
     async def get_guild(self, guild_id: int) -> ClientResponse:
@@ -708,14 +722,14 @@ class UserClient:
         _url = self._endpoint + f"guilds/{guild_id}"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: GET -> {_url}")
+            self._logger.debug("Sending request: GET -> %s", _url)
 
         response: ClientResponse = await self._session.request(
             method="GET", url=_url, headers=self._auth_header)
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request GET guilds/{guild_id}/invites failed.\n -> {self} {await response.json()}")
+                "Request GET guilds/%s/invites failed.\n -> %s %s", guild_id, self, await response.json())
 
         else:
             self.cache.add_guild_to_cache(await response.json())
@@ -733,7 +747,7 @@ class UserClient:
         _url = self._endpoint + "users/@me/channels"
 
         if self._logger._status:
-            self._logger.debug(f"Sending request: POST -> {_url}")
+            self._logger.debug("Sending request: POST -> %s", _url)
 
         payload: dict = {
             "recipient_id": user_id
@@ -744,7 +758,7 @@ class UserClient:
 
         if response.status not in (200, 429) and self._logger._status:
             self._logger.error(
-                f"Request POST users/@me/channels failed.\n -> {self} {await response.json()}")
+                "Request POST users/@me/channels failed.\n -> %s %s", self, await response.json())
 
         if not response:
             return response
@@ -854,7 +868,7 @@ class UserClient:
             self._members_data += members_data
 
         if self._logger._status and self._members_end:
-            self._logger.debug(f"Fetched {len(self._members_data)} members.")
+            self._logger.debug("Fetched %s members.", len(self._members_data))
 
         if limit and len(self._members_data) >= limit:
             self._members_end = False
@@ -0,0 +1,112 @@
+"""
+Replays rounds of create/delete gateway events through the CacheEventHandler and checks
+that the size and the memory of the cache stay flat between the rounds.
+Every round creates guilds, channels, roles and messages and then deletes all of them.
+
+Exits with status 1 if the cache grows.
+
+Usage: PYTHONPATH=. python benchmarks/cache_lifecycle.py [rounds] [guilds]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from json import dumps
+from typing import Any
+
+import payloads
+
+from asynccore.cache import Cache, CacheEventHandler
+from asynccore.gateway.response import GatewayResponse
+
+_MEMORY_TOLERANCE: float = 64 * 1024
+
+
+class _User:
+    token: str = ""
+
+    def __init__(self) -> None:
+        self.cache: Cache = Cache(session=None, user=self, endpoint="")  # pyright: ignore
+
+
+def round_events(number: int, guilds: int) -> list[str]:
+    events: list[tuple[str, dict[str, Any]]] = []
+
+    for guild_number in range(number * guilds + 1, (number + 1) * guilds + 1):
+        guild: dict[str, Any] = payloads.guild(guild_number, channels=10, roles=5)
+        guild_id: str = guild["id"]
+        channel_ids: list[str] = [channel["id"] for channel in guild["channels"]]
+        events.append(("GUILD_CREATE", guild))
+
+        new_role: dict[str, Any] = payloads.role(100 + guild_number)
+        events.append(("GUILD_ROLE_CREATE", {"guild_id": guild_id, "role": new_role}))
+
+        message_ids: list[str] = []
+        for index in range(200):
+            message: dict[str, Any] = payloads.message(guild_number * 1000 + index, 0, guild_number)
+            message["channel_id"] = channel_ids[index % len(channel_ids)]
+            message_ids.append(message["id"])
+            events.append(("MESSAGE_CREATE", message))
+
+        for message_id in message_ids[:50]:
+            events.append(("MESSAGE_DELETE", {"id": message_id, "guild_id": guild_id}))
+
+        events.append(("MESSAGE_DELETE_BULK", {"ids": message_ids[50:100], "guild_id": guild_id}))
+        events.append(("GUILD_ROLE_DELETE", {"guild_id": guild_id, "role_id": new_role["id"]}))
+
+        for channel_id in channel_ids[:5]:
+            events.append(("CHANNEL_DELETE", {"id": channel_id, "guild_id": guild_id}))
+
+        events.append(("GUILD_DELETE", {"id": guild_id}))
+
+    return [dumps(payloads.dispatch(name, data, sequence)) for sequence, (name, data) in enumerate(events)]
+
+
+def main() -> None:
+    rounds: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    guilds: int = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    user: _User = _User()
+    handler: CacheEventHandler = CacheEventHandler(user)  # pyright: ignore
+
+    gc.collect()
+    tracemalloc.start()
+    baseline: int = 0
+    grown: bool = False
+
+    print(f"{'round':>5} {'events':>8} {'guilds':>7} {'channels':>9} {'messages':>9} {'memory':>12}")
+
+    for number in range(rounds):
+        events: list[str] = round_events(number, guilds)
+        count: int = len(events)
+
+        for event in events:
+            handler.handle_cache(GatewayResponse(event, user))  # pyright: ignore
+
+        del events
+        gc.collect()
+
+        memory: int = tracemalloc.get_traced_memory()[0]
+        size: dict[str, int] = user.cache.size()
+
+        if number == 0:
+            baseline = memory
+
+        grown = grown or any(size.values()) or memory - baseline > _MEMORY_TOLERANCE
+
+        print(f"{number:>5} {count:>8} {size['guilds']:>7} "
+              f"{size['channels']:>9} {size['messages']:>9} {memory - baseline:>+12}")
+
+    tracemalloc.stop()
+
+    if grown:
+        print("The cache grows between the rounds")
+        sys.exit(1)
+
+    print("The cache stays flat")
+
+
+if __name__ == "__main__":
+    main()
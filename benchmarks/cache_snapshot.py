@@ -0,0 +1,73 @@
+"""
+Compares a warm start from the cache snapshot (CacheBuilder(snapshot_path=...)) with a cold start.
+
+The warm start is measured: saving and loading the snapshot of the guilds and channels and its size on disk.
+The cold start with startup_cache needs one request for the guilds and one request per guild for the channels,
+its time is estimated from the number of requests, the round-trip time and the request_latency of the client.
+
+Usage: PYTHONPATH=. python benchmarks/cache_snapshot.py [guilds] [channels] [round_trip_ms]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import payloads
+
+from asynccore.cache import Cache
+from asynccore.cachebuilder import CacheBuilder
+
+_REQUEST_LATENCY: float = 0.1  # Default request_latency of the Client
+
+
+class _User:
+    token: str = ""
+    id: str = payloads.snowflake(0)
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop: asyncio.AbstractEventLoop = loop
+
+
+def main() -> None:
+    guilds: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    channels: int = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    round_trip: float = (float(sys.argv[3]) if len(sys.argv) > 3 else 100) / 1000
+
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings: CacheBuilder = CacheBuilder(snapshot_path=os.path.join(directory, "cache.db"))
+
+        cache: Cache = Cache(session=None, user=_User(loop), endpoint="", settings=settings)  # pyright: ignore
+        cache.seed(payloads.ready(guilds, channels))
+
+        start: float = perf_counter()
+        loop.run_until_complete(cache.save_snapshot())
+        save: float = perf_counter() - start
+
+        start = perf_counter()
+        loaded: Cache = Cache(session=None, user=_User(loop), endpoint="", settings=settings)  # pyright: ignore
+        loop.run_until_complete(loaded.load_snapshot())
+        load: float = perf_counter() - start
+
+        size: int = os.path.getsize(settings.snapshot_path)  # pyright: ignore
+
+    loop.close()
+
+    requests: int = 1 + guilds
+    cold: float = requests * (round_trip + _REQUEST_LATENCY)
+
+    print(f"guilds: {guilds}, channels per guild: {channels}, cached: {loaded.size()}")
+    print(f"snapshot size:   {size / 1024:.1f} KiB")
+    print(f"snapshot save:   {save * 1000:.1f} ms")
+    print(f"snapshot load:   {load * 1000:.1f} ms")
+    print(f"cold start:      {requests} requests, ~{cold:.1f} s "
+          f"(round trip {round_trip * 1000:.0f} ms + request_latency {_REQUEST_LATENCY * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares the installed codecs on READY, GUILD_CREATE and MESSAGE_CREATE payloads.
+
+Usage: PYTHONPATH=. python benchmarks/codec_bench.py
+"""
+
+from __future__ import annotations
+
+from timeit import Timer
+from typing import Any
+
+import payloads
+
+from asynccore.codec import JSONCodec, get_codec, _CODECS
+
+
+def available_codecs() -> list[JSONCodec]:
+    return [get_codec(name) for name, (_, module) in _CODECS.items() if module is not None]
+
+
+def best_of(function: Any, repeat: int = 5) -> float:
+    timer: Timer = Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> None:
+    frames: dict[str, dict[str, Any]] = {
+        "READY (100 guilds)": payloads.dispatch("READY", payloads.ready(guilds=100), 1),
+        "GUILD_CREATE": payloads.dispatch("GUILD_CREATE", payloads.guild(1, channels=100, roles=50), 2),
+        "MESSAGE_CREATE": payloads.dispatch("MESSAGE_CREATE", payloads.message(1, 1, 1), 3)
+    }
+
+    print(f"{'payload':<20} {'codec':<8} {'size':>10} {'loads':>12} {'dumps':>12}")
+
+    for payload_name, frame in frames.items():
+        for codec in available_codecs():
+            encoded = codec.dumps(frame)
+            loads: float = best_of(lambda: codec.loads(encoded))  # pylint: disable=cell-var-from-loop
+            dumps: float = best_of(lambda: codec.dumps(frame))  # pylint: disable=cell-var-from-loop
+
+            print(f"{payload_name:<20} {codec.name:<8} {len(encoded):>10} "
+                  f"{loads * 1e6:>10.1f}us {dumps * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
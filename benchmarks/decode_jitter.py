@@ -0,0 +1,92 @@
+"""
+Measures how late a heartbeat-like timer fires while large READY and GUILD_CREATE frames are decoded,
+with the frames decoded at once in the loop and with the FrameDecoder (Gateway.configure_decoding).
+Only the frames above the threshold of the FrameDecoder are decoded by it, as in the gateway,
+so the number of guilds decides which frames are large enough.
+
+Usage: PYTHONPATH=. python benchmarks/decode_jitter.py [guilds] [frames]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from time import perf_counter
+from typing import Any, Optional, Union
+
+import payloads
+
+from asynccore.codec import JSONCodec, EtfCodec
+from asynccore.gateway.decoder import FrameDecoder
+from asynccore.gateway.response import GatewayResponse
+
+_TICK: float = 0.01
+
+
+async def heartbeat(stop: asyncio.Event, lateness: list[float]) -> None:
+    while not stop.is_set():
+        start: float = perf_counter()
+        await asyncio.sleep(_TICK)
+        lateness.append(perf_counter() - start - _TICK)
+
+
+async def replay(frames: list[Union[str, bytes]], codec: JSONCodec, decoder: Optional[FrameDecoder]) -> list[float]:
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    stop: asyncio.Event = asyncio.Event()
+    lateness: list[float] = []
+    timer: asyncio.Task = asyncio.create_task(heartbeat(stop, lateness))
+
+    await asyncio.sleep(_TICK * 2)
+
+    for frame in frames:
+        large: bool = decoder is not None and decoder.is_large(frame)
+
+        if large and not isinstance(frame, str):
+            frame = await decoder.decode_frame(loop, frame, codec)  # pyright: ignore
+
+        response: GatewayResponse = GatewayResponse(frame, None, codec)  # pyright: ignore
+
+        if large:
+            await decoder.decode(loop, response)
+
+        data: Any = response.data
+        assert data is not None
+
+        await asyncio.sleep(0)
+
+    stop.set()
+    await timer
+    return sorted(lateness)
+
+
+def report(name: str, lateness: list[float], elapsed: float) -> None:
+    p99: float = lateness[max(int(len(lateness) * 0.99) - 1, 0)]
+    print(f"{name:<28} {elapsed * 1000:>10.1f} {p99 * 1000:>10.1f} {lateness[-1] * 1000:>10.1f}")
+
+
+async def main() -> None:
+    guilds: int = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    frame_count: int = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    events: list[dict[str, Any]] = [payloads.dispatch("READY", payloads.ready(guilds), 1)]
+    events += [payloads.dispatch("GUILD_CREATE", payloads.guild(number, channels=500, roles=250), number + 1)
+               for number in range(1, frame_count)]
+
+    frame_decoder: FrameDecoder = FrameDecoder()
+    print(f"threshold: {frame_decoder.threshold / 1024 / 1024:.2f} MiB")  # pyright: ignore
+
+    for codec in (JSONCodec(), EtfCodec()):
+        frames: list[Union[str, bytes]] = [codec.dumps(event) for event in events]
+        sizes: str = ", ".join(f"{len(frame) / 1024 / 1024:.2f}" for frame in frames)
+
+        print(f"\n{codec.name} frames (MiB): {sizes}")
+        print(f"{'frames':<28} {'total ms':>10} {'p99 ms':>10} {'max ms':>10}")
+
+        for name, decoder in (("in the loop", None), ("FrameDecoder", frame_decoder)):
+            start: float = perf_counter()
+            lateness: list[float] = await replay(frames, codec, decoder)
+            report(f"{codec.name}: {name}", lateness, perf_counter() - start)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
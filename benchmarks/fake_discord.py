@@ -0,0 +1,326 @@
+"""
+Local stand-in for the discord gateway and api, used to run the benchmarks without the network.
+
+The gateway (websockets) sends HELLO, answers IDENTIFY with READY, RESUME with the missed events and RESUMED,
+heartbeats with ACK, and dispatches the events passed to FakeDiscord.dispatch. It supports the json and etf
+encodings and the zlib-stream compression. The api (aiohttp) serves the endpoints used by the Cache and
+the UserClient from the same synthetic guilds as READY. Sending a message also dispatches MESSAGE_CREATE.
+
+Usage:
+    server = FakeDiscord(guilds=100)
+    await server.start()
+    client = Client(10, settings=SettingsBuilder(endpoint=server.endpoint, endpoint_gateway=server.endpoint_gateway))
+
+Or standalone: PYTHONPATH=. python benchmarks/fake_discord.py [guilds] [port]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import sys
+import zlib
+from collections import deque
+from itertools import count
+from typing import Any, Awaitable, Callable, Optional, Union
+from urllib.parse import urlsplit, parse_qsl
+
+from aiohttp import web
+from websockets.asyncio.server import serve, Server, ServerConnection
+from websockets.exceptions import ConnectionClosed
+
+import payloads
+
+from asynccore.codec import JSONCodec, EtfCodec
+
+_RESUME_BUFFER: int = 10_000
+
+
+def _route(pattern: str) -> re.Pattern:
+    return re.compile(pattern.replace("{id}", r"(\d+)") + "$")
+
+
+class _Session:
+    def __init__(self, session_id: str) -> None:
+        self.session_id: str = session_id
+        self.sequence: int = 0
+        self.events: deque[tuple[int, str, Any]] = deque(maxlen=_RESUME_BUFFER)
+        self.connection: Optional[_Connection] = None
+
+
+class _Connection:
+    def __init__(self, websocket: ServerConnection) -> None:
+        query: dict[str, str] = dict(parse_qsl(urlsplit(websocket.request.path).query))  # pyright: ignore
+
+        self.websocket: ServerConnection = websocket
+        self.codec: JSONCodec = EtfCodec() if query.get("encoding") == "etf" else JSONCodec()
+        self.compressor: Optional[Any] = zlib.compressobj() if query.get("compress") == "zlib-stream" else None
+        self.session: Optional[_Session] = None
+
+    async def send(self, payload: dict[str, Any]) -> None:
+        data: Union[str, bytes] = self.codec.dumps(payload)
+
+        if self.compressor is not None:
+            data = data.encode() if isinstance(data, str) else data
+            data = self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        await self.websocket.send(data)
+
+
+class FakeDiscord:
+    """
+    FakeDiscord runs the gateway and the api on the local host, on random free ports by default.
+
+    :param guilds: Number of the guilds of the account
+    :param channels: Number of the channels of every guild
+    :param heartbeat_interval: Heartbeat interval in seconds sent in HELLO
+    :param rest_latency: Time in seconds the api waits before answering, to simulate the round trip
+    :param host: Host of the servers
+    :param port: Port of the api, the gateway uses the next one. 0 picks free ports
+    """
+
+    def __init__(self, guilds: int = 10, channels: int = 20, *, heartbeat_interval: float = 41.25,
+                 rest_latency: float = 0.0, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.heartbeat_interval: float = heartbeat_interval
+        self.rest_latency: float = rest_latency
+        self.host: str = host
+        self.port: int = port
+
+        self.ready_data: dict[str, Any] = payloads.ready(guilds, channels)
+        self.guilds: dict[str, dict[str, Any]] = {guild["id"]: guild for guild in self.ready_data["guilds"]}
+        self.channels: dict[str, dict[str, Any]] = {
+            channel["id"]: dict(channel, guild_id=guild["id"])
+            for guild in self.ready_data["guilds"] for channel in guild["channels"]
+        }
+
+        self.sessions: dict[str, _Session] = {}
+        self.connections: set[_Connection] = set()
+        self.requests: int = 0
+
+        self._ids: count = count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self._gateway: Optional[Server] = None
+        self._ports: tuple[int, int] = (0, 0)  # Format: (api, gateway)
+
+        self._routes: list[tuple[str, re.Pattern, Callable[..., Awaitable[web.Response]]]] = [
+            ("GET", _route("users/@me"), self.get_me),
+            ("GET", _route("users/@me/guilds"), self.get_guilds),
+            ("GET", _route("guilds/{id}"), self.get_guild),
+            ("GET", _route("guilds/{id}/channels"), self.get_channels),
+            ("GET", _route("guilds/{id}/roles"), self.get_roles),
+            ("GET", _route("channels/{id}"), self.get_channel),
+            ("GET", _route("channels/{id}/messages"), self.get_messages),
+            ("POST", _route("channels/{id}/messages"), self.create_message)
+        ]
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://{self.host}:{self._ports[0]}/api/v{{}}/"
+
+    @property
+    def endpoint_gateway(self) -> str:
+        return f"ws://{self.host}:{self._ports[1]}/?v={{}}&encoding=json"
+
+    async def start(self) -> None:
+        app: web.Application = web.Application()
+        app.router.add_route("*", "/api/v{version}/{path:.*}", self.handle_request)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+
+        site: web.TCPSite = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        rest_port: int = site._server.sockets[0].getsockname()[1]  # pyright: ignore
+
+        self._gateway = await serve(self.handle_gateway, self.host, self.port and self.port + 1, max_size=None)
+        self._ports = (rest_port, next(iter(self._gateway.sockets)).getsockname()[1])
+
+    async def stop(self, code: int = 1000) -> None:
+        """
+        Closes the connections with the close code and stops the servers.
+        """
+
+        await self.disconnect(code)
+
+        if self._gateway is not None:
+            self._gateway.close()
+            await self._gateway.wait_closed()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def disconnect(self, code: int = 4000) -> None:
+        """
+        Closes all gateway connections, 4000 lets the clients resume the sessions.
+        """
+
+        await asyncio.gather(*(connection.websocket.close(code) for connection in tuple(self.connections)))
+
+    async def dispatch(self, event_name: str, data: Any) -> int:
+        """
+        Sends the event to all sessions and returns the number of the sessions that were connected.
+        Events of the disconnected sessions are kept and sent when they are resumed.
+        """
+
+        sent: int = 0
+
+        for session in self.sessions.values():
+            session.sequence += 1
+            session.events.append((session.sequence, event_name, data))
+
+            if session.connection is not None:
+                try:
+                    await session.connection.send(payloads.dispatch(event_name, data, session.sequence))
+                    sent += 1
+                except ConnectionClosed:
+                    pass
+
+        return sent
+
+    async def handle_gateway(self, websocket: ServerConnection) -> None:
+        connection: _Connection = _Connection(websocket)
+        self.connections.add(connection)
+
+        try:
+            await connection.send({"t": None, "s": None, "op": 10,
+                                   "d": {"heartbeat_interval": int(self.heartbeat_interval * 1000)}})
+
+            async for message in websocket:
+                request: dict[str, Any] = connection.codec.loads(message)
+                await self.handle_op(connection, request["op"], request.get("d"))
+        except ConnectionClosed:
+            pass
+        finally:
+            self.connections.discard(connection)
+
+            if connection.session is not None and connection.session.connection is connection:
+                connection.session.connection = None
+
+    async def handle_op(self, connection: _Connection, op: int, data: Any) -> None:
+        if op == 1:
+            await connection.send({"t": None, "s": None, "op": 11, "d": None})
+
+        elif op == 2:
+            session: _Session = _Session(f"{next(self._ids):032x}")
+            self.sessions[session.session_id] = session
+            connection.session = session
+
+            ready: dict[str, Any] = dict(self.ready_data, session_id=session.session_id,
+                                         resume_gateway_url=f"ws://{self.host}:{self._ports[1]}")
+            session.sequence += 1
+            session.connection = connection
+            await connection.send(payloads.dispatch("READY", ready, session.sequence))
+
+        elif op == 6:
+            resumed: Optional[_Session] = self.sessions.get(data["session_id"])
+
+            if resumed is None or (resumed.events and resumed.events[0][0] > data["seq"] + 1):
+                await connection.send({"t": None, "s": None, "op": 9, "d": False})
+                return
+
+            connection.session = resumed
+            resumed.connection = connection
+
+            for sequence, event_name, event_data in tuple(resumed.events):
+                if sequence > data["seq"]:
+                    await connection.send(payloads.dispatch(event_name, event_data, sequence))
+
+            resumed.sequence += 1
+            await connection.send(payloads.dispatch("RESUMED", {}, resumed.sequence))
+
+    async def handle_request(self, request: web.Request) -> web.Response:
+        self.requests += 1
+
+        if self.rest_latency:
+            await asyncio.sleep(self.rest_latency)
+
+        if not request.headers.get("authorization"):
+            return web.json_response({"message": "401: Unauthorized", "code": 0}, status=401)
+
+        path: str = re.sub("/+", "/", request.match_info["path"]).strip("/")
+
+        for method, pattern, handler in self._routes:
+            match: Optional[re.Match] = pattern.match(path)
+
+            if method == request.method and match:
+                return await handler(request, *match.groups())
+
+        if request.method in ("DELETE", "PUT"):
+            return web.Response(status=204)
+
+        return web.json_response({})
+
+    async def get_me(self, _: web.Request) -> web.Response:
+        return web.json_response(self.ready_data["user"])
+
+    async def get_guilds(self, _: web.Request) -> web.Response:
+        return web.json_response([{key: guild[key] for key in ("id", "name", "icon", "owner_id", "features")}
+                                  for guild in self.guilds.values()])
+
+    async def get_guild(self, _: web.Request, guild_id: str) -> web.Response:
+        guild: Optional[dict[str, Any]] = self.guilds.get(guild_id)
+
+        if guild is None:
+            return web.json_response({"message": "Unknown Guild", "code": 10004}, status=404)
+
+        return web.json_response({key: value for key, value in guild.items() if key not in ("channels", "threads")})
+
+    async def get_channels(self, _: web.Request, guild_id: str) -> web.Response:
+        return web.json_response([channel for channel in self.channels.values() if channel["guild_id"] == guild_id])
+
+    async def get_roles(self, _: web.Request, guild_id: str) -> web.Response:
+        return web.json_response(self.guilds[guild_id]["roles"] if guild_id in self.guilds else [])
+
+    async def get_channel(self, _: web.Request, channel_id: str) -> web.Response:
+        channel: Optional[dict[str, Any]] = self.channels.get(channel_id)
+
+        if channel is None:
+            return web.json_response({"message": "Unknown Channel", "code": 10003}, status=404)
+
+        return web.json_response(channel)
+
+    async def get_messages(self, request: web.Request, channel_id: str) -> web.Response:
+        limit: int = min(int(request.query.get("limit", 50)), 100)
+        guild_id: int = int(self.channels.get(channel_id, {}).get("guild_id", payloads.snowflake(0)))
+
+        return web.json_response([
+            dict(payloads.message(number, 0, 0), channel_id=channel_id, guild_id=str(guild_id))
+            for number in range(limit)
+        ])
+
+    async def create_message(self, request: web.Request, channel_id: str) -> web.Response:
+        channel: Optional[dict[str, Any]] = self.channels.get(channel_id)
+
+        if channel is None:
+            return web.json_response({"message": "Unknown Channel", "code": 10003}, status=404)
+
+        body: dict[str, Any] = await request.json()
+        message: dict[str, Any] = dict(payloads.message(next(self._ids), 0, 0), content=body.get("content", ""),
+                                       channel_id=channel_id, guild_id=channel["guild_id"],
+                                       author=self.ready_data["user"])
+
+        await self.dispatch("MESSAGE_CREATE", message)
+        return web.json_response(message)
+
+
+async def main() -> None:
+    guilds: int = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    port: int = int(sys.argv[2]) if len(sys.argv) > 2 else 8080
+
+    server: FakeDiscord = FakeDiscord(guilds=guilds, port=port)
+    await server.start()
+
+    print(f"endpoint:         {server.endpoint}")
+    print(f"endpoint_gateway: {server.endpoint_gateway}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
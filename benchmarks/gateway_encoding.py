@@ -0,0 +1,48 @@
+"""
+Compares the json and etf gateway encodings: size of the frames and the time needed
+to create a GatewayResponse and decode its data.
+
+Usage: PYTHONPATH=. python benchmarks/gateway_encoding.py
+"""
+
+from __future__ import annotations
+
+from timeit import Timer
+from typing import Any, Callable
+
+import payloads
+
+from asynccore.codec import JSONCodec, EtfCodec, get_codec
+from asynccore.gateway.response import GatewayResponse
+
+
+def best_of(function: Callable[[], Any], repeat: int = 5) -> float:
+    timer: Timer = Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def decode(frame: Any, codec: JSONCodec) -> Any:
+    return GatewayResponse(frame, None, codec).data  # pyright: ignore
+
+
+def main() -> None:
+    frames: dict[str, dict[str, Any]] = {
+        "READY (100 guilds)": payloads.dispatch("READY", payloads.ready(guilds=100), 1),
+        "GUILD_CREATE": payloads.dispatch("GUILD_CREATE", payloads.guild(1, channels=100, roles=50), 2),
+        "MESSAGE_CREATE": payloads.dispatch("MESSAGE_CREATE", payloads.message(1, 1, 1), 3)
+    }
+    codecs: list[JSONCodec] = [JSONCodec(), get_codec("auto"), EtfCodec()]
+
+    print(f"{'payload':<20} {'encoding':<8} {'size':>10} {'decode':>12}")
+
+    for payload_name, frame in frames.items():
+        for codec in dict.fromkeys(codecs, None):
+            encoded = codec.dumps(frame)
+            decode_time: float = best_of(lambda: decode(encoded, codec))  # pylint: disable=cell-var-from-loop
+
+            print(f"{payload_name:<20} {codec.name:<8} {len(encoded):>10} {decode_time * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Runs a Client against the local FakeDiscord server and measures, without the network:
+    * startup: time from Gateway.run to on_ready, with the READY of the given number of guilds,
+    * throughput: MESSAGE_CREATE events dispatched by the server and handled by on_message_create per second,
+    * latency: round trip of UserClient.send_message until its MESSAGE_CREATE reaches on_message_create,
+    * resume: time from a dropped connection to RESUMED.
+
+Usage: PYTHONPATH=. python benchmarks/gateway_throughput.py [guilds] [messages] [encoding] [compress]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from time import perf_counter
+from typing import Any
+
+from fake_discord import FakeDiscord
+import payloads
+
+from asynccore import Client, SettingsBuilder
+from asynccore.user import UserClient
+from asynccore.gateway import gateway
+
+_AUTHENTICATION_FAILED: int = 4004  # Fatal close code, the client stops reconnecting
+
+
+class BenchmarkClient(Client):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.ready: asyncio.Event = asyncio.Event()
+        self.received: int = 0
+        self.expected: int = 0
+        self.done: asyncio.Event = asyncio.Event()
+
+    async def on_ready(self, user: UserClient) -> None:
+        self.ready.set()
+
+    async def on_message_create(self, user: UserClient, message_data: dict) -> None:
+        self.received += 1
+
+        if self.received >= self.expected:
+            self.done.set()
+
+    async def wait_for(self, messages: int) -> None:
+        self.expected = self.received + messages
+        self.done.clear()
+        await self.done.wait()
+
+
+def percentile(samples: list[float], percent: float) -> float:
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * percent / 100), len(samples) - 1)]
+
+
+async def scenario(client: BenchmarkClient, server: FakeDiscord, messages: int, results: dict[str, Any]) -> None:
+    started: float = perf_counter()
+    await client.ready.wait()
+    results["startup"] = perf_counter() - started
+
+    user: UserClient = client.users[0]
+    channel_id: str = next(iter(server.channels))
+    message: dict[str, Any] = dict(payloads.message(0, 0, 0), channel_id=channel_id,
+                                   guild_id=server.channels[channel_id]["guild_id"])
+
+    started = perf_counter()
+    waiter: asyncio.Task = asyncio.create_task(client.wait_for(messages))
+
+    for _ in range(messages):
+        await server.dispatch("MESSAGE_CREATE", message)
+
+    await waiter
+    results["throughput"] = messages / (perf_counter() - started)
+
+    latencies: list[float] = []
+
+    for number in range(min(messages, 200)):
+        started = perf_counter()
+        waiter = asyncio.create_task(client.wait_for(1))
+        await user.send_message(int(channel_id), f"message {number}")
+        await waiter
+        latencies.append(perf_counter() - started)
+
+    results["latency"] = latencies
+
+    connection: Any = user.gateway_connection
+    started = perf_counter()
+    await server.disconnect(4000)
+
+    while connection.state.name != "CONNECTED" or connection.websocket.close_code is not None:
+        await asyncio.sleep(0.001)
+
+    results["resume"] = perf_counter() - started
+    await server.stop(_AUTHENTICATION_FAILED)
+
+
+def main() -> None:
+    guilds: int = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    messages: int = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    encoding: str = sys.argv[3] if len(sys.argv) > 3 else "json"
+    compress: bool = len(sys.argv) > 4 and sys.argv[4] == "compress"
+
+    # The delay of the reconnect is random, the backoff is disabled to measure the resume itself
+    gateway.RECONNECT_BACKOFF_BASE = 0
+
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    server: FakeDiscord = FakeDiscord(guilds=guilds)
+    loop.run_until_complete(server.start())
+
+    client: BenchmarkClient = BenchmarkClient(
+        10, loop=loop, logger=False, request_latency=0,
+        settings=SettingsBuilder(endpoint=server.endpoint, endpoint_gateway=server.endpoint_gateway))
+    client.login("token")
+
+    results: dict[str, Any] = {}
+    task: asyncio.Task = loop.create_task(scenario(client, server, messages, results))
+
+    client.gateway.run(reconnect=True, compress=compress, encoding=encoding)  # pyright: ignore
+    loop.run_until_complete(task)
+
+    loop.run_until_complete(client.session.close())  # pyright: ignore
+    client.session = None  # Closed already, HTTPClient.__del__ skips it
+
+    latencies: list[float] = results["latency"]
+
+    print(f"guilds: {guilds}, channels: {len(server.channels)}, encoding: {encoding}, compress: {compress}")
+    print(f"startup (READY):        {results['startup'] * 1000:.1f} ms")
+    print(f"throughput:             {results['throughput']:,.0f} MESSAGE_CREATE/s")
+    print(f"send_message latency:   p50 {percentile(latencies, 50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"resume:                 {results['resume'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
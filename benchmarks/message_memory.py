@@ -0,0 +1,60 @@
+"""
+Reports the number of bytes used by a single cached message,
+with raw dictionaries and with compact records (CacheBuilder(compact_records=True)).
+
+Usage: PYTHONPATH=. python benchmarks/message_memory.py [messages]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from json import dumps, loads
+
+import payloads
+
+from asynccore.cache import Cache
+from asynccore.cachebuilder import CacheBuilder
+
+
+class _User:
+    token: str = ""
+
+
+def measure(messages: int, compact_records: bool) -> float:
+    # Every message is decoded from its own json string, just like the gateway does.
+    raw_messages: list[str] = [
+        dumps(payloads.message(number, channel_id=number % 50, guild_id=1)) for number in range(messages)
+    ]
+    cache: Cache = Cache(session=None, user=_User(), endpoint="",  # pyright: ignore
+                         settings=CacheBuilder(max_messages=None, max_messages_per_channel=None,
+                                               compact_records=compact_records))
+
+    gc.collect()
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+
+    for raw_message in raw_messages:
+        cache.add_message_to_cache(loads(raw_message))
+
+    gc.collect()
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return (after - before) / messages
+
+
+def main() -> None:
+    messages: int = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    raw: float = measure(messages, compact_records=False)
+    compact: float = measure(messages, compact_records=True)
+
+    print(f"messages:        {messages}")
+    print(f"raw dicts:       {raw:.0f} bytes/message")
+    print(f"compact records: {compact:.0f} bytes/message ({compact / raw:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Synthetic discord payloads used by the benchmarks.
+The generators are deterministic, so the results of two runs can be compared.
+"""
+
+from __future__ import annotations
+
+from random import Random
+from typing import Any
+
+_BASE_ID: int = 1_000_000_000_000_000_000
+
+
+def snowflake(number: int) -> str:
+    return str(_BASE_ID + number)
+
+
+def user(number: int) -> dict[str, Any]:
+    return {
+        "id": snowflake(number),
+        "username": f"user{number}",
+        "global_name": f"User {number}",
+        "avatar": f"{number:032x}",
+        "discriminator": "0",
+        "public_flags": 0,
+        "avatar_decoration_data": None
+    }
+
+
+def message(number: int, channel_id: int, guild_id: int, rng: Random = Random(0)) -> dict[str, Any]:
+    author: dict[str, Any] = user(rng.randrange(500))
+    return {
+        "type": 0,
+        "tts": False,
+        "timestamp": "2023-07-01T12:00:00.000000+00:00",
+        "referenced_message": None,
+        "pinned": False,
+        "nonce": snowflake(10_000_000 + number),
+        "mentions": [],
+        "mention_roles": [],
+        "mention_everyone": False,
+        "member": {
+            "roles": [snowflake(900 + rng.randrange(10))],
+            "premium_since": None,
+            "pending": False,
+            "nick": None,
+            "mute": False,
+            "joined_at": "2022-01-01T12:00:00.000000+00:00",
+            "flags": 0,
+            "deaf": False,
+            "communication_disabled_until": None,
+            "avatar": None
+        },
+        "id": snowflake(20_000_000 + number),
+        "flags": 0,
+        "embeds": [],
+        "edited_timestamp": None,
+        "content": " ".join(rng.choice(("hello", "there", "discord", "message", "cache", "gateway"))
+                            for _ in range(rng.randrange(3, 20))),
+        "components": [],
+        "channel_id": snowflake(channel_id),
+        "author": author,
+        "attachments": [],
+        "guild_id": snowflake(guild_id)
+    }
+
+
+def channel(number: int, guild_id: int) -> dict[str, Any]:
+    return {
+        "id": snowflake(1_000_000 + number),
+        "type": 0,
+        "guild_id": snowflake(guild_id),
+        "name": f"channel-{number}",
+        "position": number % 50,
+        "parent_id": None,
+        "topic": None,
+        "nsfw": False,
+        "last_message_id": snowflake(20_000_000 + number),
+        "rate_limit_per_user": 0,
+        "permission_overwrites": [
+            {"id": snowflake(guild_id), "type": 0, "allow": "0", "deny": "1024"}
+        ],
+        "flags": 0
+    }
+
+
+def role(number: int) -> dict[str, Any]:
+    return {
+        "id": snowflake(900 + number),
+        "name": f"role-{number}",
+        "color": 0,
+        "hoist": False,
+        "position": number,
+        "permissions": "1071698660929",
+        "managed": False,
+        "mentionable": False,
+        "flags": 0
+    }
+
+
+def guild(number: int, channels: int = 20, roles: int = 10) -> dict[str, Any]:
+    guild_id: int = number
+    channels_data: list[dict[str, Any]] = [channel(number * 1000 + index, guild_id) for index in range(channels)]
+
+    for channel_data in channels_data:
+        del channel_data["guild_id"]  # Gateway does not send guild_id in the channels of GUILD_CREATE
+
+    return {
+        "id": snowflake(guild_id),
+        "name": f"guild-{number}",
+        "icon": f"{number:032x}",
+        "owner_id": snowflake(number % 500),
+        "features": ["COMMUNITY", "NEWS"],
+        "member_count": 1000 + number,
+        "premium_tier": 0,
+        "vanity_url_code": None,
+        "large": False,
+        "joined_at": "2022-01-01T12:00:00.000000+00:00",
+        "roles": [role(index) for index in range(roles)],
+        "emojis": [],
+        "stickers": [],
+        "channels": channels_data,
+        "threads": [],
+        "lazy": True
+    }
+
+
+def ready(guilds: int, channels: int = 20) -> dict[str, Any]:
+    return {
+        "v": 10,
+        "user": user(0),
+        "session_id": "0" * 32,
+        "resume_gateway_url": "wss://gateway-resume.discord.gg",
+        "guilds": [guild(number, channels) for number in range(1, guilds + 1)],
+        "private_channels": [],
+        "relationships": [],
+        "user_settings_proto": "A" * 512
+    }
+
+
+def dispatch(event_name: str, data: dict[str, Any], sequence: int) -> dict[str, Any]:
+    return {"t": event_name, "s": sequence, "op": 0, "d": data}
@@ -0,0 +1,83 @@
+"""
+Replays a gateway recording (Gateway.enable_recording) as fast as possible through the full receive path:
+GatewayResponse, EventHandler, the cache and the event handlers of the client, and reports the throughput.
+Without a recording, a synthetic one is created from the READY, GUILD_CREATE and MESSAGE_CREATE events.
+
+Usage: PYTHONPATH=. python benchmarks/replay.py [recording.jsonl.gz] [messages]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+import json
+from time import perf_counter
+from typing import Any
+
+import payloads
+
+from asynccore import Client, SettingsBuilder
+from asynccore.user import UserClient
+from asynccore.gateway.recorder import GatewayRecorder, GatewayReplayer
+
+
+def dumps(data: dict[str, Any]) -> str:
+    return json.dumps(data, separators=(",", ":"))
+
+
+def synthetic_recording(path: str, messages: int) -> None:
+    recorder: GatewayRecorder = GatewayRecorder(path, payloads.snowflake(0), "token")
+    ready: dict[str, Any] = payloads.ready(50)
+
+    recorder.record(dumps(payloads.dispatch("READY", ready, 1)))
+
+    for number in range(messages):
+        guild: dict[str, Any] = ready["guilds"][number % len(ready["guilds"])]
+        message: dict[str, Any] = payloads.message(number, 0, 0)
+        message.update(channel_id=guild["channels"][0]["id"], guild_id=guild["id"])
+
+        recorder.record(dumps(payloads.dispatch("MESSAGE_CREATE", message, number + 2)))
+
+    recorder.close()
+
+
+def main() -> None:
+    messages: int = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    client: Client = Client(api_version=10, loop=loop, logger=False,
+                            settings=SettingsBuilder(collect_stats=True))
+
+    client.users.append(UserClient({"endpoint": client.endpoint, "endpoint_gateway": client.endpoint_gateway,
+                                    "token": "token", "username": "benchmark", "discriminator": "0",
+                                    "id": payloads.snowflake(0), "loop": loop}, client.session))  # pyright: ignore
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = sys.argv[1] if len(sys.argv) > 1 else os.path.join(directory, "recording.jsonl.gz")
+
+        if len(sys.argv) < 2:
+            synthetic_recording(path, messages)
+
+        start: float = perf_counter()
+        replayer: GatewayReplayer = loop.run_until_complete(client.gateway.replay(path, speed=None))
+        elapsed: float = perf_counter() - start
+
+    loop.run_until_complete(client.session.close())  # pyright: ignore
+    client.session = None  # Closed already, HTTPClient.__del__ skips it
+
+    histograms: dict[str, list[dict[str, Any]]] = client.stats()["histograms"]
+    print(f"frames:     {replayer.frames}")
+    print(f"elapsed:    {elapsed * 1000:.1f} ms")
+    print(f"throughput: {replayer.frames / elapsed:,.0f} frames/s")
+    print(f"cache:      {client.users[0].cache.size()}")
+
+    for name in ("gateway_decode_seconds", "cache_update_seconds"):
+        for metric in histograms.get(name, []):
+            print(f"{name} {metric['labels']}: count {metric['count']}, "
+                  f"p50 {metric['p50'] * 1e6:.1f} us, p99 {metric['p99'] * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Checks that the lazy decoding of GatewayResponse and the FrameDecoder return the same data as decoding
+the whole frame, for frames in the usual order and for frames with other keys after the payload.
+
+Exits with status 1 if any frame is decoded differently.
+
+Usage: PYTHONPATH=. python benchmarks/response_frames.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from typing import Any
+
+from asynccore.codec import JSONCodec
+from asynccore.gateway.decoder import FrameDecoder
+from asynccore.gateway.response import GatewayResponse
+
+FRAMES: tuple[str, ...] = (
+    '{"t":"MESSAGE_CREATE","s":1,"op":0,"d":{"id":"1","content":"}"}}',
+    '{"t":"MESSAGE_CREATE","s":2,"op":0,"d":{"id":"2"},"extra":2}',
+    '{"t":"MESSAGE_CREATE","s":3,"op":0,"d":{"id":"3"},"extra":{"d":[1,2]}}',
+    '{"t":"MESSAGE_CREATE","s":4,"op":0,"d":"text","extra":"}"}',
+    '{"t":"MESSAGE_CREATE","s":5,"op":0,"d":[1,2,3],"extra":null}',
+    '{"t":null,"s":null,"op":11,"d":null,"extra":true}',
+    '{"t":"MESSAGE_CREATE","s":6,"op":0,"d":{"id":"6"}} ',
+)
+
+
+async def check(frame: str) -> list[str]:
+    expected: Any = json.loads(frame)["d"]
+    errors: list[str] = []
+
+    lazy: GatewayResponse = GatewayResponse(frame, None, JSONCodec())  # pyright: ignore
+    if lazy.data != expected:
+        errors.append(f"lazy: {lazy.data!r}")
+
+    stepped: GatewayResponse = GatewayResponse(frame, None, JSONCodec())  # pyright: ignore
+    await FrameDecoder(threshold=0).decode(asyncio.get_running_loop(), stepped)
+    if stepped.data != expected:
+        errors.append(f"FrameDecoder: {stepped.data!r}")
+
+    return errors
+
+
+async def main() -> int:
+    failed: int = 0
+
+    for frame in FRAMES:
+        errors: list[str] = await check(frame)
+        print(f"{'FAIL' if errors else 'ok':<6} {frame}")
+
+        for error in errors:
+            print(f"       {error}")
+
+        failed += bool(errors)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
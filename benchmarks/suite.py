@@ -0,0 +1,315 @@
+"""
+Benchmark suite of the hot paths of the receive path and the cache:
+    * GatewayResponse: reading the header of a frame and decoding its data,
+    * EventHandler.handle_event: cache update and dispatch of the event callback,
+    * CacheEventHandler.handle_cache: cache updates of the frequent events,
+    * Cache: lookups, and seeding from READY,
+at 100, 1k and 10k guilds, with 100k cached messages. The payloads are synthetic and deterministic (payloads.py).
+
+Every case is timed with timeit (autorange, then --repeat rounds), the result is the median time per operation.
+With --json the results are written in a machine-readable format; with --compare the results are compared
+to a previous --json file and the script exits with status 1 if a case got slower than the --tolerance.
+
+Usage: PYTHONPATH=. python benchmarks/suite.py [--sizes 100,1000,10000] [--messages 100000] [--filter cache.]
+                                  [--repeat 5] [--json results.json] [--compare baseline.json] [--tolerance 0.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Optional
+
+import payloads
+
+from asynccore import Client
+from asynccore.cache import Cache, CacheEventHandler
+from asynccore.cachebuilder import CacheBuilder
+from asynccore.codec import JSONCodec
+from asynccore.user import UserClient
+from asynccore.gateway.event import EventHandler
+from asynccore.gateway.gateway import GatewayConnection
+from asynccore.gateway.response import GatewayResponse
+
+_BATCH: int = 1000
+_CHANNELS: int = 5  # Channels per guild, 10k guilds have 50k channels
+
+# Format: (name, parameters, function running _BATCH operations)
+Case = tuple[str, dict[str, Any], Callable[[], Any]]
+
+
+class _User:
+    token: str = ""
+    id: str = payloads.snowflake(0)
+
+    def __init__(self, settings: CacheBuilder) -> None:
+        self.cache: Cache = Cache(session=None, user=self, endpoint="", settings=settings)  # pyright: ignore
+
+
+def dumps(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"))
+
+
+def cache_settings(messages: int) -> CacheBuilder:
+    # The cache is full, so every new message evicts the oldest one and the size stays the same between the rounds
+    return CacheBuilder(max_messages=messages, max_messages_per_channel=None)
+
+
+def fill_cache(user: _User, ready: dict[str, Any], messages: int) -> list[dict[str, Any]]:
+    user.cache.seed(ready)
+    guilds: list[dict[str, Any]] = ready["guilds"]
+    template: dict[str, Any] = payloads.message(0, 0, 0)
+    cached: list[dict[str, Any]] = []
+
+    for number in range(messages):
+        guild: dict[str, Any] = guilds[number % len(guilds)]
+        message: dict[str, Any] = dict(template, id=payloads.snowflake(20_000_000 + number), guild_id=guild["id"],
+                                       channel_id=guild["channels"][number // len(guilds) % _CHANNELS]["id"])
+        user.cache.add_message_to_cache(message)
+        cached.append(message)
+
+    return cached
+
+
+def sample(items: list[Any], count: int = _BATCH) -> list[Any]:
+    step: int = max(len(items) // count, 1)
+    return [items[index * step % len(items)] for index in range(count)]
+
+
+def response_cases() -> Iterator[Case]:
+    codec: JSONCodec = JSONCodec()
+    messages: list[str] = [dumps(payloads.dispatch("MESSAGE_CREATE", payloads.message(number, 1, 1), number))
+                           for number in range(_BATCH)]
+    guild: str = dumps(payloads.dispatch("GUILD_CREATE", payloads.guild(1, channels=100, roles=50), 1))
+
+    def header() -> None:
+        for frame in messages:
+            GatewayResponse(frame, None, codec)  # pyright: ignore
+
+    def decode() -> None:
+        for frame in messages:
+            GatewayResponse(frame, None, codec).data  # pyright: ignore  # pylint: disable=expression-not-assigned
+
+    def decode_guild() -> None:
+        for _ in range(_BATCH // 100):
+            GatewayResponse(guild, None, codec).data  # pyright: ignore  # pylint: disable=expression-not-assigned
+
+    yield "response.header", {"event": "MESSAGE_CREATE"}, header
+    yield "response.decode", {"event": "MESSAGE_CREATE"}, decode
+    yield "response.decode", {"event": "GUILD_CREATE", "channels": 100, "batch": _BATCH // 100}, decode_guild
+
+
+def cache_cases(guilds: int, messages: int) -> Iterator[Case]:
+    ready: dict[str, Any] = payloads.ready(guilds, _CHANNELS)
+    user: _User = _User(cache_settings(messages))
+    cached: list[dict[str, Any]] = fill_cache(user, ready, messages)
+    cache: Cache = user.cache
+    handler: CacheEventHandler = CacheEventHandler(user)  # pyright: ignore
+    parameters: dict[str, Any] = {"guilds": guilds, "messages": messages}
+
+    guild_ids: list[int] = [int(guild["id"]) for guild in sample(ready["guilds"])]
+    channel_ids: list[int] = [int(guild["channels"][-1]["id"]) for guild in sample(ready["guilds"])]
+    message_keys: list[tuple[int, int]] = [(int(message["guild_id"]), int(message["id"]))
+                                           for message in sample(cached)]
+
+    def get_guild() -> None:
+        for guild_id in guild_ids:
+            cache.get_guild(guild_id)
+
+    def get_channel() -> None:
+        for channel_id in channel_ids:
+            cache.get_channel(channel_id)
+
+    def get_message() -> None:
+        for guild_id, message_id in message_keys:
+            cache.get_message(guild_id, message_id)
+
+    yield "cache.get_guild", parameters, get_guild
+    yield "cache.get_channel", parameters, get_channel
+    yield "cache.get_message", parameters, get_message
+
+    def responses(event_name: str, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        return [payloads.dispatch(event_name, item, number) for number, item in enumerate(items)]
+
+    template: dict[str, Any] = payloads.message(0, 0, 0)
+    new_messages: list[dict[str, Any]] = responses("MESSAGE_CREATE", [
+        dict(template, id=payloads.snowflake(40_000_000 + number), guild_id=message["guild_id"],
+             channel_id=message["channel_id"])
+        for number, message in enumerate(sample(cached))
+    ])
+    edited_messages: list[dict[str, Any]] = responses("MESSAGE_UPDATE", [
+        dict(message, content="edited") for message in sample(cached)
+    ])
+    channels: list[dict[str, Any]] = responses("CHANNEL_UPDATE", [
+        dict(guild["channels"][0], guild_id=guild["id"], name="updated") for guild in sample(ready["guilds"])
+    ])
+
+    def handle(frames: list[dict[str, Any]]) -> Callable[[], None]:
+        def run() -> None:
+            for frame in frames:
+                handler.handle_cache(GatewayResponse(frame, user))  # pyright: ignore
+
+        return run
+
+    yield "cache_handler.handle_cache", dict(parameters, event="MESSAGE_CREATE"), handle(new_messages)
+    yield "cache_handler.handle_cache", dict(parameters, event="MESSAGE_UPDATE"), handle(edited_messages)
+    yield "cache_handler.handle_cache", dict(parameters, event="CHANNEL_UPDATE"), handle(channels)
+
+    def seed() -> None:
+        _User(cache_settings(messages)).cache.seed(ready)
+
+    yield "cache.seed", dict(parameters, channels=guilds * _CHANNELS, batch=1), seed
+
+
+def event_handler_cases(client: Client, guilds: int, messages: int) -> Iterator[Case]:
+    user: UserClient = client.users[0]
+    stub: _User = _User(cache_settings(messages))
+    cached: list[dict[str, Any]] = fill_cache(stub, payloads.ready(guilds, _CHANNELS), messages)
+    user.cache = stub.cache
+
+    connection: GatewayConnection = GatewayConnection(client=client, user=user, gateway=client.gateway,
+                                                      activity=None, reconnect=False)
+    handler: EventHandler = EventHandler(client=client, user=user, gateway=client.gateway, connection=connection)
+
+    # Events without a handler are not dispatched, the measured path includes the callback
+    @client.gateway.event(event_name="on_message_create")
+    async def on_message_create(user: UserClient, message_data: dict) -> None:  # pylint: disable=unused-argument
+        pass
+
+    template: dict[str, Any] = payloads.message(0, 0, 0)
+    frames: list[dict[str, Any]] = [
+        payloads.dispatch("MESSAGE_CREATE", dict(template, id=payloads.snowflake(40_000_000 + number),
+                                                 guild_id=message["guild_id"], channel_id=message["channel_id"]),
+                          number)
+        for number, message in enumerate(sample(cached))
+    ]
+
+    async def handle() -> None:
+        for frame in frames:
+            await handler.handle_event(GatewayResponse(frame, user))
+
+        while client.gateway.dispatcher.in_flight():
+            await asyncio.sleep(0)
+
+    def run() -> None:
+        client.loop.run_until_complete(handle())
+
+    yield "event_handler.handle_event", {"guilds": guilds, "messages": messages, "event": "MESSAGE_CREATE"}, run
+
+
+def offline_client() -> Client:
+    loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+    client: Client = Client(10, loop=loop, logger=False)
+
+    client.users.append(UserClient({"endpoint": client.endpoint, "endpoint_gateway": client.endpoint_gateway,
+                                    "token": "token", "username": "benchmark", "discriminator": "0",
+                                    "id": payloads.snowflake(0), "loop": loop}, client.session))  # pyright: ignore
+    return client
+
+
+def cases(sizes: list[int], messages: int) -> Iterator[Case]:
+    yield from response_cases()
+
+    client: Client = offline_client()
+
+    try:
+        for guilds in sizes:
+            yield from cache_cases(guilds, messages)
+            yield from event_handler_cases(client, guilds, messages)
+    finally:
+        client.loop.run_until_complete(client.session.close())  # pyright: ignore
+        client.session = None  # Closed already, HTTPClient.__del__ skips it
+
+
+def measure(function: Callable[[], Any], operations: int, repeat: int) -> dict[str, Any]:
+    timer: timeit.Timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times: list[float] = [elapsed / (number * operations) for elapsed in timer.repeat(repeat, number)]
+    median: float = statistics.median(times)
+
+    return {
+        "seconds_per_op": median,
+        "min": min(times),
+        "max": max(times),
+        "ops_per_second": 1 / median,
+        "rounds": repeat,
+        "iterations": number * operations
+    }
+
+
+def key(result: dict[str, Any]) -> str:
+    parameters: str = ",".join(f"{name}={value}" for name, value in sorted(result["params"].items()))
+    return f"{result['name']}[{parameters}]"
+
+
+def compare(results: list[dict[str, Any]], baseline_path: str, tolerance: float) -> bool:
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline: dict[str, dict[str, Any]] = {key(result): result for result in json.load(file)["results"]}
+
+    regressed: bool = False
+    print(f"\n{'case':<80} {'baseline':>10} {'current':>10} {'change':>8}")
+
+    for result in results:
+        previous: Optional[dict[str, Any]] = baseline.get(key(result))
+
+        if previous is None:
+            continue
+
+        change: float = result["seconds_per_op"] / previous["seconds_per_op"] - 1
+        flag: str = " REGRESSION" if change > tolerance else ""
+        regressed = regressed or bool(flag)
+
+        print(f"{key(result):<80} {previous['seconds_per_op'] * 1e6:>8.2f}us "
+              f"{result['seconds_per_op'] * 1e6:>8.2f}us {change:>+8.1%}{flag}")
+
+    return regressed
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Benchmarks of the receive path and cache")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Numbers of the guilds, separated by commas")
+    parser.add_argument("--messages", type=int, default=100_000, help="Number of the cached messages")
+    parser.add_argument("--filter", default="", help="Run only the cases with the name containing this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of the timed rounds of every case")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Compare the results to a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown, 0.25 means 25%%")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    sizes: list[int] = [int(size) for size in arguments.sizes.split(",")]
+    results: list[dict[str, Any]] = []
+
+    print(f"{'case':<80} {'per op':>10} {'ops/s':>12}")
+
+    for name, parameters, function in cases(sizes, arguments.messages):
+        if arguments.filter not in name:
+            continue
+
+        result: dict[str, Any] = {"name": name, "params": parameters}
+        result.update(measure(function, parameters.get("batch", _BATCH), arguments.repeat))
+        results.append(result)
+
+        print(f"{key(result):<80} {result['seconds_per_op'] * 1e6:>8.2f}us {result['ops_per_second']:>12,.0f}")
+
+    if arguments.json:
+        with open(arguments.json, "w", encoding="utf-8") as file:
+            json.dump({
+                "machine": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                            "platform": platform.platform(), "processor": platform.machine()},
+                "asynccore": Client.__version__,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "results": results
+            }, file, indent=2)
+
+    if arguments.compare and compare(results, arguments.compare, arguments.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ setup(
     long_description=long_description,
     packages=find_packages(),
     install_requires=['colorlog', 'aiohttp', "websockets"],
+    extras_require={"speed": ["orjson"]},
     keywords=['python', 'requests', 'discord selfbot', 'selfbot', 'discord.py', 'aiohttp'],
     classifiers=[
         "Development Status :: 1 - Planning",